@@ -0,0 +1,111 @@
+"""Hashtable 性能基准测试脚本。
+
+比较按类型分开的 parentKey -> {childKey: 值} 存储与旧的三层嵌套字典实现。
+测试负载模拟地图中最常见的用法：以单位的 handle ID 为 parentKey，
+为每个单位保存若干整数字段，之后反复读取，最后在单位死亡时 FlushChildHashtable。
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# 添加src到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from jass_runner.natives.hashtable import Hashtable
+
+
+class NestedHashtable:
+    """旧实现的整数部分：_data[parent][child][type_name]。"""
+
+    def __init__(self):
+        self._data = {}
+
+    def save_integer(self, parent_key, child_key, value):
+        if parent_key not in self._data:
+            self._data[parent_key] = {}
+        if child_key not in self._data[parent_key]:
+            self._data[parent_key][child_key] = {}
+        self._data[parent_key][child_key]["integer"] = value
+
+    def load_integer(self, parent_key, child_key):
+        return self._data.get(parent_key, {}).get(child_key, {}).get("integer", 0)
+
+    def have_saved_integer(self, parent_key, child_key):
+        return "integer" in self._data.get(parent_key, {}).get(child_key, {})
+
+    def flush_child(self, parent_key):
+        if parent_key in self._data:
+            del self._data[parent_key]
+
+
+def run_workload(table, units: int, fields: int, loads: int) -> dict:
+    """执行 SaveInteger(ht, GetHandleId(u), k, v) 负载，返回各阶段耗时（毫秒）。"""
+    # handle ID 从 0x100000 开始，与游戏中的 GetHandleId 一致
+    handle_ids = [0x100000 + i for i in range(units)]
+    timings = {}
+
+    start = time.perf_counter()
+    for handle_id in handle_ids:
+        for key in range(fields):
+            table.save_integer(handle_id, key, key)
+    timings["save"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(loads):
+        for handle_id in handle_ids:
+            for key in range(fields):
+                table.load_integer(handle_id, key)
+    timings["load"] = (time.perf_counter() - start) * 1000
+
+    # 一半的读取未命中（未保存过的字段）
+    start = time.perf_counter()
+    for handle_id in handle_ids:
+        for key in range(fields, fields * 2):
+            table.have_saved_integer(handle_id, key)
+            table.load_integer(handle_id, key)
+    timings["miss"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for handle_id in handle_ids:
+        table.flush_child(handle_id)
+    timings["flush"] = (time.perf_counter() - start) * 1000
+
+    return timings
+
+
+def measure_memory(table, units: int, fields: int) -> int:
+    """保存全部字段后 hashtable 占用的内存（字节）。"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(units):
+        for key in range(fields):
+            table.save_integer(0x100000 + i, key, key)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def benchmark_hashtable(units: int = 5000, fields: int = 8, loads: int = 10):
+    """比较两种实现。"""
+    print("=" * 50)
+    print(f"性能测试: Hashtable（{units}个单位 x {fields}个字段，读取{loads}轮）")
+    print("=" * 50)
+
+    nested = run_workload(NestedHashtable(), units, fields, loads)
+    typed = run_workload(Hashtable("hashtable_bench"), units, fields, loads)
+
+    for phase in ("save", "load", "miss", "flush"):
+        speedup = nested[phase] / typed[phase] if typed[phase] else float("inf")
+        print(f"{phase:>6}: 嵌套 {nested[phase]:8.2f} ms  分类型 {typed[phase]:8.2f} ms  "
+              f"({speedup:.2f}x)")
+
+    for name, table in (("嵌套", NestedHashtable()), ("分类型", Hashtable("hashtable_bench"))):
+        print(f"{name}存储占用: {measure_memory(table, units, fields) / 1024:.0f} KB")
+
+    print()
+
+
+if __name__ == "__main__":
+    benchmark_hashtable()
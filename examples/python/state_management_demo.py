@@ -122,7 +122,7 @@ def demo_memory_tracking():
     print("演示4: 内存监控")
     print("=" * 50)
 
-    tracker = MemoryTracker()
+    tracker = MemoryTracker().start()
     manager = HandleManager()
 
     tracker.snapshot("初始状态")
@@ -143,6 +143,7 @@ def demo_memory_tracking():
 
     # 显示统计
     stats = tracker.get_stats()
+    tracker.stop()
     print(f"\n内存统计:")
     print(f"  快照数量: {stats['snapshots_count']}")
 
@@ -19,6 +19,9 @@ def create_parser():
   %(prog)s script.j          # 执行 JASS 脚本
   %(prog)s script.j --simulate 30  # 执行并模拟 30 秒
   %(prog)s script.j --no-timers   # 禁用计时器系统执行
+  %(prog)s script.j --simulate 60 --frame-budget 5  # 报告超过5毫秒的帧
+  %(prog)s script.j --simulate 3600 --speed max   # 以最高速度模拟1小时
+  %(prog)s script.j --simulate 600 --timeline inputs.jsonl  # 按时间线注入输入
   %(prog)s --version         # 显示版本
         """
     )
@@ -72,9 +75,226 @@ def create_parser():
         help='指定 blizzard.j 的路径（默认: resources/blizzard.j）'
     )
 
+    parser.add_argument(
+        '--frame-budget',
+        type=float,
+        default=None,
+        metavar='MS',
+        help='开启帧分析，报告耗时超过 MS 毫秒的帧（需配合 --simulate）'
+    )
+
+    parser.add_argument(
+        '--timeline',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='模拟期间按时间注入 JSONL 时间线中的输入事件（需配合 --simulate）'
+    )
+
+    parser.add_argument(
+        '--speed',
+        choices=['unthrottled', 'realtime', 'max'],
+        default='unthrottled',
+        help='模拟速度模式：unthrottled 尽快推进（默认），realtime 按游戏速度同步墙钟，'
+             'max 尽快推进并屏蔽模拟期间的日志'
+    )
+
+    parser.add_argument(
+        '--event-depth',
+        type=int,
+        default=None,
+        metavar='N',
+        help='开启事件队列：触发器动作中引发的事件排队分发，嵌套超过 N 层的事件被丢弃'
+    )
+
+    parser.add_argument(
+        '--trigger-report',
+        type=int,
+        nargs='?',
+        const=20,
+        default=None,
+        metavar='N',
+        help='执行结束后报告累计耗时最多的 N 个触发器（默认 20）及各事件的触发次数'
+    )
+
+    parser.add_argument(
+        '--leak-report',
+        type=int,
+        nargs='?',
+        const=20,
+        default=None,
+        metavar='N',
+        help='记录每个 handle 的创建位置，执行结束后报告存活数量最多的 N 个创建位置（默认 20）'
+    )
+
+    parser.add_argument(
+        '--native-profile',
+        type=int,
+        nargs='?',
+        const=20,
+        default=None,
+        metavar='N',
+        help='统计 native 函数调用，执行结束后报告自身耗时最多的 N 个 native（默认 20）及其主要调用位置'
+    )
+
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='使用 tracemalloc 追踪内存，执行结束后按子系统报告内存占用（会明显降低执行速度）'
+    )
+
+    journal_group = parser.add_mutually_exclusive_group()
+    journal_group.add_argument(
+        '--journal',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='把分发的事件和单位创建、击杀、状态修改写入二进制事件日志'
+    )
+    journal_group.add_argument(
+        '--verify-journal',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='与基准事件日志逐条比较，不一致时返回非零退出码'
+    )
+
+    parser.add_argument(
+        '--load-hashtables',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='脚本执行后从快照文件恢复 hashtable 数据，再开始模拟'
+    )
+
+    parser.add_argument(
+        '--save-hashtables',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='执行结束后把所有 hashtable 的数据写入快照文件'
+    )
+
     return parser
 
 
+def log_trigger_report(stats: dict):
+    """将触发器分发统计输出到日志。
+
+    参数：
+        stats: JassVM.trigger_stats() 返回的统计字典
+    """
+    logging.info("=" * 50)
+    logging.info("触发器报告")
+    logging.info("=" * 50)
+    logging.info("事件触发次数:")
+    for event_type, count in sorted(stats['events'].items(), key=lambda item: -item[1]):
+        logging.info(f"  {event_type}: {count}")
+
+    logging.info("触发器（按累计耗时排序）:")
+    for trigger in stats['triggers']:
+        logging.info(
+            f"  {trigger['label']} [{trigger['trigger_id']}]: "
+            f"{trigger['total_time'] * 1000:.3f} ms, 分发 {trigger['fires']}, 执行 {trigger['runs']}, "
+            f"条件 {trigger['conditions_evaluated']}, 动作 {trigger['actions_executed']}, "
+            f"异常 {trigger['errors']}"
+        )
+
+
+def log_leak_report(report: dict):
+    """将handle泄漏报告输出到日志。
+
+    参数：
+        report: JassVM.leak_report() 返回的报告字典
+    """
+    logging.info("=" * 50)
+    logging.info("Handle 泄漏报告")
+    logging.info("=" * 50)
+    logging.info(f"模拟时间: {report['elapsed']:.2f}秒  "
+                 f"创建: {report['tracked']}  存活: {report['alive']}")
+    for type_name, count in report['by_type'].items():
+        logging.info(f"  {type_name}: {count}")
+
+    logging.info("创建位置（按存活数量排序）:")
+    for site in report['sites']:
+        logging.info(f"  {site['type']} @ {site['site']}: 存活 {site['alive']}, "
+                     f"每分钟增长 {site['per_minute']:.1f}")
+
+
+def log_native_profile(report: dict):
+    """将native调用报告输出到日志。
+
+    参数：
+        report: JassVM.native_profile() 返回的报告字典
+    """
+    logging.info("=" * 50)
+    logging.info("Native 调用报告")
+    logging.info("=" * 50)
+    logging.info(f"调用次数: {report['calls']}  自身耗时: {report['self_time'] * 1000:.3f} ms")
+    for native in report['natives']:
+        logging.info(
+            f"  {native['name']}: 调用 {native['calls']}, 自身 {native['self'] * 1000:.3f} ms, "
+            f"总计 {native['total'] * 1000:.3f} ms, P95 {native['p95'] * 1000:.3f} ms"
+        )
+        for site in native['sites']:
+            logging.info(f"    {site['site']}: {site['calls']}")
+
+
+def log_memory_report(report: dict):
+    """将内存报告输出到日志。
+
+    参数：
+        report: JassVM.memory_report() 返回的报告字典
+    """
+    logging.info("=" * 50)
+    logging.info("内存报告")
+    logging.info("=" * 50)
+    logging.info(f"当前: {report['current'] / 1024:.1f} KB  峰值: {report['peak'] / 1024:.1f} KB")
+    logging.info("子系统:")
+    for name, size in report['subsystems'].items():
+        logging.info(f"  {name}: {size / 1024:.1f} KB")
+    logging.info(f"全局数组: {report['interpreter_arrays'] / 1024:.1f} KB")
+    logging.info(f"Hashtable: {report['hashtables']['count']} 个, {report['hashtables']['entries']} 条数据")
+
+    logging.info("Handle（按类型估算）:")
+    for type_name, entry in report['handles'].items():
+        logging.info(f"  {type_name}: {entry['count']} 个, {entry['bytes'] / 1024:.1f} KB")
+
+    if report['samples']:
+        logging.info("采样（模拟时间: 进程已追踪内存）:")
+        for at, size in report['samples']:
+            logging.info(f"  {at:.0f}s: {size / 1024:.1f} KB")
+
+
+def log_frame_report(report: dict):
+    """将帧预算报告输出到日志。
+
+    参数：
+        report: SimulationLoop.get_frame_report() 返回的报告字典
+    """
+    logging.info("=" * 50)
+    logging.info("帧预算报告")
+    logging.info("=" * 50)
+    logging.info(f"帧数: {report['frames']}  预算: {report['frame_budget'] * 1000:.3f} ms")
+    logging.info(f"平均帧耗时: {report['avg_frame_time'] * 1000:.3f} ms  "
+                 f"最大帧耗时: {report['max_frame_time'] * 1000:.3f} ms")
+    for phase, spent in report['phase_totals'].items():
+        logging.info(f"  {phase}: {spent * 1000:.3f} ms")
+
+    logging.info("帧耗时分布:")
+    for bucket in report['histogram']:
+        bound = f"<= {bucket['le_ms']} ms" if bucket['le_ms'] is not None else "更大"
+        logging.info(f"  {bound}: {bucket['count']}")
+
+    logging.info(f"超预算帧: {report['overrun_count']}")
+    for overrun in report['overruns'][:20]:
+        logging.info(
+            f"  帧 {overrun['frame']} ({overrun['time']:.2f}s): "
+            f"{overrun['duration'] * 1000:.3f} ms, 主要耗时: {overrun['culprit']} "
+            f"({overrun['culprit_time'] * 1000:.3f} ms)"
+        )
+
+
 def setup_logging(verbose: bool, quiet: bool):
     """根据详细程度设置日志。"""
     if quiet:
@@ -98,6 +318,7 @@ def main():
 
     setup_logging(args.verbose, args.quiet)
 
+    vm = None
     try:
         # 创建并运行虚拟机
         vm = JassVM(enable_timers=not args.no_timers)
@@ -108,17 +329,86 @@ def main():
             if not success:
                 logging.warning("blizzard.j 加载失败，继续执行用户脚本")
 
+        if args.event_depth is not None:
+            vm.enable_event_queue(args.event_depth)
+
+        if args.trigger_report is not None:
+            vm.enable_trigger_stats()
+
+        if args.leak_report is not None:
+            vm.enable_leak_tracking()
+
+        if args.journal:
+            vm.record_journal(args.journal)
+        elif args.verify_journal:
+            vm.verify_journal(args.verify_journal)
+
+        if args.native_profile is not None:
+            vm.enable_native_profiling()
+
+        if args.memory_report:
+            vm.enable_memory_tracking()
+
         vm.load_file(args.script)
         vm.execute()
 
+        if args.load_hashtables and not vm.load_hashtables(args.load_hashtables):
+            logging.error(f"hashtable 快照无效: {args.load_hashtables}")
+            return 1
+
+        if args.timeline:
+            vm.load_timeline(args.timeline)
+
+        if args.frame_budget is not None:
+            vm.enable_frame_profiling(args.frame_budget / 1000.0)
+
         if args.simulate > 0:
+            if args.speed != 'unthrottled':
+                vm.set_speed_mode(args.speed)
             vm.run_simulation(args.simulate)
+            stats = vm.get_speed_stats()
+            if stats is not None and stats['wall_time'] > 0:
+                logging.info(f"墙钟耗时: {stats['wall_time']:.2f}秒  "
+                             f"相对实时: {stats['realtime_factor']:.1f}x")
+
+        report = vm.get_frame_report()
+        if report is not None:
+            log_frame_report(report)
+
+        if args.trigger_report is not None:
+            log_trigger_report(vm.trigger_stats(args.trigger_report))
+
+        if args.leak_report is not None:
+            log_leak_report(vm.leak_report(args.leak_report))
+
+        if args.native_profile is not None:
+            log_native_profile(vm.native_profile(args.native_profile))
+
+        if args.memory_report:
+            log_memory_report(vm.memory_report())
+
+        queue_stats = vm.get_event_queue_stats()
+        if queue_stats is not None:
+            logging.info(f"事件队列: 入队 {queue_stats['queued']}  处理 {queue_stats['processed']}  "
+                         f"丢弃 {queue_stats['dropped']}  最大深度 {queue_stats['max_depth']}")
+
+        if args.save_hashtables:
+            vm.save_hashtables(args.save_hashtables)
+
+        journal_result = vm.close_journal()
+        if journal_result is not None:
+            logging.info(f"事件日志: {journal_result['records']} 条记录")
+            if not journal_result.get('ok', True):
+                mismatch = journal_result['mismatch']
+                logging.error(f"事件日志与基准不一致（第 {mismatch['index']} 条）: "
+                              f"期望 {mismatch['expected']}，实际 {mismatch['actual']}")
+                return 1
 
         logging.info("执行成功完成")
         return 0
 
-    except FileNotFoundError:
-        logging.error(f"脚本文件未找到: {args.script}")
+    except FileNotFoundError as e:
+        logging.error(f"文件未找到: {e.filename or args.script}")
         return 1
     except Exception as e:
         logging.error(f"执行脚本时出错: {e}")
@@ -126,6 +416,10 @@ def main():
             import traceback
             traceback.print_exc()
         return 1
+    finally:
+        # 出错或提前返回时也要关闭日志文件，成功路径上已关闭时为空操作
+        if vm is not None:
+            vm.close_journal()
 
 
 if __name__ == "__main__":
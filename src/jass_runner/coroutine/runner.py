@@ -24,6 +24,15 @@ class CoroutineRunner:
         self._frame_count = 0
         self.max_coroutines = max_coroutines or self.DEFAULT_MAX_COROUTINES
         self._main_coroutine: Optional[Coroutine] = None
+        self._profiler: Optional[Any] = None
+
+    def set_profiler(self, profiler: Any):
+        """设置帧预算分析器。
+
+        参数：
+            profiler: FrameProfiler 实例，None 表示关闭分析
+        """
+        self._profiler = profiler
 
     def execute_func(self, interpreter: Any, func: Any,
                      args: list = None) -> Coroutine:
@@ -72,9 +81,17 @@ class CoroutineRunner:
         self._active.extend(ready)
 
         # 2. 执行活跃协程
+        profiler = self._profiler
         still_active = []
         for coroutine in self._active:
-            signal = coroutine.resume()
+            if profiler is not None:
+                profiler.enter("coroutines", getattr(coroutine.func, 'name', None))
+                try:
+                    signal = coroutine.resume()
+                finally:
+                    profiler.exit()
+            else:
+                signal = coroutine.resume()
 
             if signal:  # 遇到 SleepSignal
                 coroutine.sleep(signal.duration, self._current_time)
@@ -4,7 +4,8 @@
 以及状态监听器的注册和触发。
 """
 
-from typing import Any, Callable, Dict, List, Optional, Protocol
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
 from jass_runner.types.gamestate import FGameState
 from jass_runner.types.limitop import LimitOp
@@ -31,6 +32,9 @@ class GameStateManager:
 
     管理游戏状态，包括日夜循环系统（每9000帧一个周期）。
     支持状态监听器注册和事件触发。
+
+    监听器在注册时预测条件首次满足的帧号，并按帧号放入最小堆，
+    update() 只需查看堆顶，不再逐帧遍历所有监听器。
     """
 
     # 日夜循环周期：9000帧 = 24小时
@@ -45,18 +49,40 @@ class GameStateManager:
         self.current_frame = 0
         self._next_listener_id = 0
         self._state_listeners: Dict[str, Dict] = {}
+        # (到期帧号, 注册序号, 监听器handle) 最小堆
+        self._due_heap: List[Tuple[int, int, str]] = []
         self._trigger_manager = trigger_manager
+        self._profiler: Optional[Any] = None
+
+    def set_profiler(self, profiler: Any):
+        """设置帧预算分析器。
+
+        参数：
+            profiler: FrameProfiler 实例，None 表示关闭分析
+        """
+        self._profiler = profiler
 
     def update(self, delta_frames: int):
         """更新游戏状态。
 
-        推进时间并检查状态监听器。
+        推进时间并触发到期的状态监听器。
 
         参数：
             delta_frames: 推进的帧数
         """
         self.current_frame += delta_frames
-        self._check_state_listeners()
+        if not self._due_heap or self._due_heap[0][0] > self.current_frame:
+            return
+
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.enter("gamestate", "game_state_listeners")
+            try:
+                self._check_state_listeners()
+            finally:
+                profiler.exit()
+        else:
+            self._check_state_listeners()
 
     def get_float_state(self, state_id: int) -> float:
         """获取浮点类型游戏状态值。
@@ -67,11 +93,33 @@ class GameStateManager:
         返回：
             游戏状态的当前值
         """
+        return self._float_state_at(state_id, self.current_frame)
+
+    def _float_state_at(self, state_id: int, frame: int) -> float:
+        """获取指定帧的浮点类型游戏状态值。
+
+        参数：
+            state_id: 游戏状态ID（使用FGameState常量）
+            frame: 帧号
+
+        返回：
+            该帧的游戏状态值
+        """
         if state_id == FGameState.TIME_OF_DAY:
             # 计算当前时间（小时），9000帧 = 24小时
-            return (self.current_frame % self.DAY_NIGHT_CYCLE_FRAMES) / self.DAY_NIGHT_CYCLE_FRAMES * 24
+            return (frame % self.DAY_NIGHT_CYCLE_FRAMES) / self.DAY_NIGHT_CYCLE_FRAMES * 24
         return 0.0
 
+    def get_next_due_frame(self) -> Optional[int]:
+        """获取下一个监听器到期的帧号。
+
+        返回：
+            最早到期的帧号，没有待触发的监听器时返回None
+        """
+        if not self._due_heap:
+            return None
+        return self._due_heap[0][0]
+
     def register_state_listener(
         self,
         trigger_id: str,
@@ -103,6 +151,10 @@ class GameStateManager:
             "triggered": False,
         }
 
+        due_frame = self._predict_due_frame(state_id, op, value, self.current_frame)
+        if due_frame is not None:
+            heapq.heappush(self._due_heap, (due_frame, self._next_listener_id, handle))
+
         # 在trigger_manager中注册事件，以便触发器能接收该类型的事件
         if self._trigger_manager is not None:
             # 检查trigger_manager是否有register_event方法
@@ -120,36 +172,109 @@ class GameStateManager:
         return handle
 
     def _check_state_listeners(self):
-        """检查状态监听器。
+        """触发所有到期的状态监听器。
 
-        遍历所有监听器，检查条件是否满足，
-        满足条件时触发事件。
+        从最小堆中依次弹出到期帧号不晚于当前帧的监听器并触发事件，
+        事件中的状态值为条件首次满足那一帧的值。
         """
-        for handle, listener in self._state_listeners.items():
-            if listener["triggered"]:
+        heap = self._due_heap
+        while heap and heap[0][0] <= self.current_frame:
+            due_frame, _, handle = heapq.heappop(heap)
+            listener = self._state_listeners.get(handle)
+            if listener is None or listener["triggered"]:
                 continue
 
-            trigger_id = listener["trigger_id"]
+            # 标记为已触发
+            listener["triggered"] = True
             state_id = listener["state_id"]
-            op = listener["op"]
-            value = listener["value"]
-
-            # 获取当前状态值
-            current_value = self.get_float_state(state_id)
-
-            # 检查条件
-            if LimitOp.compare(op, current_value, value):
-                # 标记为已触发
-                listener["triggered"] = True
-                # 触发事件
-                self._fire_event(
-                    "game_state_limit",
-                    {
-                        "trigger_id": trigger_id,
-                        "state_id": state_id,
-                        "value": current_value,
-                    }
-                )
+            self._fire_event(
+                "game_state_limit",
+                {
+                    "trigger_id": listener["trigger_id"],
+                    "state_id": state_id,
+                    "value": self._float_state_at(state_id, due_frame),
+                }
+            )
+
+    def _predict_due_frame(self, state_id: int, op: int, value: float,
+                           from_frame: int) -> Optional[int]:
+        """预测条件在 from_frame 及之后首次满足的帧号。
+
+        日夜时间是以 DAY_NIGHT_CYCLE_FRAMES 为周期的单调递增函数，
+        满足条件的帧在一个周期内构成至多两个连续区间。
+        其他状态的值不随时间变化，只在注册时判断一次。
+
+        参数：
+            state_id: 游戏状态ID
+            op: 比较操作符（使用LimitOp常量）
+            value: 比较的目标值
+            from_frame: 起始帧号
+
+        返回：
+            首次满足条件的帧号，永远不会满足时返回None
+        """
+        if state_id != FGameState.TIME_OF_DAY:
+            if LimitOp.compare(op, self._float_state_at(state_id, from_frame), value):
+                return from_frame
+            return None
+
+        cycle = self.DAY_NIGHT_CYCLE_FRAMES
+        phase = from_frame % cycle
+        base = from_frame - phase
+        intervals = self._time_of_day_intervals(op, value)
+        for low, high in intervals:
+            if high >= phase:
+                return base + max(low, phase)
+        if intervals:
+            return base + cycle + intervals[0][0]
+        return None
+
+    def _time_of_day_intervals(self, op: int, value: float) -> List[Tuple[int, int]]:
+        """计算一个日夜周期内满足条件的帧区间。
+
+        参数：
+            op: 比较操作符（使用LimitOp常量）
+            value: 比较的目标时间（小时）
+
+        返回：
+            升序的 (起始帧, 结束帧) 闭区间列表
+        """
+        cycle = self.DAY_NIGHT_CYCLE_FRAMES
+
+        def hours(phase: int) -> float:
+            return self._float_state_at(FGameState.TIME_OF_DAY, phase)
+
+        def first(predicate: Callable[[int], bool]) -> int:
+            # 二分查找单调谓词首次为真的帧，不存在时返回 cycle
+            low, high = 0, cycle
+            while low < high:
+                mid = (low + high) // 2
+                if predicate(mid):
+                    high = mid
+                else:
+                    low = mid + 1
+            return low
+
+        def equal(phase: int) -> bool:
+            return LimitOp.compare(LimitOp.EQUAL, hours(phase), value)
+
+        if op == LimitOp.GREATER_THAN_OR_EQUAL or op == LimitOp.GREATER_THAN:
+            start = first(lambda p: LimitOp.compare(op, hours(p), value))
+            intervals = [(start, cycle - 1)]
+        elif op == LimitOp.LESS_THAN or op == LimitOp.LESS_THAN_OR_EQUAL:
+            stop = first(lambda p: not LimitOp.compare(op, hours(p), value))
+            intervals = [(0, stop - 1)]
+        elif op == LimitOp.EQUAL or op == LimitOp.NOT_EQUAL:
+            start = first(lambda p: equal(p) or hours(p) > value)
+            stop = first(lambda p: hours(p) > value and not equal(p))
+            if op == LimitOp.EQUAL:
+                intervals = [(start, stop - 1)]
+            else:
+                intervals = [(0, start - 1), (stop, cycle - 1)]
+        else:
+            intervals = []
+
+        return [(low, high) for low, high in intervals if low <= high]
 
     def _fire_event(self, event_type: str, event_data: Dict[str, Any]):
         """触发事件。
@@ -55,6 +55,8 @@ class JassCoroutine(Coroutine):
             statement = statements[self._pc]
 
             try:
+                # 恢复执行时其他函数可能已改写当前函数名
+                self.interpreter.current_function = self.func.name
                 self.interpreter.execute_statement(statement)
                 self._pc += 1
 
@@ -104,6 +106,7 @@ class JassCoroutine(Coroutine):
         """
         self.interpreter.current_context = self.interpreter.global_context
         self.interpreter.evaluator.context = self.interpreter.global_context
+        self.interpreter.current_function = None
         self._func_context = None
 
     def resume(self):
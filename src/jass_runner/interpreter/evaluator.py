@@ -567,6 +567,33 @@ class Evaluator:
             return result.lower() == "true"
         return bool(result)
 
+    def _resolve_function_reference(self, func_name: str):
+        """解析函数引用为可调用对象。
+
+        已定义的函数返回解释器为其编译的唯一可调用对象，同一函数的多次引用
+        得到同一个对象；尚未定义的函数返回在调用时才查找函数的包装。
+
+        参数：
+            func_name: JASS函数名
+
+        返回：
+            可调用对象，调用时执行函数并返回其返回值
+        """
+        interpreter = self.context.interpreter
+        if interpreter is None:
+            return None
+        compiled = interpreter.compile_function(func_name)
+        if compiled is not None:
+            return compiled
+
+        def callback_wrapper(*args, **kwargs):
+            func = interpreter.compile_function(func_name)
+            if func is not None:
+                return func()
+        # 设置函数名属性，便于日志记录
+        callback_wrapper.__name__ = func_name
+        return callback_wrapper
+
     def evaluate(self, expression: Any) -> Any:
         """求值一个JASS表达式或AST节点。"""
         # 处理null值（None）
@@ -577,6 +604,10 @@ class Evaluator:
         if isinstance(expression, str):
             expression = expression.strip()
 
+            # 处理函数引用 (function:func_name)
+            if expression.startswith('function:'):
+                return self._resolve_function_reference(expression[9:])
+
             # 检查是否包含算术运算符、比较运算符、逻辑运算符、函数调用或数组访问
             operators = ['+', '-', '*', '/', '==', '!=', '>', '<', '>=', '<=', 'and', 'or', 'not']
             has_operator = any(op in expression for op in operators)
@@ -585,8 +616,7 @@ class Evaluator:
 
             if has_operator or has_function_call or has_array_access:
                 # 确保不是字符串字面量或函数引用
-                if not (expression.startswith('"') and expression.endswith('"')) and \
-                   not expression.startswith('function:'):
+                if not (expression.startswith('"') and expression.endswith('"')):
                     tokens = self._tokenize_expression(expression)
                     # 检查是否包含一元运算符（如not true只有2个token）
                     has_unary = any(t in self.UNARY_OPERATORS for t in tokens)
@@ -618,21 +648,6 @@ class Evaluator:
             if expression == 'null':
                 return None
 
-            # 处理函数引用 (function:func_name)
-            if expression.startswith('function:'):
-                func_name = expression[9:]  # 去掉 'function:' 前缀
-                # 返回一个可调用对象，用于回调
-                interpreter = self.context.interpreter
-                def callback_wrapper(*args, **kwargs):
-                    if interpreter and func_name in interpreter.functions:
-                        from ..parser.parser import FunctionDecl
-                        func = interpreter.functions[func_name]
-                        if isinstance(func, FunctionDecl):
-                            interpreter.execute_function(func)
-                # 设置函数名属性，便于日志记录
-                callback_wrapper.__name__ = func_name
-                return callback_wrapper
-
             # 处理变量引用
             if self.context.has_variable(expression):
                 return self.context.get_variable(expression)
@@ -1,6 +1,6 @@
 """JASS解释器。"""
 
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Tuple
 from .context import ExecutionContext
 from .evaluator import Evaluator
 from ..parser.parser import AST, FunctionDecl
@@ -22,6 +22,52 @@ class Interpreter:
         self.evaluator = Evaluator(self.current_context)
         self.type_checker = TypeChecker()  # 添加类型检查器
         self.coroutine_runner = coroutine_runner  # 协程运行器，用于ExecuteFunc
+        # 函数名 -> (函数声明, 编译后的可调用对象)
+        self._compiled_functions: Dict[str, Tuple[FunctionDecl, Callable]] = {}
+        # 正在执行的JASS函数名和语句行号，用于定位handle的创建位置
+        self.current_function: Optional[str] = None
+        self.current_line = 0
+
+    def compile_function(self, func_name: str) -> Optional[Callable]:
+        """获取执行指定JASS函数的可调用对象。
+
+        每个函数声明只编译一次，之后返回同一个对象；函数被重新定义时重新编译。
+        返回的可调用对象忽略传入的参数（如触发器传入的状态上下文），
+        直接执行函数并返回其返回值。
+
+        参数：
+            func_name: JASS函数名
+
+        返回：
+            可调用对象，函数不存在时返回None
+        """
+        func = self.functions.get(func_name)
+        if not isinstance(func, FunctionDecl):
+            return None
+
+        cached = self._compiled_functions.get(func_name)
+        if cached is not None and cached[0] is func:
+            return cached[1]
+
+        execute_function = self.execute_function
+
+        def compiled(*args, **kwargs):
+            return execute_function(func)
+
+        compiled.__name__ = func_name
+        compiled.jass_function = func
+        self._compiled_functions[func_name] = (func, compiled)
+        return compiled
+
+    def current_site(self) -> str:
+        """获取当前执行位置。
+
+        返回：
+            "函数名:行号"，不在任何函数中（如全局变量初始化）时返回 "<global>"
+        """
+        if self.current_function is None:
+            return "<global>"
+        return f"{self.current_function}:{self.current_line}"
 
     def execute(self, ast: AST):
         """执行AST。"""
@@ -95,6 +141,9 @@ class Interpreter:
             interpreter=self
         )
         self.current_context = func_context
+        previous_function = self.current_function
+        previous_line = self.current_line
+        self.current_function = func.name
 
         # 更新求值器的上下文
         self.evaluator.context = func_context
@@ -111,11 +160,14 @@ class Interpreter:
         # 恢复之前的上下文
         self.current_context = previous_context
         self.evaluator.context = previous_context
+        self.current_function = previous_function
+        self.current_line = previous_line
 
         return return_value
 
     def execute_statement(self, statement: Any):
         """执行单个语句。"""
+        self.current_line = getattr(statement, 'line', 0)
         if isinstance(statement, ArrayDecl):
             self.execute_array_declaration(statement)
         elif isinstance(statement, LocalDecl):
@@ -328,6 +380,9 @@ class Interpreter:
 
         self.current_context = func_context
         self.evaluator.context = func_context
+        previous_function = self.current_function
+        previous_line = self.current_line
+        self.current_function = func.name
 
         # 执行函数体
         return_value = None
@@ -352,6 +407,8 @@ class Interpreter:
         # 恢复上下文
         self.current_context = previous_context
         self.evaluator.context = previous_context
+        self.current_function = previous_function
+        self.current_line = previous_line
 
         return return_value
 
@@ -3,20 +3,30 @@
 此模块提供 AllianceManager 类，用于集中管理玩家之间的联盟关系。
 """
 
-from typing import Dict, Set, Tuple
+from typing import List, Optional, Set
+
+from .alliance import ALLIANCE_PASSIVE
+
+# 玩家数量（ID 0-15）
+MAX_PLAYERS = 16
+# 所有玩家位都置1的掩码
+ALL_PLAYERS_MASK = (1 << MAX_PLAYERS) - 1
 
 
 class AllianceManager:
     """管理玩家之间的联盟关系。
 
-    使用字典存储联盟关系，键为 (source_id, other_id) 元组，
-    值为该玩家对已启用的联盟类型集合。
+    使用固定的 16x16 数组存储联盟关系，下标为 source_id * 16 + other_id，
+    值为该玩家对已启用的联盟类型位掩码（第 alliance_type 位）。
+    另外按源玩家缓存盟友/敌人玩家掩码（第 player_id 位），
+    设置 ALLIANCE_PASSIVE 时使对应源玩家的缓存失效。
     """
 
     def __init__(self):
         """初始化联盟管理器。"""
-        # (source_player_id, other_player_id) -> Set[alliance_type]
-        self._alliances: Dict[Tuple[int, int], Set[int]] = {}
+        self._matrix: List[int] = [0] * (MAX_PLAYERS * MAX_PLAYERS)
+        self._ally_masks: List[Optional[int]] = [None] * MAX_PLAYERS
+        self._enemy_masks: List[Optional[int]] = [None] * MAX_PLAYERS
 
     def set_alliance(self, source_id: int, other_id: int,
                      alliance_type: int, value: bool) -> None:
@@ -28,19 +38,18 @@ class AllianceManager:
             alliance_type: 联盟类型（0-9）
             value: True 启用，False 禁用
         """
-        key = (source_id, other_id)
-
-        if key not in self._alliances:
-            self._alliances[key] = set()
+        if not (0 <= source_id < MAX_PLAYERS and 0 <= other_id < MAX_PLAYERS) or alliance_type < 0:
+            return
 
+        index = source_id * MAX_PLAYERS + other_id
         if value:
-            self._alliances[key].add(alliance_type)
+            self._matrix[index] |= 1 << alliance_type
         else:
-            self._alliances[key].discard(alliance_type)
+            self._matrix[index] &= ~(1 << alliance_type)
 
-            # 如果集合为空，删除该键
-            if not self._alliances[key]:
-                del self._alliances[key]
+        if alliance_type == ALLIANCE_PASSIVE:
+            self._ally_masks[source_id] = None
+            self._enemy_masks[source_id] = None
 
     def get_alliance(self, source_id: int, other_id: int,
                      alliance_type: int) -> bool:
@@ -54,12 +63,23 @@ class AllianceManager:
         返回：
             该联盟类型是否启用
         """
-        key = (source_id, other_id)
-
-        if key not in self._alliances:
+        if not (0 <= source_id < MAX_PLAYERS and 0 <= other_id < MAX_PLAYERS) or alliance_type < 0:
             return False
+        return (self._matrix[source_id * MAX_PLAYERS + other_id] >> alliance_type) & 1 == 1
+
+    def get_alliance_mask(self, source_id: int, other_id: int) -> int:
+        """获取两个玩家之间的联盟类型位掩码。
+
+        参数：
+            source_id: 源玩家ID
+            other_id: 目标玩家ID
 
-        return alliance_type in self._alliances[key]
+        返回：
+            第 alliance_type 位表示该联盟类型是否启用
+        """
+        if not (0 <= source_id < MAX_PLAYERS and 0 <= other_id < MAX_PLAYERS):
+            return 0
+        return self._matrix[source_id * MAX_PLAYERS + other_id]
 
     def get_all_alliances(self, source_id: int, other_id: int) -> Set[int]:
         """获取两个玩家之间所有已启用的联盟类型。
@@ -71,5 +91,59 @@ class AllianceManager:
         返回：
             已启用的联盟类型集合
         """
-        key = (source_id, other_id)
-        return self._alliances.get(key, set()).copy()
+        mask = self.get_alliance_mask(source_id, other_id)
+        return {alliance_type for alliance_type in range(mask.bit_length())
+                if (mask >> alliance_type) & 1}
+
+    def ally_mask(self, source_id: int) -> int:
+        """获取源玩家视为盟友（自己和已设置 ALLIANCE_PASSIVE 的玩家）的玩家掩码。
+
+        参数：
+            source_id: 源玩家ID
+
+        返回：
+            第 player_id 位表示源玩家是否与该玩家结盟，源玩家自己的位总是置1
+        """
+        if not 0 <= source_id < MAX_PLAYERS:
+            return 0
+        mask = self._ally_masks[source_id]
+        if mask is None:
+            passive = 1 << ALLIANCE_PASSIVE
+            base = source_id * MAX_PLAYERS
+            matrix = self._matrix
+            # 与游戏一致，玩家总是自己的盟友
+            mask = 1 << source_id
+            for other_id in range(MAX_PLAYERS):
+                if matrix[base + other_id] & passive:
+                    mask |= 1 << other_id
+            self._ally_masks[source_id] = mask
+        return mask
+
+    def enemy_mask(self, source_id: int) -> int:
+        """获取源玩家视为敌人（未设置 ALLIANCE_PASSIVE 的其他玩家）的玩家掩码。
+
+        参数：
+            source_id: 源玩家ID
+
+        返回：
+            第 player_id 位表示源玩家是否与该玩家敌对
+        """
+        if not 0 <= source_id < MAX_PLAYERS:
+            return 0
+        mask = self._enemy_masks[source_id]
+        if mask is None:
+            mask = ALL_PLAYERS_MASK & ~self.ally_mask(source_id)
+            self._enemy_masks[source_id] = mask
+        return mask
+
+    def is_ally(self, source_id: int, other_id: int) -> bool:
+        """检查源玩家是否与目标玩家结盟。"""
+        if not 0 <= other_id < MAX_PLAYERS:
+            return False
+        return (self.ally_mask(source_id) >> other_id) & 1 == 1
+
+    def is_enemy(self, source_id: int, other_id: int) -> bool:
+        """检查源玩家是否与目标玩家敌对。"""
+        if not 0 <= other_id < MAX_PLAYERS:
+            return False
+        return (self.enemy_mask(source_id) >> other_id) & 1 == 1
@@ -1,10 +1,63 @@
 """JASS布尔表达式类。
 
 此模块包含JASS布尔表达式handle的实现。
+每个布尔表达式在第一次求值时编译为一个谓词函数并缓存在handle上：
+And/Or 链被展平为一次循环，常量子表达式被折叠，
+之后的每次求值只是一次直接调用。
 """
 
+from typing import Any, Callable, List, Union
+
 from .handle_base import Handle
 
+# 编译结果：bool 表示常量表达式，否则为接受一个可选参数（过滤单位）的谓词
+Compiled = Union[bool, Callable[..., bool]]
+
+
+def _constant(value: bool) -> Callable[..., bool]:
+    """创建返回常量的谓词。"""
+    def predicate(arg: Any = None) -> bool:
+        return value
+    return predicate
+
+
+def _link_and(parts: List[Callable[..., bool]]) -> Callable[..., bool]:
+    """把多个谓词连接为逻辑与谓词。"""
+    if len(parts) == 2:
+        first, second = parts
+
+        def predicate(arg: Any = None) -> bool:
+            return first(arg) and second(arg)
+        return predicate
+
+    parts = tuple(parts)
+
+    def predicate(arg: Any = None) -> bool:
+        for part in parts:
+            if not part(arg):
+                return False
+        return True
+    return predicate
+
+
+def _link_or(parts: List[Callable[..., bool]]) -> Callable[..., bool]:
+    """把多个谓词连接为逻辑或谓词。"""
+    if len(parts) == 2:
+        first, second = parts
+
+        def predicate(arg: Any = None) -> bool:
+            return first(arg) or second(arg)
+        return predicate
+
+    parts = tuple(parts)
+
+    def predicate(arg: Any = None) -> bool:
+        for part in parts:
+            if part(arg):
+                return True
+        return False
+    return predicate
+
 
 class BoolExpr(Handle):
     """布尔表达式基类，用于条件判断和过滤。
@@ -21,19 +74,56 @@ class BoolExpr(Handle):
         """
         super().__init__(handle_id, "boolexpr")
         self._func = None
+        self._compiled = None
+        self._predicate = None
+
+    @property
+    def predicate(self) -> Callable[..., bool]:
+        """获取编译后的谓词。
+
+        谓词接受一个可选参数（过滤时为当前单位），返回布尔值。
+        第一次访问时编译并缓存。
+
+        返回：
+            谓词函数
+        """
+        predicate = self._predicate
+        if predicate is None:
+            compiled = self.compile()
+            predicate = _constant(compiled) if isinstance(compiled, bool) else compiled
+            self._predicate = predicate
+        return predicate
+
+    def compile(self) -> Compiled:
+        """编译表达式。
+
+        返回：
+            常量表达式返回bool，否则返回谓词函数
+        """
+        if self._compiled is None:
+            self._compiled = self._build()
+        return self._compiled
+
+    def _build(self) -> Compiled:
+        """构建编译结果，子类覆盖。"""
+        func = self._func
+        if not func:
+            return False
+
+        def predicate(arg: Any = None) -> bool:
+            return bool(func(arg))
+        return predicate
 
     def evaluate(self, *args, **kwargs) -> bool:
         """评估表达式，返回布尔值。
 
         参数：
-            *args, **kwargs: 传递给包装函数的参数
+            *args, **kwargs: 第一个位置参数传递给谓词（过滤时为单位）
 
         返回：
             评估结果，无函数时返回False
         """
-        if self._func:
-            return bool(self._func(*args, **kwargs))
-        return False
+        return self.predicate(args[0] if args else None)
 
 
 class ConditionFunc(BoolExpr):
@@ -54,15 +144,22 @@ class ConditionFunc(BoolExpr):
         self.type_name = "conditionfunc"
         self._func = func
 
-    def evaluate(self) -> bool:
+    def _build(self) -> Compiled:
+        func = self._func
+        if not func:
+            return False
+
+        def predicate(arg: Any = None) -> bool:
+            return bool(func())
+        return predicate
+
+    def evaluate(self, *args, **kwargs) -> bool:
         """评估条件。
 
         返回：
             条件函数的执行结果，无函数时返回False
         """
-        if self._func:
-            return bool(self._func())
-        return False
+        return self.predicate()
 
 
 class FilterFunc(BoolExpr):
@@ -83,7 +180,7 @@ class FilterFunc(BoolExpr):
         self.type_name = "filterfunc"
         self._func = func
 
-    def evaluate(self, unit) -> bool:
+    def evaluate(self, unit=None, *args, **kwargs) -> bool:
         """评估单位是否符合过滤条件。
 
         参数：
@@ -92,19 +189,17 @@ class FilterFunc(BoolExpr):
         返回：
             过滤函数的执行结果，无函数时返回False
         """
-        if self._func:
-            return bool(self._func(unit))
-        return False
+        return self.predicate(unit)
 
 
-class AndExpr(BoolExpr):
-    """逻辑与表达式。
+class _ChainExpr(BoolExpr):
+    """And/Or 表达式的公共实现，编译时把同类嵌套展平为一条短路链。"""
 
-    组合两个布尔表达式，当两者都为True时返回True。
-    """
+    # 使链短路的操作数值：And 为 False，Or 为 True
+    _SHORT_CIRCUIT = False
 
     def __init__(self, handle_id: str, operand_a: BoolExpr, operand_b: BoolExpr):
-        """初始化逻辑与表达式。
+        """初始化表达式。
 
         参数：
             handle_id: 唯一标识符
@@ -115,46 +210,62 @@ class AndExpr(BoolExpr):
         self._operand_a = operand_a
         self._operand_b = operand_b
 
-    def evaluate(self, *args, **kwargs) -> bool:
-        """评估逻辑与表达式。
+    def _collect(self, parts: List[Callable[..., bool]]) -> bool:
+        """按求值顺序收集操作数谓词。
 
         参数：
-            *args, **kwargs: 传递给操作数的参数
+            parts: 输出的谓词列表
 
         返回：
-            两个操作数都为True时返回True
+            遇到使整条链短路的常量时返回True
         """
-        return self._operand_a.evaluate(*args, **kwargs) and self._operand_b.evaluate(*args, **kwargs)
+        for operand in (self._operand_a, self._operand_b):
+            if type(operand) is type(self):
+                if operand._collect(parts):
+                    return True
+                continue
+            compiled = operand.compile()
+            if isinstance(compiled, bool):
+                if compiled == self._SHORT_CIRCUIT:
+                    return True
+                # 不影响结果的常量直接省略
+                continue
+            parts.append(compiled)
+        return False
 
+    def _build(self) -> Compiled:
+        parts: List[Callable[..., bool]] = []
+        if self._collect(parts):
+            return self._SHORT_CIRCUIT
+        if not parts:
+            return not self._SHORT_CIRCUIT
+        if len(parts) == 1:
+            return parts[0]
+        return self._link(parts)
 
-class OrExpr(BoolExpr):
-    """逻辑或表达式。
+    def _link(self, parts: List[Callable[..., bool]]) -> Callable[..., bool]:
+        """把多个谓词连接为一个谓词，遇到等于 _SHORT_CIRCUIT 的结果时立即返回。"""
+        if self._SHORT_CIRCUIT:
+            return _link_or(parts)
+        return _link_and(parts)
 
-    组合两个布尔表达式，当任一者为True时返回True。
+
+class AndExpr(_ChainExpr):
+    """逻辑与表达式。
+
+    组合两个布尔表达式，当两者都为True时返回True。
     """
 
-    def __init__(self, handle_id: str, operand_a: BoolExpr, operand_b: BoolExpr):
-        """初始化逻辑或表达式。
+    _SHORT_CIRCUIT = False
 
-        参数：
-            handle_id: 唯一标识符
-            operand_a: 第一个操作数
-            operand_b: 第二个操作数
-        """
-        super().__init__(handle_id)
-        self._operand_a = operand_a
-        self._operand_b = operand_b
 
-    def evaluate(self, *args, **kwargs) -> bool:
-        """评估逻辑或表达式。
+class OrExpr(_ChainExpr):
+    """逻辑或表达式。
 
-        参数：
-            *args, **kwargs: 传递给操作数的参数
+    组合两个布尔表达式，当任一者为True时返回True。
+    """
 
-        返回：
-            任一操作数为True时返回True
-        """
-        return self._operand_a.evaluate(*args, **kwargs) or self._operand_b.evaluate(*args, **kwargs)
+    _SHORT_CIRCUIT = True
 
 
 class NotExpr(BoolExpr):
@@ -173,13 +284,15 @@ class NotExpr(BoolExpr):
         super().__init__(handle_id)
         self._operand = operand
 
-    def evaluate(self, *args, **kwargs) -> bool:
-        """评估逻辑非表达式。
-
-        参数：
-            *args, **kwargs: 传递给操作数的参数
-
-        返回：
-            操作数为False时返回True
-        """
-        return not self._operand.evaluate(*args, **kwargs)
+    def _build(self) -> Compiled:
+        operand = self._operand
+        # Not(Not(x)) 折叠为 x
+        if isinstance(operand, NotExpr):
+            return operand._operand.compile()
+        compiled = operand.compile()
+        if isinstance(compiled, bool):
+            return not compiled
+
+        def predicate(arg: Any = None) -> bool:
+            return not compiled(arg)
+        return predicate
@@ -5,7 +5,7 @@
 """
 
 import logging
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from ..natives.base import NativeFunction
 
 
@@ -53,16 +53,11 @@ class Condition(NativeFunction):
         if isinstance(func, str) and func.startswith("function:"):
             func_name = func[9:]  # 去掉 'function:' 前缀
             # 从 state_context 获取解释器
+            compiled = None
             if hasattr(state_context, 'interpreter') and state_context.interpreter:
-                interpreter = state_context.interpreter
-                def func_wrapper():
-                    if func_name in interpreter.functions:
-                        from ..parser.parser import FunctionDecl
-                        f = interpreter.functions[func_name]
-                        if isinstance(f, FunctionDecl):
-                            return interpreter.execute_function(f)
-                    return False
-                func = func_wrapper
+                compiled = state_context.interpreter.compile_function(func_name)
+            if compiled is not None:
+                func = compiled
             else:
                 logger.error(f"[Condition] Cannot resolve function reference: {func}")
                 return None
@@ -104,6 +99,35 @@ class Filter(NativeFunction):
         """
         return "Filter"
 
+    def __init__(self):
+        """初始化 Filter。"""
+        # 编译后的JASS函数 -> (状态上下文, 过滤包装函数)，同一函数重复 Filter 时复用包装函数
+        self._wrappers: Dict[Callable, Tuple[Any, Callable]] = {}
+
+    def _wrap(self, state_context, compiled: Callable) -> Callable:
+        """获取把单位写入 FilterUnit 后执行函数的包装函数。
+
+        参数：
+            state_context: 状态上下文
+            compiled: 编译后的JASS函数
+
+        返回：
+            接受一个单位参数的过滤函数
+        """
+        cached = self._wrappers.get(compiled)
+        if cached is not None and cached[0] is state_context:
+            return cached[1]
+
+        def func_wrapper(unit):
+            # 将 unit 存入全局变量，供过滤函数访问
+            if hasattr(state_context, 'set_global'):
+                state_context.set_global('FilterUnit', unit)
+            result = compiled()
+            return result if result is not None else False
+
+        self._wrappers[compiled] = (state_context, func_wrapper)
+        return func_wrapper
+
     def execute(self, state_context, func: Callable, *args, **kwargs):
         """执行 Filter native 函数。
 
@@ -129,20 +153,11 @@ class Filter(NativeFunction):
         if isinstance(func, str) and func.startswith("function:"):
             func_name = func[9:]  # 去掉 'function:' 前缀
             # 从 state_context 获取解释器
+            compiled = None
             if hasattr(state_context, 'interpreter') and state_context.interpreter:
-                interpreter = state_context.interpreter
-                def func_wrapper(unit):
-                    # 将 unit 存入全局变量，供过滤函数访问
-                    if hasattr(state_context, 'set_global'):
-                        state_context.set_global('FilterUnit', unit)
-                    if func_name in interpreter.functions:
-                        from ..parser.parser import FunctionDecl
-                        f = interpreter.functions[func_name]
-                        if isinstance(f, FunctionDecl):
-                            result = interpreter.execute_function(f)
-                            return result if result is not None else False
-                    return False
-                func = func_wrapper
+                compiled = state_context.interpreter.compile_function(func_name)
+            if compiled is not None:
+                func = self._wrap(state_context, compiled)
             else:
                 logger.error(f"[Filter] Cannot resolve function reference: {func}")
                 return None
@@ -0,0 +1,205 @@
+"""事件响应 native 函数实现。
+
+此模块包含读取当前事件上下文的 native 函数，
+如 GetTriggerUnit、GetTriggerPlayer、GetEnumUnit、GetFilterUnit 和 GetEnumPlayer。
+这些函数只读取 StateContext.event_responses 的栈顶帧。
+"""
+
+import logging
+from typing import Optional
+
+from .base import NativeFunction
+from .handle import Player, Unit
+
+
+logger = logging.getLogger(__name__)
+
+
+class GetTriggerUnit(NativeFunction):
+    """获取触发当前事件的单位。
+
+    对应JASS native函数: unit GetTriggerUnit()
+    """
+
+    @property
+    def name(self) -> str:
+        """获取native函数的名称。
+
+        返回：
+            "GetTriggerUnit"
+        """
+        return "GetTriggerUnit"
+
+    def execute(self, state_context, *args, **kwargs) -> Optional[Unit]:
+        """执行 GetTriggerUnit 原生函数。
+
+        参数：
+            state_context: 状态上下文
+            *args: 额外位置参数
+            **kwargs: 关键字参数
+
+        返回：
+            触发单位（死亡事件中为已死亡的单位），当前事件没有单位时返回None
+        """
+        unit_id = state_context.event_responses.top.event_data.get("unit_id")
+        if unit_id is None:
+            return None
+        return state_context.handle_manager.get_unit(unit_id, include_dead=True)
+
+
+class GetTriggerPlayer(NativeFunction):
+    """获取触发当前事件的玩家。
+
+    对应JASS native函数: player GetTriggerPlayer()
+    """
+
+    @property
+    def name(self) -> str:
+        """获取native函数的名称。
+
+        返回：
+            "GetTriggerPlayer"
+        """
+        return "GetTriggerPlayer"
+
+    def execute(self, state_context, *args, **kwargs) -> Optional[Player]:
+        """执行 GetTriggerPlayer 原生函数。
+
+        事件数据没有玩家ID时，返回触发单位的所有者。
+
+        参数：
+            state_context: 状态上下文
+            *args: 额外位置参数
+            **kwargs: 关键字参数
+
+        返回：
+            触发玩家，当前事件没有玩家时返回None
+        """
+        event_data = state_context.event_responses.top.event_data
+        handle_manager = state_context.handle_manager
+        player_id = event_data.get("player_id")
+        if player_id is None:
+            unit_id = event_data.get("unit_id")
+            unit = handle_manager.get_unit(unit_id, include_dead=True) if unit_id else None
+            if unit is None:
+                return None
+            player_id = unit.player_id
+        if isinstance(player_id, Player):
+            return player_id
+        return handle_manager.get_player(player_id)
+
+
+class GetTriggeringTrigger(NativeFunction):
+    """获取当前正在运行的触发器。
+
+    对应JASS native函数: trigger GetTriggeringTrigger()
+    """
+
+    @property
+    def name(self) -> str:
+        """获取native函数的名称。
+
+        返回：
+            "GetTriggeringTrigger"
+        """
+        return "GetTriggeringTrigger"
+
+    def execute(self, state_context, *args, **kwargs) -> Optional[str]:
+        """执行 GetTriggeringTrigger 原生函数。
+
+        参数：
+            state_context: 状态上下文
+            *args: 额外位置参数
+            **kwargs: 关键字参数
+
+        返回：
+            触发器ID，不在触发器中运行时返回None
+        """
+        return state_context.event_responses.top.trigger_id
+
+
+class GetEnumUnit(NativeFunction):
+    """获取 ForGroup 当前遍历的单位。
+
+    对应JASS native函数: unit GetEnumUnit()
+    """
+
+    @property
+    def name(self) -> str:
+        """获取native函数的名称。
+
+        返回：
+            "GetEnumUnit"
+        """
+        return "GetEnumUnit"
+
+    def execute(self, state_context, *args, **kwargs) -> Optional[Unit]:
+        """执行 GetEnumUnit 原生函数。
+
+        参数：
+            state_context: 状态上下文
+            *args: 额外位置参数
+            **kwargs: 关键字参数
+
+        返回：
+            当前遍历的单位，不在 ForGroup 回调中时返回None
+        """
+        return state_context.event_responses.top.enum_unit
+
+
+class GetFilterUnit(NativeFunction):
+    """获取单位枚举过滤器当前检查的单位。
+
+    对应JASS native函数: unit GetFilterUnit()
+    """
+
+    @property
+    def name(self) -> str:
+        """获取native函数的名称。
+
+        返回：
+            "GetFilterUnit"
+        """
+        return "GetFilterUnit"
+
+    def execute(self, state_context, *args, **kwargs) -> Optional[Unit]:
+        """执行 GetFilterUnit 原生函数。
+
+        参数：
+            state_context: 状态上下文
+            *args: 额外位置参数
+            **kwargs: 关键字参数
+
+        返回：
+            当前检查的单位，不在过滤器中时返回None
+        """
+        return state_context.event_responses.top.filter_unit
+
+
+class GetEnumPlayer(NativeFunction):
+    """获取 ForForce 当前遍历的玩家。
+
+    对应JASS native函数: player GetEnumPlayer()
+    """
+
+    @property
+    def name(self) -> str:
+        """获取native函数的名称。
+
+        返回：
+            "GetEnumPlayer"
+        """
+        return "GetEnumPlayer"
+
+    def execute(self, state_context, *args, **kwargs) -> Optional[Player]:
+        """执行 GetEnumPlayer 原生函数。
+
+        参数：
+            state_context: 状态上下文
+            *args: 额外位置参数
+            **kwargs: 关键字参数
+
+        返回：
+            当前遍历的玩家，不在 ForForce 回调中时返回None
+        """
+        return state_context.event_responses.top.enum_player
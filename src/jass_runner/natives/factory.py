@@ -42,11 +42,12 @@ from .trigger_register_event_natives import (
 )
 from .gamestate_event_natives import TriggerRegisterGameStateEvent, SuspendTimeOfDay
 from .event_natives import ConvertPlayerUnitEvent, ConvertPlayerEvent, ConvertGameEvent, ConvertUnitEvent
+from .event_response_natives import GetTriggerUnit, GetTriggerPlayer, GetTriggeringTrigger, GetEnumUnit, GetFilterUnit, GetEnumPlayer
 from .async_natives import TriggerSleepAction, ExecuteFunc
 from .unit_property_natives import SetUnitState, GetUnitX, GetUnitY, GetUnitLoc, GetUnitTypeId, GetUnitName
 from .unit_position_natives import SetUnitPosition, SetUnitPositionLoc, CreateUnitAtLoc, GetUnitFacing, SetUnitFacing, CreateUnitAtLocByName
 from .location import LocationConstructor, RemoveLocation
-from .group_natives import CreateGroup, DestroyGroup, GroupAddUnit, GroupRemoveUnit, GroupClear, FirstOfGroup, IsUnitInGroup, ForGroup, BlzGroupGetSize, BlzGroupUnitAt, GroupEnumUnitsOfPlayer, GroupEnumUnitsInRange, GroupEnumUnitsInRangeOfLoc, GroupEnumUnitsInRect
+from .group_natives import CreateGroup, DestroyGroup, GroupAddUnit, GroupRemoveUnit, GroupClear, FirstOfGroup, IsUnitInGroup, ForGroup, BlzGroupGetSize, BlzGroupUnitAt, BlzGroupAddGroupFast, BlzGroupRemoveGroupFast, GroupEnumUnitsOfPlayer, GroupEnumUnitsInRange, GroupEnumUnitsInRangeOfLoc, GroupEnumUnitsInRect
 from .ability_natives import UnitAddAbility, UnitRemoveAbility, GetUnitAbilityLevel, SetUnitAbilityLevel, IncUnitAbilityLevel, DecUnitAbilityLevel, UnitMakeAbilityPermanent
 from .unit_state_natives import GetWidgetLife, SetWidgetLife, UnitDamageTarget, GetUnitLevel, IsUnitType, IsUnitAlive, IsUnitDead
 from .unit_ownership_natives import IsUnitOwnedByPlayer, SetUnitOwner, IsUnitAlly, IsUnitEnemy
@@ -107,6 +108,8 @@ from .force_natives import (
     ForceRemovePlayer,
     ForceClear,
     ForceEnumPlayers,
+    IsPlayerInForce,
+    ForForce,
 )
 from .game_speed_natives import (
     ConvertGameSpeed,
@@ -203,6 +206,14 @@ class NativeFactory:
         registry.register(ConvertGameEvent())
         registry.register(ConvertUnitEvent())
 
+        # 注册事件响应native函数
+        registry.register(GetTriggerUnit())
+        registry.register(GetTriggerPlayer())
+        registry.register(GetTriggeringTrigger())
+        registry.register(GetEnumUnit())
+        registry.register(GetFilterUnit())
+        registry.register(GetEnumPlayer())
+
         # 注册触发器生命周期native函数
         registry.register(CreateTrigger())
         registry.register(DestroyTrigger())
@@ -226,7 +237,7 @@ class NativeFactory:
         registry.register(TriggerExecute())
 
         # 注册触发器事件注册native函数
-        registry.register(TriggerRegisterTimerEvent())
+        registry.register(TriggerRegisterTimerEvent(self._timer_system))
         registry.register(TriggerRegisterTimerExpireEvent())
         registry.register(TriggerRegisterPlayerUnitEvent())
         registry.register(TriggerRegisterUnitEvent())
@@ -310,6 +321,8 @@ class NativeFactory:
         # 注册Blz单位组扩展函数
         registry.register(BlzGroupGetSize())
         registry.register(BlzGroupUnitAt())
+        registry.register(BlzGroupAddGroupFast())
+        registry.register(BlzGroupRemoveGroupFast())
 
         # 注册单位组枚举native函数
         registry.register(GroupEnumUnitsOfPlayer())
@@ -411,6 +424,8 @@ class NativeFactory:
         registry.register(ForceRemovePlayer())
         registry.register(ForceClear())
         registry.register(ForceEnumPlayers())
+        registry.register(IsPlayerInForce())
+        registry.register(ForForce())
 
         # 注册游戏速度相关 native 函数
         registry.register(ConvertGameSpeed())
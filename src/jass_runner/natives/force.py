@@ -1,20 +1,42 @@
 """JASS Force玩家组（队伍）类。
 
 此模块包含JASS玩家组handle的实现。
+玩家组保存为16位掩码（第 player_id 位表示该玩家在组内），
+合并、求交、包含检查都是一次整数运算，
+遍历使用按掩码缓存的玩家ID元组，不需要分配新的集合。
 """
 
-from typing import Set
+from functools import lru_cache
+from typing import Set, Tuple
 
 from .handle_base import Handle
 
+# 玩家数量（ID 0-15）
+MAX_PLAYERS = 16
+# 所有玩家位都置1的掩码
+ALL_PLAYERS_MASK = (1 << MAX_PLAYERS) - 1
+
+
+@lru_cache(maxsize=None)
+def players_in_mask(mask: int) -> Tuple[int, ...]:
+    """获取掩码中的玩家ID，按ID升序排列。
+
+    参数：
+        mask: 玩家掩码
+
+    返回：
+        玩家ID元组，相同掩码返回同一个元组
+    """
+    return tuple(player_id for player_id in range(MAX_PLAYERS) if (mask >> player_id) & 1)
+
 
 class Force(Handle):
     """玩家组（队伍）句柄。
 
-    用于管理一组玩家，支持添加、移除玩家等操作。
+    用于管理一组玩家，支持添加、移除玩家以及整组合并、求交等操作。
 
     属性：
-        _players: 玩家ID集合
+        mask: 玩家掩码
     """
 
     def __init__(self, force_id: str):
@@ -24,20 +46,23 @@ class Force(Handle):
             force_id: 玩家组唯一标识符
         """
         super().__init__(force_id, "force")
-        self._players: Set[int] = set()  # 存储玩家ID集合
+        self.mask = 0
 
     def add_player(self, player_id: int) -> bool:
         """添加玩家到组。
 
         参数：
-            player_id: 玩家ID
+            player_id: 玩家ID（0-15）
 
         返回：
-            如果添加成功返回True，玩家已在组中返回False
+            如果添加成功返回True，玩家已在组中或ID无效返回False
         """
-        if player_id in self._players:
+        if not 0 <= player_id < MAX_PLAYERS:
+            return False
+        bit = 1 << player_id
+        if self.mask & bit:
             return False
-        self._players.add(player_id)
+        self.mask |= bit
         return True
 
     def remove_player(self, player_id: int) -> bool:
@@ -49,14 +74,14 @@ class Force(Handle):
         返回：
             如果移除成功返回True，玩家不在组中返回False
         """
-        if player_id not in self._players:
+        if not self.contains(player_id):
             return False
-        self._players.remove(player_id)
+        self.mask &= ~(1 << player_id)
         return True
 
     def clear(self) -> None:
         """清空玩家组，移除所有玩家。"""
-        self._players.clear()
+        self.mask = 0
 
     def contains(self, player_id: int) -> bool:
         """检查玩家是否在组中。
@@ -67,12 +92,44 @@ class Force(Handle):
         返回：
             如果玩家在组中返回True，否则返回False
         """
-        return player_id in self._players
+        return 0 <= player_id < MAX_PLAYERS and (self.mask >> player_id) & 1 == 1
+
+    def add_force(self, other: 'Force') -> None:
+        """把另一个玩家组的所有玩家加入本组（并集）。
+
+        参数：
+            other: 另一个玩家组
+        """
+        self.mask |= other.mask
+
+    def intersect(self, other: 'Force') -> None:
+        """只保留同时在另一个玩家组中的玩家（交集）。
+
+        参数：
+            other: 另一个玩家组
+        """
+        self.mask &= other.mask
+
+    def players(self) -> Tuple[int, ...]:
+        """获取组内玩家ID，按ID升序排列。
+
+        返回：
+            缓存的玩家ID元组，不可修改
+        """
+        return players_in_mask(self.mask)
 
     def get_players(self) -> Set[int]:
         """获取组内所有玩家ID。
 
         返回：
-            玩家ID集合的副本
+            玩家ID集合
+        """
+        return set(players_in_mask(self.mask))
+
+    def size(self) -> int:
+        """获取组内玩家数量。
+
+        返回：
+            玩家数量
         """
-        return self._players.copy()
+        return bin(self.mask).count("1")
@@ -4,13 +4,32 @@
 """
 
 import logging
-from typing import Optional
+from typing import Any, Callable, Optional
 from ..natives.base import NativeFunction
+from .force import ALL_PLAYERS_MASK, Force, players_in_mask
+from .player import Player
 
 
 logger = logging.getLogger(__name__)
 
 
+def _get_force(state_context, force: Any) -> Optional[Force]:
+    """获取存活的玩家组，参数可以是 Force 对象或 force ID。"""
+    if isinstance(force, Force):
+        return force if force.is_alive() else None
+    handle = state_context.handle_manager.get_handle(force)
+    return handle if isinstance(handle, Force) else None
+
+
+def _player_id(player: Any) -> Optional[int]:
+    """获取玩家ID，参数可以是 Player 对象或玩家ID。"""
+    if isinstance(player, Player):
+        return player.player_id
+    if isinstance(player, int) and not isinstance(player, bool):
+        return player
+    return None
+
+
 class CreateForce(NativeFunction):
     """创建新的玩家组。"""
 
@@ -46,9 +65,6 @@ class CreateForce(NativeFunction):
         # 生成唯一ID
         handle_id = f"force_{state_context.handle_manager._generate_id()}"
 
-        # 导入 Force 类
-        from .handle import Force
-
         # 创建 Force 对象
         force = Force(handle_id)
 
@@ -129,16 +145,19 @@ class ForceAddPlayer(NativeFunction):
             return None
 
         # 获取 force 对象
-        force = state_context.handle_manager.get_handle(force_id)
-        if force is None or force.type_name != "force":
+        force = _get_force(state_context, force_id)
+        if force is None:
             logger.warning(f"[ForceAddPlayer] force not found: {force_id}")
             return None
 
+        pid = _player_id(player_id)
+        if pid is None:
+            logger.warning(f"[ForceAddPlayer] invalid player: {player_id}")
+            return None
+
         # 添加玩家
-        from .handle import Force
-        if isinstance(force, Force):
-            force.add_player(player_id)
-            logger.info(f"[ForceAddPlayer] Added player {player_id} to force {force_id}")
+        force.add_player(pid)
+        logger.info(f"[ForceAddPlayer] Added player {pid} to force {force.id}")
 
         return None
 
@@ -174,16 +193,19 @@ class ForceRemovePlayer(NativeFunction):
             return None
 
         # 获取 force 对象
-        force = state_context.handle_manager.get_handle(force_id)
-        if force is None or force.type_name != "force":
+        force = _get_force(state_context, force_id)
+        if force is None:
             logger.warning(f"[ForceRemovePlayer] force not found: {force_id}")
             return None
 
+        pid = _player_id(player_id)
+        if pid is None:
+            logger.warning(f"[ForceRemovePlayer] invalid player: {player_id}")
+            return None
+
         # 移除玩家
-        from .handle import Force
-        if isinstance(force, Force):
-            force.remove_player(player_id)
-            logger.info(f"[ForceRemovePlayer] Removed player {player_id} from force {force_id}")
+        force.remove_player(pid)
+        logger.info(f"[ForceRemovePlayer] Removed player {pid} from force {force.id}")
 
         return None
 
@@ -218,16 +240,14 @@ class ForceClear(NativeFunction):
             return None
 
         # 获取 force 对象
-        force = state_context.handle_manager.get_handle(force_id)
-        if force is None or force.type_name != "force":
+        force = _get_force(state_context, force_id)
+        if force is None:
             logger.warning(f"[ForceClear] force not found: {force_id}")
             return None
 
         # 清空玩家组
-        from .handle import Force
-        if isinstance(force, Force):
-            force.clear()
-            logger.info(f"[ForceClear] Cleared force: {force_id}")
+        force.clear()
+        logger.info(f"[ForceClear] Cleared force: {force.id}")
 
         return None
 
@@ -263,35 +283,103 @@ class ForceEnumPlayers(NativeFunction):
             return None
 
         # 获取 force 对象
-        force = state_context.handle_manager.get_handle(force_id)
-        if force is None or force.type_name != "force":
+        force = _get_force(state_context, force_id)
+        if force is None:
             logger.warning(f"[ForceEnumPlayers] force not found: {force_id}")
             return None
 
-        # 获取 filter（如果有）
-        filter_func = None
-        if filter_id:
-            from .handle import FilterFunc
-            f = state_context.handle_manager.get_handle(filter_id)
-            if isinstance(f, FilterFunc):
-                filter_func = f
-
-        # 枚举所有 16 个玩家
-        from .handle import Force, Player
-        if isinstance(force, Force):
-            for pid in range(16):
-                player = state_context.handle_manager.get_player(pid)
-                if player:
-                    # 如果有 filter，先评估 filter
-                    if filter_func:
-                        # filter 评估玩家是否通过
-                        # 注意：FilterFunc 期望的是 unit 参数，但这里传入 player
-                        # 这里简化处理，直接添加所有玩家
-                        force.add_player(pid)
-                    else:
-                        # 无 filter，添加所有玩家
-                        force.add_player(pid)
-
-            logger.info(f"[ForceEnumPlayers] Enumerated players into force: {force_id}")
+        # 所有 16 个玩家一次加入组
+        # 注意：FilterFunc 期望的是 unit 参数，这里传入的过滤器暂不评估，直接添加所有玩家
+        force.mask |= ALL_PLAYERS_MASK
+        logger.info(f"[ForceEnumPlayers] Enumerated players into force: {force.id}")
+
+        return None
+
+
+class IsPlayerInForce(NativeFunction):
+    """检查玩家是否在玩家组中。
+
+    对应JASS native函数: boolean IsPlayerInForce(player whichPlayer, force whichForce)
+    """
+
+    @property
+    def name(self) -> str:
+        """获取 native 函数的名称。
+
+        返回：
+            "IsPlayerInForce"
+        """
+        return "IsPlayerInForce"
+
+    def execute(self, state_context, player: Any, force_id: Any, *args, **kwargs) -> bool:
+        """执行 IsPlayerInForce native 函数。
+
+        参数：
+            state_context: 状态上下文，必须包含 handle_manager
+            player: 玩家对象或玩家 ID
+            force_id: 玩家组对象或 ID
+
+        返回：
+            玩家在组中返回True，否则返回False
+        """
+        force = _get_force(state_context, force_id)
+        pid = _player_id(player)
+        if force is None or pid is None:
+            return False
+        return force.contains(pid)
+
+
+class ForForce(NativeFunction):
+    """遍历玩家组中的每个玩家并执行回调函数。
+
+    对应JASS native函数: nothing ForForce(force whichForce, code callback)
+
+    遍历开始时组内玩家已确定，回调中修改玩家组不影响本次遍历。
+    """
+
+    @property
+    def name(self) -> str:
+        """获取 native 函数的名称。
+
+        返回：
+            "ForForce"
+        """
+        return "ForForce"
+
+    def execute(self, state_context, force_id: Any, callback: Callable[[Player], None],
+                *args, **kwargs):
+        """执行 ForForce native 函数。
+
+        参数：
+            state_context: 状态上下文，必须包含 handle_manager
+            force_id: 玩家组对象或 ID
+            callback: 对每个玩家执行的回调函数，接收player参数
+
+        返回：
+            None（对应 JASS 的 nothing）
+        """
+        force = _get_force(state_context, force_id)
+        if force is None:
+            logger.warning(f"[ForForce] force not found: {force_id}")
+            return None
+
+        if callback is None:
+            logger.warning("[ForForce] 回调为None")
+            return None
+
+        handle_manager = state_context.handle_manager
+        # 回调期间当前玩家位于事件响应栈顶，供 GetEnumPlayer 读取
+        responses = state_context.event_responses
+        frame = responses.push_enum_player()
+        try:
+            for pid in players_in_mask(force.mask):
+                player = handle_manager.get_player(pid)
+                frame.enum_player = player
+                try:
+                    callback(player)
+                except Exception as e:
+                    logger.error(f"[ForForce] 回调执行错误: {e}")
+        finally:
+            responses.pop()
 
         return None
@@ -1,9 +1,15 @@
 """JASS Group单位组类。
 
 此模块包含JASS单位组handle的实现。
+成员以单位对象保存在一个稠密列表中，另有单位ID到列表下标的索引字典，
+添加、移除、查询和按下标访问都是O(1)。移除时用最后一个成员填补空位，
+因此遍历顺序是确定的（与添加和移除的操作序列一一对应）。
+
+单位死亡时只把所在的组标记为待清理，死亡单位在下一次读取组内容时
+一次性移除（惰性清理），不会在每次死亡时扫描所有组。
 """
 
-from typing import Optional, Set
+from typing import Dict, Iterable, List, Optional
 
 from .handle_base import Handle
 from .unit import Unit
@@ -12,7 +18,7 @@ from .unit import Unit
 class Group(Handle):
     """单位组，包含一组单位的引用。
 
-    用于管理一组相关单位，支持添加、移除、遍历等操作。
+    用于管理一组相关单位，支持添加、移除、遍历和整组合并等操作。
     """
 
     def __init__(self, group_id: str):
@@ -22,7 +28,25 @@ class Group(Handle):
             group_id: 组的唯一标识符
         """
         super().__init__(group_id, "group")
-        self._units: Set[str] = set()  # 存储单位ID集合
+        self._units: List[Unit] = []  # 按顺序存储的单位对象
+        self._index: Dict[str, int] = {}  # 单位ID -> 在 _units 中的下标
+        self._dirty = False  # 有成员死亡，等待清理
+
+    def mark_dirty(self):
+        """标记组内有成员死亡，由 Unit.destroy 调用。"""
+        self._dirty = True
+
+    def _prune(self):
+        """移除已死亡的成员，保持存活成员的相对顺序。"""
+        self._dirty = False
+        alive = []
+        for unit in self._units:
+            if unit.is_alive():
+                alive.append(unit)
+            else:
+                unit.groups.pop(self.id, None)
+        self._units = alive
+        self._index = {unit.id: index for index, unit in enumerate(alive)}
 
     def add_unit(self, unit: Unit) -> bool:
         """添加单位到组。
@@ -37,11 +61,34 @@ class Group(Handle):
             return False
         if not unit.is_alive():
             return False
-        if unit.id in self._units:
+        if unit.id in self._index:
             return False
-        self._units.add(unit.id)
+        self._index[unit.id] = len(self._units)
+        self._units.append(unit)
+        unit.groups[self.id] = self
         return True
 
+    def add_units(self, units: Iterable[Unit]) -> int:
+        """批量添加单位到组。
+
+        参数：
+            units: 要添加的单位
+
+        返回：
+            实际加入组的单位数量
+        """
+        members = self._units
+        index = self._index
+        added_count = 0
+        for unit in units:
+            if unit.id in index or not unit.is_alive():
+                continue
+            index[unit.id] = len(members)
+            members.append(unit)
+            unit.groups[self.id] = self
+            added_count += 1
+        return added_count
+
     def remove_unit(self, unit: Unit) -> bool:
         """从组中移除单位。
 
@@ -53,14 +100,70 @@ class Group(Handle):
         """
         if not unit:
             return False
-        if unit.id not in self._units:
+        index = self._index.pop(unit.id, None)
+        if index is None:
             return False
-        self._units.remove(unit.id)
+        # 用最后一个成员填补空位，避免移动后续元素
+        last = self._units.pop()
+        if index < len(self._units):
+            self._units[index] = last
+            self._index[last.id] = index
+        unit.groups.pop(self.id, None)
         return True
 
+    def add_group(self, other: 'Group') -> int:
+        """把另一个组的所有存活成员加入本组。
+
+        参数：
+            other: 来源单位组
+
+        返回：
+            实际加入本组的单位数量
+        """
+        if other is self:
+            return 0
+        return self.add_units(other.get_members())
+
+    def remove_group(self, other: 'Group') -> int:
+        """从本组移除另一个组中的所有成员。
+
+        参数：
+            other: 要移除的单位所在的组
+
+        返回：
+            实际从本组移除的单位数量
+        """
+        if other is self:
+            removed_count = self.size()
+            self.clear()
+            return removed_count
+        if self._dirty:
+            self._prune()
+        if other._dirty:
+            other._prune()
+        removing = other._index
+        if not removing or not self._units:
+            return 0
+        # 一次过滤重建比逐个交换移除更快，并保持剩余成员的相对顺序
+        kept = []
+        for unit in self._units:
+            if unit.id in removing:
+                unit.groups.pop(self.id, None)
+            else:
+                kept.append(unit)
+        removed_count = len(self._units) - len(kept)
+        if removed_count:
+            self._units = kept
+            self._index = {unit.id: index for index, unit in enumerate(kept)}
+        return removed_count
+
     def clear(self):
         """清空单位组，移除所有单位。"""
-        self._units.clear()
+        for unit in self._units:
+            unit.groups.pop(self.id, None)
+        self._units = []
+        self._index.clear()
+        self._dirty = False
 
     def first(self) -> Optional[str]:
         """获取组内第一个单位的ID。
@@ -68,9 +171,8 @@ class Group(Handle):
         返回：
             第一个单位的ID，如果组为空返回None
         """
-        if not self._units:
-            return None
-        return next(iter(self._units))
+        unit = self.member_at(0)
+        return unit.id if unit is not None else None
 
     def contains(self, unit: Unit) -> bool:
         """检查单位是否在组内。
@@ -83,22 +185,36 @@ class Group(Handle):
         """
         if not unit:
             return False
-        return unit.id in self._units
+        if self._dirty:
+            self._prune()
+        return unit.id in self._index
 
-    def get_units(self) -> Set[str]:
-        """获取组内所有单位的ID集合。
+    def get_members(self) -> List[Unit]:
+        """获取组内所有存活单位。
 
         返回：
-            单位ID的集合副本
+            按组内顺序排列的单位对象列表副本
         """
+        if self._dirty:
+            self._prune()
         return self._units.copy()
 
+    def get_units(self) -> List[str]:
+        """获取组内所有单位的ID列表。
+
+        返回：
+            按组内顺序排列的单位ID列表
+        """
+        return [unit.id for unit in self.get_members()]
+
     def size(self) -> int:
         """获取组内单位数量。
 
         返回：
             单位数量
         """
+        if self._dirty:
+            self._prune()
         return len(self._units)
 
     def get_size(self) -> int:
@@ -107,12 +223,26 @@ class Group(Handle):
         返回：
             单位数量
         """
-        return len(self._units)
+        return self.size()
+
+    def member_at(self, index: int) -> Optional[Unit]:
+        """获取指定索引位置的单位对象。
+
+        参数：
+            index: 索引位置（从0开始）
+
+        返回：
+            单位对象，如果索引无效返回None
+        """
+        if self._dirty:
+            self._prune()
+        if index < 0 or index >= len(self._units):
+            return None
+        return self._units[index]
 
     def unit_at(self, index: int) -> Optional[str]:
         """获取指定索引位置的单位ID。
 
-        注意: 由于set是无序的，索引位置不保证稳定。
         这个方法主要用于BlzGroupUnitAt的兼容性实现。
 
         参数：
@@ -121,13 +251,8 @@ class Group(Handle):
         返回：
             单位ID，如果索引无效返回None
         """
-        if index < 0 or index >= len(self._units):
-            return None
-
-        # 将set转换为list进行索引访问
-        # 注意: 顺序不保证稳定
-        units_list = list(self._units)
-        return units_list[index]
+        unit = self.member_at(index)
+        return unit.id if unit is not None else None
 
     def destroy(self):
         """销毁单位组，清理所有单位引用。"""
@@ -6,12 +6,50 @@
 import logging
 from typing import Optional, Callable
 from .base import NativeFunction
+from .boolexpr import BoolExpr
 from .handle import Group, Unit, Player, Rect
 from .location import Location
 
 logger = logging.getLogger(__name__)
 
 
+def _add_filtered_units(state_context, group: Group, unit_ids, filter_func) -> int:
+    """把通过过滤器的存活单位加入组。
+
+    过滤器执行期间当前单位位于事件响应栈顶，供 GetFilterUnit 读取。
+
+    参数：
+        state_context: 状态上下文
+        group: 目标单位组
+        unit_ids: 候选单位ID列表
+        filter_func: 过滤函数、布尔表达式、布尔表达式handle ID或None
+
+    返回：
+        加入组的单位数量
+    """
+    handle_manager = state_context.handle_manager
+    if isinstance(filter_func, str):
+        filter_func = handle_manager.get_boolexpr(filter_func)
+    if isinstance(filter_func, BoolExpr):
+        filter_func = filter_func.predicate
+
+    get_unit = handle_manager.get_unit
+    units = [unit for unit in map(get_unit, unit_ids) if unit is not None]
+    if filter_func is not None:
+        responses = state_context.event_responses
+        frame = responses.push_filter()
+        try:
+            passed = []
+            for unit in units:
+                frame.filter_unit = unit
+                if filter_func(unit):
+                    passed.append(unit)
+        finally:
+            responses.pop()
+        units = passed
+    return group.add_units(units)
+
+
 class CreateGroup(NativeFunction):
     """创建一个新的单位组。
 
@@ -203,15 +241,7 @@ class FirstOfGroup(NativeFunction):
             logger.warning("[FirstOfGroup] 组为None")
             return None
 
-        first_unit_id = group.first()
-        if first_unit_id is None:
-            return None
-
-        # 通过HandleManager获取单位对象
-        handle_manager = state_context.handle_manager
-        unit = handle_manager.get_unit(first_unit_id)
-
-        return unit
+        return group.member_at(0)
 
 
 class IsUnitInGroup(NativeFunction):
@@ -272,18 +302,24 @@ class ForGroup(NativeFunction):
             logger.warning("[ForGroup] 回调为None")
             return
 
-        handle_manager = state_context.handle_manager
-        unit_ids = group.get_units()
+        units = group.get_members()
 
-        for unit_id in unit_ids:
-            unit = handle_manager.get_unit(unit_id)
-            if unit and unit.is_alive():
-                try:
-                    callback(unit)
-                except Exception as e:
-                    logger.error(f"[ForGroup] 回调执行错误: {e}")
+        # 回调期间当前单位位于事件响应栈顶，供 GetEnumUnit 读取
+        responses = state_context.event_responses
+        frame = responses.push_enum()
+        try:
+            for unit in units:
+                # 回调中可能杀死组内的其他单位
+                if unit.is_alive():
+                    frame.enum_unit = unit
+                    try:
+                        callback(unit)
+                    except Exception as e:
+                        logger.error(f"[ForGroup] 回调执行错误: {e}")
+        finally:
+            responses.pop()
 
-        logger.debug(f"[ForGroup] 遍历组{group.id}完成，处理了{len(unit_ids)}个单位")
+        logger.debug(f"[ForGroup] 遍历组{group.id}完成，处理了{len(units)}个单位")
 
 
 class BlzGroupGetSize(NativeFunction):
@@ -321,7 +357,6 @@ class BlzGroupUnitAt(NativeFunction):
     对应JASS native函数: unit BlzGroupUnitAt(group whichGroup, integer index)
 
     这是暴雪扩展函数（Blz前缀），用于按索引访问组内单位。
-    注意: 由于set是无序的，索引位置不保证稳定。
     """
 
     @property
@@ -343,15 +378,61 @@ class BlzGroupUnitAt(NativeFunction):
         if group is None:
             return None
 
-        unit_id = group.unit_at(index)
-        if unit_id is None:
-            return None
+        return group.member_at(index)
 
-        # 通过HandleManager获取单位对象
-        handle_manager = state_context.handle_manager
-        unit = handle_manager.get_unit(unit_id)
 
-        return unit
+class BlzGroupAddGroupFast(NativeFunction):
+    """把一个组的所有单位添加到另一个组。
+
+    对应JASS native函数: integer BlzGroupAddGroupFast(group whichGroup, group addGroup)
+    """
+
+    @property
+    def name(self) -> str:
+        """获取函数名称。"""
+        return "BlzGroupAddGroupFast"
+
+    def execute(self, state_context, group: Group, add_group: Group) -> int:
+        """执行BlzGroupAddGroupFast native函数。
+
+        参数：
+            state_context: 状态上下文
+            group: 目标单位组
+            add_group: 来源单位组
+
+        返回：
+            实际添加的单位数量
+        """
+        if group is None or add_group is None:
+            return 0
+        return group.add_group(add_group)
+
+
+class BlzGroupRemoveGroupFast(NativeFunction):
+    """从一个组移除另一个组中的所有单位。
+
+    对应JASS native函数: integer BlzGroupRemoveGroupFast(group whichGroup, group removeGroup)
+    """
+
+    @property
+    def name(self) -> str:
+        """获取函数名称。"""
+        return "BlzGroupRemoveGroupFast"
+
+    def execute(self, state_context, group: Group, remove_group: Group) -> int:
+        """执行BlzGroupRemoveGroupFast native函数。
+
+        参数：
+            state_context: 状态上下文
+            group: 目标单位组
+            remove_group: 要移除的单位所在的组
+
+        返回：
+            实际移除的单位数量
+        """
+        if group is None or remove_group is None:
+            return 0
+        return group.remove_group(remove_group)
 
 
 class GroupEnumUnitsOfPlayer(NativeFunction):
@@ -394,14 +475,7 @@ class GroupEnumUnitsOfPlayer(NativeFunction):
         # 获取该玩家的所有单位
         unit_ids = handle_manager.enum_units_of_player(player.player_id)
 
-        added_count = 0
-        for unit_id in unit_ids:
-            unit = handle_manager.get_unit(unit_id)
-            if unit and unit.is_alive():
-                # 应用过滤器（如果有）
-                if filter_func is None or filter_func(unit):
-                    group.add_unit(unit)
-                    added_count += 1
+        added_count = _add_filtered_units(state_context, group, unit_ids, filter_func)
 
         logger.debug(f"[GroupEnumUnitsOfPlayer] 玩家{player.player_id}的{added_count}个单位添加到组{group.id}")
 
@@ -445,14 +519,7 @@ class GroupEnumUnitsInRange(NativeFunction):
         # 获取范围内的所有单位
         unit_ids = handle_manager.enum_units_in_range(x, y, radius)
 
-        added_count = 0
-        for unit_id in unit_ids:
-            unit = handle_manager.get_unit(unit_id)
-            if unit and unit.is_alive():
-                # 应用过滤器（如果有）
-                if filter_func is None or filter_func(unit):
-                    group.add_unit(unit)
-                    added_count += 1
+        added_count = _add_filtered_units(state_context, group, unit_ids, filter_func)
 
         logger.debug(f"[GroupEnumUnitsInRange] 范围({x}, {y})半径{radius}内的{added_count}个单位添加到组{group.id}")
 
@@ -529,13 +596,6 @@ class GroupEnumUnitsInRect(NativeFunction):
         # 获取矩形内的所有单位
         unit_ids = handle_manager.enum_units_in_rect(rect)
 
-        added_count = 0
-        for unit_id in unit_ids:
-            unit = handle_manager.get_unit(unit_id)
-            if unit and unit.is_alive():
-                # 应用过滤器（如果有）
-                if filter_func is None or filter_func(unit):
-                    group.add_unit(unit)
-                    added_count += 1
+        added_count = _add_filtered_units(state_context, group, unit_ids, filter_func)
 
         logger.debug(f"[GroupEnumUnitsInRect] 矩形区域内的{added_count}个单位添加到组{group.id}")
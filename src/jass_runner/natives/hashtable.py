@@ -1,11 +1,21 @@
-"""JASS Hashtable 实现"""
+"""JASS Hashtable 实现
 
-from typing import Dict, Any, Optional, TYPE_CHECKING
+每种值类型使用一个 parentKey -> {childKey: 值} 的两层字典，
+FlushChildHashtable 只需按类型弹出 parentKey 对应的子字典。
+加载时未命中不会分配临时字典；删除最后一个子键时同时删除空的子字典。
+"""
+
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
 from .handle_base import Handle
+from .hashtable_snapshot import decode_buckets, encode_buckets
 
 if TYPE_CHECKING:
     from .manager import HandleManager
 
+Key = Tuple[int, int]
+# parentKey -> {childKey: 值}
+Table = Dict[int, Dict[int, Any]]
+
 
 class Hashtable(Handle):
     """JASS hashtable 实现
@@ -32,109 +42,136 @@ class Hashtable(Handle):
             handle_id: 唯一标识符
         """
         super().__init__(handle_id, "hashtable")
-        self._data: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self._integers: Table = {}
+        self._reals: Table = {}
+        self._booleans: Table = {}
+        self._strings: Table = {}
+        self._units: Table = {}
+        self._items: Table = {}
+        self._players: Table = {}
+        # 类型名 -> 该类型的两层字典
+        self._buckets: Dict[str, Table] = {
+            "integer": self._integers,
+            "real": self._reals,
+            "boolean": self._booleans,
+            "string": self._strings,
+            "unit": self._units,
+            "item": self._items,
+            "player": self._players,
+        }
+
+    # ========== 类型字典操作 ==========
+
+    @staticmethod
+    def _store(table: Table, parent_key: int, child_key: int, value: Any) -> None:
+        """在类型字典中保存值，parentKey 第一次出现时创建子字典"""
+        children = table.get(parent_key)
+        if children is None:
+            table[parent_key] = {child_key: value}
+        else:
+            children[child_key] = value
+
+    @staticmethod
+    def _load(table: Table, parent_key: int, child_key: int, default: Any) -> Any:
+        """从类型字典中加载值，不存在返回 default"""
+        children = table.get(parent_key)
+        if children is None:
+            return default
+        return children.get(child_key, default)
+
+    @staticmethod
+    def _contains(table: Table, parent_key: int, child_key: int) -> bool:
+        """检查类型字典中是否存在该键"""
+        children = table.get(parent_key)
+        return children is not None and child_key in children
+
+    @staticmethod
+    def _remove(table: Table, parent_key: int, child_key: int) -> None:
+        """从类型字典中删除值，子字典变空时一并删除"""
+        children = table.get(parent_key)
+        if children is not None:
+            children.pop(child_key, None)
+            if not children:
+                del table[parent_key]
 
     # ========== Save 方法 ==========
 
     def save_integer(self, parent_key: int, child_key: int, value: int) -> None:
-        """存储整数"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["integer"] = value
+        """存储整数，非整数值（如 Python 调用方传入的 3.0）按 JASS 规则截断为整数"""
+        self._store(self._integers, parent_key, child_key, int(value))
 
     def save_real(self, parent_key: int, child_key: int, value: float) -> None:
         """存储实数"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["real"] = value
+        self._store(self._reals, parent_key, child_key, value)
 
     def save_boolean(self, parent_key: int, child_key: int, value: bool) -> None:
         """存储布尔值"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["boolean"] = value
+        self._store(self._booleans, parent_key, child_key, value)
 
     def save_string(self, parent_key: int, child_key: int, value: str) -> bool:
         """存储字符串，返回是否成功（总是True）"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["string"] = value
+        self._store(self._strings, parent_key, child_key, value)
         return True
 
     # ========== Handle Save 方法 ==========
 
     def save_unit_handle(self, parent_key: int, child_key: int, unit) -> bool:
         """存储单位 handle，返回是否成功"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["unit"] = unit.id
+        self._store(self._units, parent_key, child_key, unit.id)
         return True
 
     def save_item_handle(self, parent_key: int, child_key: int, item) -> bool:
         """存储物品 handle，返回是否成功"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["item"] = item.id
+        self._store(self._items, parent_key, child_key, item.id)
         return True
 
     def save_player_handle(self, parent_key: int, child_key: int, player) -> bool:
         """存储玩家 handle，返回是否成功"""
-        if parent_key not in self._data:
-            self._data[parent_key] = {}
-        if child_key not in self._data[parent_key]:
-            self._data[parent_key][child_key] = {}
-        self._data[parent_key][child_key]["player"] = player.id
+        self._store(self._players, parent_key, child_key, player.id)
         return True
 
     # ========== Load 方法 ==========
+    # 基本类型的加载是最频繁的操作，直接内联查找，不经过 _load
 
     def load_integer(self, parent_key: int, child_key: int) -> int:
         """加载整数，不存在返回 0"""
-        return self._data.get(parent_key, {}).get(child_key, {}).get("integer", 0)
+        children = self._integers.get(parent_key)
+        return 0 if children is None else children.get(child_key, 0)
 
     def load_real(self, parent_key: int, child_key: int) -> float:
         """加载实数，不存在返回 0.0"""
-        return self._data.get(parent_key, {}).get(child_key, {}).get("real", 0.0)
+        children = self._reals.get(parent_key)
+        return 0.0 if children is None else children.get(child_key, 0.0)
 
     def load_boolean(self, parent_key: int, child_key: int) -> bool:
         """加载布尔值，不存在返回 False"""
-        return self._data.get(parent_key, {}).get(child_key, {}).get("boolean", False)
+        children = self._booleans.get(parent_key)
+        return False if children is None else children.get(child_key, False)
 
     def load_string(self, parent_key: int, child_key: int) -> Optional[str]:
         """加载字符串，不存在返回 null"""
-        return self._data.get(parent_key, {}).get(child_key, {}).get("string", None)
+        children = self._strings.get(parent_key)
+        return None if children is None else children.get(child_key)
 
     # ========== Handle Load 方法 ==========
 
     def load_unit_handle(self, parent_key: int, child_key: int, handle_manager: "HandleManager"):
         """加载单位 handle，不存在或已销毁返回 null"""
-        handle_id = self._data.get(parent_key, {}).get(child_key, {}).get("unit", None)
+        handle_id = self._load(self._units, parent_key, child_key, None)
         if handle_id is None:
             return None
         return handle_manager.get_unit(handle_id)
 
     def load_item_handle(self, parent_key: int, child_key: int, handle_manager: "HandleManager"):
         """加载物品 handle"""
-        handle_id = self._data.get(parent_key, {}).get(child_key, {}).get("item", None)
+        handle_id = self._load(self._items, parent_key, child_key, None)
         if handle_id is None:
             return None
         return handle_manager.get_item(handle_id)
 
     def load_player_handle(self, parent_key: int, child_key: int, handle_manager: "HandleManager"):
         """加载玩家 handle"""
-        handle_id = self._data.get(parent_key, {}).get(child_key, {}).get("player", None)
+        handle_id = self._load(self._players, parent_key, child_key, None)
         if handle_id is None:
             return None
         # 玩家ID格式为 "player_N"，提取N
@@ -147,67 +184,104 @@ class Hashtable(Handle):
 
     def have_saved_integer(self, parent_key: int, child_key: int) -> bool:
         """检查是否存在整数"""
-        return "integer" in self._data.get(parent_key, {}).get(child_key, {})
+        return self._contains(self._integers, parent_key, child_key)
 
     def have_saved_real(self, parent_key: int, child_key: int) -> bool:
         """检查是否存在实数"""
-        return "real" in self._data.get(parent_key, {}).get(child_key, {})
+        return self._contains(self._reals, parent_key, child_key)
 
     def have_saved_boolean(self, parent_key: int, child_key: int) -> bool:
         """检查是否存在布尔值"""
-        return "boolean" in self._data.get(parent_key, {}).get(child_key, {})
+        return self._contains(self._booleans, parent_key, child_key)
 
     def have_saved_string(self, parent_key: int, child_key: int) -> bool:
         """检查是否存在字符串"""
-        return "string" in self._data.get(parent_key, {}).get(child_key, {})
+        return self._contains(self._strings, parent_key, child_key)
 
     def have_saved_handle(self, parent_key: int, child_key: int) -> bool:
         """检查是否存在任意 handle 类型"""
-        child_data = self._data.get(parent_key, {}).get(child_key, {})
-        handle_types = ["unit", "item", "player"]
-        return any(ht in child_data for ht in handle_types)
+        return (self._contains(self._units, parent_key, child_key)
+                or self._contains(self._items, parent_key, child_key)
+                or self._contains(self._players, parent_key, child_key))
 
     # ========== 删除方法 ==========
 
     def remove_saved_integer(self, parent_key: int, child_key: int) -> None:
         """删除整数"""
-        child_data = self._data.get(parent_key, {}).get(child_key, {})
-        if "integer" in child_data:
-            del child_data["integer"]
+        self._remove(self._integers, parent_key, child_key)
 
     def remove_saved_real(self, parent_key: int, child_key: int) -> None:
         """删除实数"""
-        child_data = self._data.get(parent_key, {}).get(child_key, {})
-        if "real" in child_data:
-            del child_data["real"]
+        self._remove(self._reals, parent_key, child_key)
 
     def remove_saved_boolean(self, parent_key: int, child_key: int) -> None:
         """删除布尔值"""
-        child_data = self._data.get(parent_key, {}).get(child_key, {})
-        if "boolean" in child_data:
-            del child_data["boolean"]
+        self._remove(self._booleans, parent_key, child_key)
 
     def remove_saved_string(self, parent_key: int, child_key: int) -> None:
         """删除字符串"""
-        child_data = self._data.get(parent_key, {}).get(child_key, {})
-        if "string" in child_data:
-            del child_data["string"]
+        self._remove(self._strings, parent_key, child_key)
 
     def remove_saved_handle(self, parent_key: int, child_key: int) -> None:
         """删除所有 handle 类型"""
-        child_data = self._data.get(parent_key, {}).get(child_key, {})
-        handle_types = ["unit", "item", "player"]
-        for ht in handle_types:
-            if ht in child_data:
-                del child_data[ht]
+        self._remove(self._units, parent_key, child_key)
+        self._remove(self._items, parent_key, child_key)
+        self._remove(self._players, parent_key, child_key)
 
     # ========== 清空方法 ==========
 
     def flush_child(self, parent_key: int) -> None:
         """删除指定 parentKey 下所有数据"""
-        if parent_key in self._data:
-            del self._data[parent_key]
+        for table in self._buckets.values():
+            table.pop(parent_key, None)
 
     def flush_all(self) -> None:
         """清空整个 hashtable"""
-        self._data.clear()
+        for table in self._buckets.values():
+            table.clear()
+
+    def is_empty(self) -> bool:
+        """检查 hashtable 是否没有保存任何数据"""
+        return not any(self._buckets.values())
+
+    def entry_count(self) -> int:
+        """获取保存的条目数（同一键下不同类型的值分别计数）"""
+        return sum(len(children) for table in self._buckets.values() for children in table.values())
+
+    # ========== 快照 ==========
+
+    def snapshot(self) -> bytes:
+        """导出全部数据的二进制快照
+
+        Returns:
+            快照字节，内容相同的 hashtable 得到相同的字节
+        """
+        return encode_buckets({
+            type_name: {(parent_key, child_key): value
+                        for parent_key, children in table.items()
+                        for child_key, value in children.items()}
+            for type_name, table in self._buckets.items()
+        })
+
+    def restore(self, data: bytes) -> None:
+        """用快照替换全部数据
+
+        Args:
+            data: snapshot() 生成的字节
+
+        Raises:
+            ValueError: 快照格式无效
+        """
+        self.load_buckets(decode_buckets(data))
+
+    def load_buckets(self, buckets: Dict[str, Dict[Key, Any]]) -> None:
+        """用已解码的分类型数据替换全部数据
+
+        Args:
+            buckets: 类型名 -> {(parentKey, childKey): 值}
+        """
+        self.flush_all()
+        for type_name, entries in buckets.items():
+            table = self._buckets[type_name]
+            for (parent_key, child_key), value in entries.items():
+                self._store(table, parent_key, child_key, value)
@@ -0,0 +1,210 @@
+"""Hashtable 快照的二进制编码。
+
+快照按值类型分段，每段为列式存储：
+    类型标签（1字节）、条目数（varint）、
+    parentKey 列（按键排序后的 zigzag 增量）、
+    childKey 列（同一 parentKey 内的 zigzag 增量，换 parentKey 时从0重新计算）、
+    值列。
+值列按类型编码：integer 为 zigzag varint，real 为连续的 8 字节小端 double，
+boolean 按位打包，string 和 handle 类型为字符串表编号
+（0 表示 null，第一次出现的字符串内联其 UTF-8 内容）。
+
+条目按 (parentKey, childKey) 排序，相同内容的 hashtable 总是得到相同的字节，
+可以直接比较两次运行的快照。
+"""
+
+import io
+import struct
+from typing import Any, Dict, List, Tuple
+
+from ..utils.varint import read_varint, unzigzag, write_varint, zigzag
+
+MAGIC = b"JHTS\x01"
+BUNDLE_MAGIC = b"JHTB\x01"
+
+# 类型标签即在此元组中的下标
+TYPE_TAGS = ("integer", "real", "boolean", "string", "unit", "item", "player")
+
+
+def _write_keys(out: bytearray, keys: List[Tuple[int, int]]):
+    last_parent = 0
+    for parent_key, _ in keys:
+        write_varint(out, zigzag(parent_key - last_parent))
+        last_parent = parent_key
+    last_parent = None
+    last_child = 0
+    for parent_key, child_key in keys:
+        if parent_key != last_parent:
+            last_parent = parent_key
+            last_child = 0
+        write_varint(out, zigzag(child_key - last_child))
+        last_child = child_key
+
+
+def _read_keys(stream: io.BytesIO, count: int) -> List[Tuple[int, int]]:
+    parents = []
+    parent_key = 0
+    for _ in range(count):
+        parent_key += unzigzag(read_varint(stream))
+        parents.append(parent_key)
+    keys = []
+    last_parent = None
+    child_key = 0
+    for parent_key in parents:
+        if parent_key != last_parent:
+            last_parent = parent_key
+            child_key = 0
+        child_key += unzigzag(read_varint(stream))
+        keys.append((parent_key, child_key))
+    return keys
+
+
+def _read_exact(stream: io.BytesIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("hashtable 快照被截断")
+    return data
+
+
+def _write_values(out: bytearray, type_name: str, values: List[Any], strings: Dict[str, int]):
+    if type_name == "integer":
+        for value in values:
+            write_varint(out, zigzag(value))
+    elif type_name == "real":
+        out.extend(struct.pack(f"<{len(values)}d", *values))
+    elif type_name == "boolean":
+        packed = bytearray((len(values) + 7) // 8)
+        for index, value in enumerate(values):
+            if value:
+                packed[index >> 3] |= 1 << (index & 7)
+        out.extend(packed)
+    else:
+        for value in values:
+            if value is None:
+                write_varint(out, 0)
+                continue
+            index = strings.get(value)
+            if index is not None:
+                write_varint(out, index)
+                continue
+            index = len(strings) + 1
+            strings[value] = index
+            data = value.encode("utf-8")
+            write_varint(out, index)
+            write_varint(out, len(data))
+            out.extend(data)
+
+
+def _read_values(stream: io.BytesIO, type_name: str, count: int, strings: List[str]) -> List[Any]:
+    if type_name == "integer":
+        return [unzigzag(read_varint(stream)) for _ in range(count)]
+    if type_name == "real":
+        return list(struct.unpack(f"<{count}d", _read_exact(stream, count * 8)))
+    if type_name == "boolean":
+        packed = _read_exact(stream, (count + 7) // 8)
+        return [bool(packed[index >> 3] & (1 << (index & 7))) for index in range(count)]
+    values = []
+    for _ in range(count):
+        index = read_varint(stream)
+        if index == 0:
+            values.append(None)
+        elif index <= len(strings):
+            values.append(strings[index - 1])
+        else:
+            text = _read_exact(stream, read_varint(stream)).decode("utf-8")
+            strings.append(text)
+            values.append(text)
+    return values
+
+
+def encode_buckets(buckets: Dict[str, Dict[Tuple[int, int], Any]]) -> bytes:
+    """把 hashtable 的分类型存储编码为快照。
+
+    参数：
+        buckets: 类型名 -> {(parentKey, childKey): 值}
+
+    返回：
+        快照字节
+    """
+    out = bytearray(MAGIC)
+    sections = [(tag, buckets[name]) for tag, name in enumerate(TYPE_TAGS) if buckets.get(name)]
+    write_varint(out, len(sections))
+    strings: Dict[str, int] = {}
+    for tag, bucket in sections:
+        keys = sorted(bucket)
+        out.append(tag)
+        write_varint(out, len(keys))
+        _write_keys(out, keys)
+        _write_values(out, TYPE_TAGS[tag], [bucket[key] for key in keys], strings)
+    return bytes(out)
+
+
+def decode_buckets(data: bytes) -> Dict[str, Dict[Tuple[int, int], Any]]:
+    """解码快照。
+
+    参数：
+        data: 快照字节
+
+    返回：
+        类型名 -> {(parentKey, childKey): 值}
+
+    异常：
+        ValueError: 快照格式无效或被截断
+    """
+    stream = io.BytesIO(data)
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("不是有效的 hashtable 快照")
+    buckets: Dict[str, Dict[Tuple[int, int], Any]] = {}
+    strings: List[str] = []
+    for _ in range(read_varint(stream)):
+        tag = _read_exact(stream, 1)[0]
+        if tag >= len(TYPE_TAGS):
+            raise ValueError(f"未知的类型标签: {tag}")
+        type_name = TYPE_TAGS[tag]
+        count = read_varint(stream)
+        keys = _read_keys(stream, count)
+        values = _read_values(stream, type_name, count, strings)
+        buckets[type_name] = dict(zip(keys, values))
+    return buckets
+
+
+def encode_bundle(snapshots: Dict[str, bytes]) -> bytes:
+    """把多个 hashtable 的快照打包。
+
+    参数：
+        snapshots: hashtable ID -> 快照字节
+
+    返回：
+        打包后的字节，按 hashtable ID 排序
+    """
+    out = bytearray(BUNDLE_MAGIC)
+    write_varint(out, len(snapshots))
+    for handle_id in sorted(snapshots):
+        encoded_id = handle_id.encode("utf-8")
+        write_varint(out, len(encoded_id))
+        out.extend(encoded_id)
+        write_varint(out, len(snapshots[handle_id]))
+        out.extend(snapshots[handle_id])
+    return bytes(out)
+
+
+def decode_bundle(data: bytes) -> Dict[str, bytes]:
+    """拆分打包的快照。
+
+    参数：
+        data: encode_bundle 生成的字节
+
+    返回：
+        hashtable ID -> 快照字节
+
+    异常：
+        ValueError: 格式无效或被截断
+    """
+    stream = io.BytesIO(data)
+    if stream.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+        raise ValueError("不是有效的 hashtable 快照包")
+    snapshots = {}
+    for _ in range(read_varint(stream)):
+        handle_id = _read_exact(stream, read_varint(stream)).decode("utf-8")
+        snapshots[handle_id] = _read_exact(stream, read_varint(stream))
+    return snapshots
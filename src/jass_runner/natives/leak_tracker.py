@@ -0,0 +1,123 @@
+"""Handle泄漏检测。
+
+此模块包含 LeakTracker 类，记录每个handle创建时所在的JASS函数和行号，
+模拟结束后按类型和创建位置汇总仍然存活的handle，
+并计算模拟期间每分钟的增长量，用于定位 group、effect、boolexpr、location 等常见泄漏。
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .handle_base import Handle
+
+# 存活条目数达到此值后才开始清理已销毁的条目
+MIN_PRUNE_SIZE = 1024
+
+
+class LeakTracker:
+    """记录handle的创建位置并统计仍然存活的handle。
+
+    条目以对象的 id() 为键，同时持有对象引用，保证键在条目存在期间不被复用。
+    Handle 对象调用 destroy() 后视为已释放，已释放的条目在条目数翻倍时批量清理；
+    location 等不是 Handle 的值需要显式调用 release()。
+    """
+
+    def __init__(self, site_provider: Callable[[], str], clock: Callable[[], float]):
+        """初始化泄漏检测器。
+
+        参数：
+            site_provider: 返回当前创建位置（如 "函数名:行号"）的可调用对象
+            clock: 返回当前模拟时间（秒）的可调用对象
+        """
+        self._site_provider = site_provider
+        self._clock = clock
+        self._start_time = clock()
+        # id(对象) -> (对象, 类型名, 创建位置, 创建时间)
+        self._entries: Dict[int, Tuple[Any, str, str, float]] = {}
+        self._prune_at = MIN_PRUNE_SIZE
+        self.tracked = 0  # 累计记录的对象数
+
+    def track(self, obj: Any, type_name: str):
+        """记录一个新创建的对象。
+
+        参数：
+            obj: handle 或其他需要显式释放的值
+            type_name: 类型名
+        """
+        entries = self._entries
+        if len(entries) >= self._prune_at:
+            self._prune()
+        entries[id(obj)] = (obj, type_name, self._site_provider(), self._clock())
+        self.tracked += 1
+
+    def release(self, obj: Any):
+        """标记对象已释放（如 RemoveLocation）。
+
+        参数：
+            obj: 之前记录的对象
+        """
+        self._entries.pop(id(obj), None)
+
+    def _prune(self):
+        """清理已销毁的handle条目。"""
+        self._entries = {key: entry for key, entry in self._entries.items() if self._is_alive(entry[0])}
+        self._prune_at = max(MIN_PRUNE_SIZE, len(self._entries) * 2)
+
+    @staticmethod
+    def _is_alive(obj: Any) -> bool:
+        return obj.is_alive() if isinstance(obj, Handle) else True
+
+    def report(self, top: Optional[int] = None) -> dict:
+        """汇总仍然存活的对象。
+
+        增长量只统计模拟开始后（创建时间晚于开始记录的时间）创建且仍然存活的对象，
+        地图初始化时一次性创建的对象不计入增长量。
+
+        参数：
+            top: 只返回存活数量最多的前 top 个创建位置，None 表示全部
+
+        返回：
+            报告字典：
+                elapsed: 开始记录后经过的模拟时间（秒）
+                tracked: 累计记录的对象数
+                alive: 仍然存活的对象数
+                by_type: 类型名 -> 存活数量
+                sites: 按存活数量降序排列的列表，每项包含
+                       type、site、alive、per_minute（模拟期间每分钟增长量）
+        """
+        elapsed = self._clock() - self._start_time
+        minutes = elapsed / 60.0
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        by_type: Dict[str, int] = {}
+        alive = 0
+        for obj, type_name, site, created_at in self._entries.values():
+            if not self._is_alive(obj):
+                continue
+            alive += 1
+            by_type[type_name] = by_type.get(type_name, 0) + 1
+            counts = groups.get((type_name, site))
+            if counts is None:
+                counts = groups[(type_name, site)] = [0, 0]
+            counts[0] += 1
+            if created_at > self._start_time:
+                counts[1] += 1
+
+        sites = [
+            {
+                "type": type_name,
+                "site": site,
+                "alive": counts[0],
+                "per_minute": counts[1] / minutes if minutes > 0 else 0.0,
+            }
+            for (type_name, site), counts in groups.items()
+        ]
+        sites.sort(key=lambda item: (-item["alive"], item["type"], item["site"]))
+        if top is not None:
+            sites = sites[:top]
+
+        return {
+            "elapsed": elapsed,
+            "tracked": self.tracked,
+            "alive": alive,
+            "by_type": dict(sorted(by_type.items(), key=lambda item: -item[1])),
+            "sites": sites,
+        }
@@ -54,6 +54,7 @@ class LocationConstructor(NativeFunction):
             Location: 新创建的 Location 对象
         """
         loc = Location(x, y)
+        state_context.handle_manager.track_value(loc, "location")
         logger.debug(f"[Location] 创建位置: ({x}, {y})")
         return loc
 
@@ -80,4 +81,5 @@ class RemoveLocation(NativeFunction):
             return
 
         logger.debug(f"[RemoveLocation] 移除位置: {loc}")
+        state_context.handle_manager.release_value(loc)
         # Location 对象不需要特殊清理，Python 垃圾回收会自动处理
@@ -3,10 +3,12 @@
 此模块包含HandleManager类，负责所有handle的生命周期管理。
 """
 
-from typing import Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import logging
 from .handle import Handle, Unit, Player, Item, Group, Rect, Effect, BoolExpr, Sound
 from .hashtable import Hashtable
+from .hashtable_snapshot import decode_buckets, decode_bundle, encode_bundle
+from .leak_tracker import LeakTracker
 from .event_handles import PlayerUnitEvent, PlayerEvent, GameEvent, UnitEvent
 from .timerdialog import TimerDialog
 from .gamestate import (
@@ -29,6 +31,8 @@ class HandleManager:
         self._type_index: Dict[str, List[str]] = {}  # 类型索引
         self._next_id = 1
         self._trigger_manager = None  # 触发器管理器引用
+        self.journal = None  # 事件日志（EventJournal），None 表示不记录
+        self.leak_tracker: Optional[LeakTracker] = None  # 泄漏检测，None 表示不记录
         self._players: Dict[int, Player] = {}  # player_id -> Player对象缓存
         # 初始化16个玩家（ID 0-15）
         self._init_players()
@@ -56,12 +60,70 @@ class HandleManager:
             self._type_index[handle.type_name] = []
         self._type_index[handle.type_name].append(handle.id)
 
+        if self.leak_tracker is not None:
+            self.leak_tracker.track(handle, handle.type_name)
+
+    def enable_leak_tracking(self, site_provider: Callable[[], str],
+                             clock: Callable[[], float]) -> LeakTracker:
+        """开启泄漏检测，之后创建的handle都记录创建位置。
+
+        已开启时替换为新的检测器，之前的记录被丢弃。
+
+        参数：
+            site_provider: 返回当前创建位置的可调用对象
+            clock: 返回当前模拟时间（秒）的可调用对象
+
+        返回：
+            LeakTracker 实例
+        """
+        self.leak_tracker = LeakTracker(site_provider, clock)
+        return self.leak_tracker
+
+    def disable_leak_tracking(self):
+        """关闭泄漏检测并丢弃记录。"""
+        self.leak_tracker = None
+
+    def track_value(self, value: Any, type_name: str):
+        """记录一个不由管理器注册的值（如 location），需要用 release_value 释放。
+
+        参数：
+            value: 新创建的值
+            type_name: 类型名
+        """
+        if self.leak_tracker is not None:
+            self.leak_tracker.track(value, type_name)
+
+    def release_value(self, value: Any):
+        """标记 track_value 记录的值已释放。
+
+        参数：
+            value: 之前记录的值
+        """
+        if self.leak_tracker is not None:
+            self.leak_tracker.release(value)
+
+    def leak_report(self, top: Optional[int] = None) -> Optional[dict]:
+        """获取泄漏报告。
+
+        参数：
+            top: 只返回存活数量最多的前 top 个创建位置，None 表示全部
+
+        返回：
+            报告字典，格式见 LeakTracker.report()，未开启泄漏检测时返回None
+        """
+        if self.leak_tracker is None:
+            return None
+        return self.leak_tracker.report(top)
+
     def create_unit(self, unit_type: str, player_id: int,
                     x: float, y: float, facing: float) -> Unit:
         """创建一个单位并返回Unit对象。"""
         handle_id = f"unit_{self._generate_id()}"
         unit = Unit(handle_id, unit_type, player_id, x, y, facing)
         self._register_handle(unit)
+        if self.journal is not None:
+            self.journal.record("unit_created", unit_id=handle_id, unit_type=unit_type,
+                                player_id=player_id, x=x, y=y)
         return unit
 
     def get_handle(self, handle_id: str) -> Optional[Handle]:
@@ -71,9 +133,14 @@ class HandleManager:
             return handle
         return None
 
-    def get_unit(self, unit_id: str) -> Optional[Unit]:
-        """获取单位对象，进行类型检查。"""
-        handle = self.get_handle(unit_id)
+    def get_unit(self, unit_id: str, include_dead: bool = False) -> Optional[Unit]:
+        """获取单位对象，进行类型检查。
+
+        参数：
+            unit_id: 单位ID
+            include_dead: 是否也返回已死亡的单位（如死亡事件中的触发单位）
+        """
+        handle = self._handles.get(unit_id) if include_dead else self.get_handle(unit_id)
         if isinstance(handle, Unit):
             return handle
         return None
@@ -160,19 +227,19 @@ class HandleManager:
 
         if state_type == "UNIT_STATE_LIFE":
             unit.life = value
-            return True
         elif state_type == "UNIT_STATE_MAX_LIFE":
             unit.max_life = value
-            return True
         elif state_type == "UNIT_STATE_MANA":
             unit.mana = value
-            return True
         elif state_type == "UNIT_STATE_MAX_MANA":
             unit.max_mana = value
-            return True
         else:
             return False
 
+        if self.journal is not None:
+            self.journal.record("unit_state", unit_id=unit_id, state=state_type, value=value)
+        return True
+
     def get_total_handles(self) -> int:
         """获取总handle数量。"""
         return len(self._handles)
@@ -218,6 +285,8 @@ class HandleManager:
 
         # 销毁单位
         unit.destroy()
+        if self.journal is not None:
+            self.journal.record("unit_killed", unit_id=unit_id)
 
         # 触发单位死亡事件
         if self._trigger_manager:
@@ -511,13 +580,90 @@ class HandleManager:
         self._register_handle(hashtable)
         return hashtable
 
-    def get_hashtable(self, handle_id: str) -> Optional[Hashtable]:
-        """获取 hashtable 对象"""
+    def get_hashtable(self, handle_id: Union[str, Hashtable]) -> Optional[Hashtable]:
+        """获取 hashtable 对象
+
+        参数：
+            handle_id: hashtable ID，或脚本变量中保存的 Hashtable 对象本身
+
+        返回：
+            存活的 Hashtable，不存在或类型不匹配返回None
+        """
+        if isinstance(handle_id, Hashtable):
+            return handle_id if handle_id.is_alive() else None
         handle = self.get_handle(handle_id)
         if isinstance(handle, Hashtable):
             return handle
         return None
 
+    def snapshot_hashtables(self) -> bytes:
+        """导出所有存活 hashtable 的快照。
+
+        返回：
+            按 hashtable ID 打包的快照字节
+        """
+        snapshots = {
+            handle_id: self._handles[handle_id].snapshot()
+            for handle_id in self._type_index.get("hashtable", [])
+            if self._handles[handle_id].is_alive()
+        }
+        return encode_bundle(snapshots)
+
+    def hashtable_stats(self) -> dict:
+        """统计存活的 hashtable。
+
+        返回：
+            {"count": hashtable 数量, "entries": 保存的条目总数}
+        """
+        hashtables = [
+            self._handles[handle_id]
+            for handle_id in self._type_index.get("hashtable", [])
+            if self._handles[handle_id].is_alive()
+        ]
+        return {
+            "count": len(hashtables),
+            "entries": sum(hashtable.entry_count() for hashtable in hashtables),
+        }
+
+    def restore_hashtables(self, data: bytes) -> bool:
+        """从快照恢复 hashtable 数据。
+
+        快照中的 hashtable 如果仍然存在则替换其内容，否则按原ID创建，
+        使脚本中保存的 hashtable 引用在恢复后继续有效。
+        快照中没有的 hashtable 保持不变。
+
+        参数：
+            data: snapshot_hashtables() 生成的字节
+
+        返回：
+            恢复成功返回True，快照无效返回False
+        """
+        # 先解码全部快照，数据无效时不修改任何 hashtable
+        try:
+            decoded = {handle_id: decode_buckets(snapshot)
+                       for handle_id, snapshot in decode_bundle(data).items()}
+        except ValueError as e:
+            logger.warning(f"[HandleManager] hashtable 快照无效: {e}")
+            return False
+
+        for handle_id, buckets in decoded.items():
+            hashtable = self._handles.get(handle_id)
+            if hashtable is None:
+                hashtable = Hashtable(handle_id)
+                self._register_handle(hashtable)
+                self._reserve_id(handle_id)
+            elif not isinstance(hashtable, Hashtable) or not hashtable.is_alive():
+                logger.warning(f"[HandleManager] 无法恢复 {handle_id}：该ID已被其他handle使用或已销毁")
+                continue
+            hashtable.load_buckets(buckets)
+        return True
+
+    def _reserve_id(self, handle_id: str):
+        """确保之后生成的ID不会与已有的handle ID冲突。"""
+        suffix = handle_id.rsplit("_", 1)[-1]
+        if suffix.isdigit():
+            self._next_id = max(self._next_id, int(suffix) + 1)
+
     def create_playerunit_event(self, event_id: int) -> PlayerUnitEvent:
         """创建玩家-单位事件类型 handle。"""
         handle_id = f"playerunitevent_{self._generate_id()}"
@@ -3,7 +3,7 @@
 此模块包含JASS玩家handle的实现。
 """
 
-from typing import Dict, Set
+from typing import Dict
 
 from .handle_base import Handle
 
@@ -20,8 +20,6 @@ class Player(Handle):
         controller: 控制器类型（'user', 'computer', 'neutral', 'rescueable'）
         _gold, _lumber: 黄金和木材
         _food_cap, _food_used: 人口上限和已用人口
-        _allies: 盟友玩家ID集合
-        _enemies: 敌人玩家ID集合
     """
 
     # 玩家状态类型常量
@@ -48,8 +46,6 @@ class Player(Handle):
             self.controller = 1  # MAP_CONTROL_COMPUTER
         else:
             self.controller = 3  # MAP_CONTROL_NEUTRAL
-        self._allies: Set[int] = set()  # 盟友玩家ID集合
-        self._enemies: Set[int] = set()  # 敌人玩家ID集合
         # 资源属性（最小集）
         self._gold: int = 500         # 黄金 0-1000000，初始500
         self._lumber: int = 0         # 木材 0-1000000，初始0
@@ -130,42 +126,6 @@ class Player(Handle):
             self._state_data[state_type] = value
             return value
 
-    def set_alliance(self, other_player_id: int, is_ally: bool) -> None:
-        """设置与其他玩家的关系。
-
-        参数：
-            other_player_id: 其他玩家ID
-            is_ally: True表示设为盟友，False表示设为敌人
-        """
-        if is_ally:
-            self._allies.add(other_player_id)
-            self._enemies.discard(other_player_id)
-        else:
-            self._enemies.add(other_player_id)
-            self._allies.discard(other_player_id)
-
-    def is_ally(self, other_player_id: int) -> bool:
-        """检查是否是指定玩家的盟友。
-
-        参数：
-            other_player_id: 其他玩家ID
-
-        返回：
-            是盟友返回True，否则返回False
-        """
-        return other_player_id in self._allies
-
-    def is_enemy(self, other_player_id: int) -> bool:
-        """检查是否是指定玩家的敌人。
-
-        参数：
-            other_player_id: 其他玩家ID
-
-        返回：
-            是敌人返回True，否则返回False
-        """
-        return other_player_id in self._enemies
-
     def set_tech_max_allowed(self, techid: int, maximum: int) -> None:
         """设置科技最大允许等级。
 
@@ -0,0 +1,138 @@
+"""Native函数调用分析。
+
+此模块包含 NativeProfiler 类，为注册表中的每个native函数统计调用次数、
+总耗时、自身耗时（不含其中回调JASS函数时调用的其他native）和主要调用位置。
+耗时记录到 PerformanceMonitor，操作名称为 "native:函数名"。
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.performance import PerformanceMonitor
+
+# 记录到 PerformanceMonitor 时的操作名称前缀
+OPERATION_PREFIX = "native:"
+
+
+class ProfiledNative:
+    """包装一个native函数，execute 为计时版本，其余属性转发给原函数。
+
+    属性：
+        native: 原native函数实例
+    """
+
+    def __init__(self, native: Any, execute: Callable):
+        """初始化包装。
+
+        参数：
+            native: 原native函数实例
+            execute: 计时版本的 execute
+        """
+        self.native = native
+        self.name = native.name
+        self.execute = execute
+
+    def __getattr__(self, attr: str):
+        return getattr(self.native, attr)
+
+
+class NativeProfiler:
+    """统计native函数的调用。
+
+    属性：
+        monitor: 记录耗时的性能监控器
+    """
+
+    def __init__(self, monitor: PerformanceMonitor,
+                 site_provider: Optional[Callable[[], str]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        """初始化分析器。
+
+        参数：
+            monitor: 记录耗时的性能监控器
+            site_provider: 返回当前调用位置（如 "函数名:行号"）的可调用对象，None 表示不统计调用位置
+            clock: 计时函数
+        """
+        self.monitor = monitor
+        self._site_provider = site_provider
+        self._clock = clock
+        self._self_time: Dict[str, float] = {}
+        self._sites: Dict[str, Dict[str, int]] = {}
+        # 正在执行的native调用中，其内部嵌套native调用的累计耗时
+        self._child_time: List[float] = []
+
+    def wrap(self, native: Any) -> ProfiledNative:
+        """创建native函数的计时包装。
+
+        参数：
+            native: native函数实例
+
+        返回：
+            ProfiledNative 实例
+        """
+        name = native.name
+        original = native.execute
+        operation = OPERATION_PREFIX + name
+        record = self.monitor.record
+        clock = self._clock
+        child_time = self._child_time
+        self_time = self._self_time
+        self_time.setdefault(name, 0.0)
+        site_provider = self._site_provider
+        sites = self._sites.setdefault(name, {})
+
+        def execute(state_context, *args, **kwargs):
+            if site_provider is not None:
+                site = site_provider()
+                sites[site] = sites.get(site, 0) + 1
+            child_time.append(0.0)
+            start = clock()
+            try:
+                return original(state_context, *args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                nested = child_time.pop()
+                if child_time:
+                    child_time[-1] += elapsed
+                self_time[name] += elapsed - nested
+                record(operation, elapsed)
+
+        return ProfiledNative(native, execute)
+
+    def report(self, top: Optional[int] = None, top_sites: int = 5) -> dict:
+        """生成native调用报告。
+
+        参数：
+            top: 只返回自身耗时最多的前 top 个native，None 表示全部
+            top_sites: 每个native返回的调用位置数量
+
+        返回：
+            报告字典：
+                calls: 所有native的调用次数
+                self_time: 所有native的自身耗时之和（秒）
+                natives: 按自身耗时降序排列的列表，每项包含
+                         name、calls、total、self、avg、p95、
+                         sites（调用次数最多的位置，[{"site", "calls"}]）
+        """
+        natives = []
+        for name, spent in self._self_time.items():
+            stats = self.monitor.get_stats(OPERATION_PREFIX + name)
+            if stats["count"] == 0:
+                continue
+            sites = sorted(self._sites.get(name, {}).items(), key=lambda item: (-item[1], item[0]))
+            natives.append({
+                "name": name,
+                "calls": stats["count"],
+                "total": stats["total"],
+                "self": spent,
+                "avg": stats["avg"],
+                "p95": stats["p95"],
+                "sites": [{"site": site, "calls": calls} for site, calls in sites[:top_sites]],
+            })
+        natives.sort(key=lambda item: (-item["self"], item["name"]))
+
+        return {
+            "calls": sum(item["calls"] for item in natives),
+            "self_time": sum(item["self"] for item in natives),
+            "natives": natives if top is None else natives[:top],
+        }
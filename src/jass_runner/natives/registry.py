@@ -5,6 +5,7 @@
 """
 
 import inspect
+import time
 from typing import Dict, Optional, Callable, Type, Any
 
 
@@ -18,6 +19,8 @@ class NativeRegistry:
     def __init__(self):
         """初始化native函数注册表。"""
         self._functions: Dict[str, object] = {}
+        self._profiler = None  # NativeProfiler，None 表示未开启调用分析
+        self._originals: Dict[str, object] = {}  # 开启调用分析时被包装的原函数
 
     def register(self, native_function):
         """注册一个native函数。
@@ -25,8 +28,48 @@ class NativeRegistry:
         参数：
             native_function: 要注册的native函数实例
         """
+        if self._profiler is not None:
+            self._originals[native_function.name] = native_function
+            native_function = self._profiler.wrap(native_function)
         self._functions[native_function.name] = native_function
 
+    def enable_profiling(self, monitor, site_provider: Optional[Callable[[], str]] = None,
+                         clock: Callable[[], float] = time.perf_counter):
+        """开启native调用分析。
+
+        把注册表中的每个native函数替换为计时包装，之后注册的函数也会被包装。
+        只替换本注册表中的条目，不修改native函数实例，
+        多个注册表共享的实例（如 basic 模块中的函数）不受影响。
+        已开启时先关闭，之前的统计被丢弃。
+
+        参数：
+            monitor: 记录耗时的 PerformanceMonitor
+            site_provider: 返回当前调用位置的可调用对象，None 表示不统计调用位置
+            clock: 计时函数
+
+        返回：
+            NativeProfiler 实例
+        """
+        from .profiler import NativeProfiler
+
+        self.disable_profiling()
+        self._profiler = NativeProfiler(monitor, site_provider, clock)
+        for name, native_function in self._functions.items():
+            self._originals[name] = native_function
+            self._functions[name] = self._profiler.wrap(native_function)
+        return self._profiler
+
+    def disable_profiling(self):
+        """关闭native调用分析，换回原来的native函数，之后调用没有额外开销。"""
+        self._functions.update(self._originals)
+        self._originals.clear()
+        self._profiler = None
+
+    @property
+    def profiler(self):
+        """当前的 NativeProfiler，未开启调用分析时为None。"""
+        return self._profiler
+
     def get(self, name: str) -> Optional[object]:
         """通过名称获取native函数。
 
@@ -23,10 +23,12 @@ class StateContext:
     def __init__(self):
         self.handle_manager = HandleManager()
         self.trigger_manager = TriggerManager()  # 触发器管理器
+        self.event_responses = self.trigger_manager.event_responses  # 事件响应上下文栈
         self.alliance_manager = AllianceManager()  # 联盟管理器
         self.game_state_manager = GameStateManager(self.trigger_manager)  # 游戏状态管理器
         self.global_vars = {}  # 全局变量存储
         self.local_stores = {}  # 上下文局部存储
+        self.game_speed = 2  # 游戏速度（0-4），默认 NORMAL
 
         # 相机边界存储
         self.camera_bounds = {
@@ -39,6 +41,15 @@ class StateContext:
         # 连接HandleManager和TriggerManager
         self.handle_manager.set_trigger_manager(self.trigger_manager)
 
+    def set_journal(self, journal):
+        """设置事件日志，记录分发的事件和单位的创建、击杀及状态修改。
+
+        参数：
+            journal: EventJournal 实例，None 表示停止记录
+        """
+        self.trigger_manager.journal = journal
+        self.handle_manager.journal = journal
+
     def get_context_store(self, context_id: str) -> Dict:
         """获取指定上下文的局部存储。"""
         if context_id not in self.local_stores:
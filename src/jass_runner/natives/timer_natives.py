@@ -66,10 +66,15 @@ class TimerStart(NativeFunction):
         # 在实际实现中，callback_func 将是一个 JASS 函数引用
         # 目前，我们创建一个包装器来调用回调并记录日志
         def callback_wrapper():
-            logger.info(f"[TimerCallback] Timer {timer_id} fired with args: {args}")
+            # 高频回调在屏蔽日志时跳过格式化开销
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[TimerCallback] Timer {timer_id} fired with args: {args}")
             if callback_func and callable(callback_func):
                 callback_func()
 
+        # 沿用JASS回调函数名，便于帧分析器定位耗时来源
+        callback_wrapper.__name__ = getattr(callback_func, '__name__', 'callback_wrapper')
+
         timer.start(timeout, periodic, callback_wrapper, *args)
         logger.info(f"[TimerStart] Started timer {timer_id}: timeout={timeout}, periodic={periodic}")
         return True
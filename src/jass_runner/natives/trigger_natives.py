@@ -6,11 +6,47 @@
 
 import logging
 from ..natives.base import NativeFunction
+from ..natives.boolexpr import BoolExpr
 
 
 logger = logging.getLogger(__name__)
 
 
+def _bind_callback(state_context, func):
+    """在注册时把动作或条件解析为可直接调用的对象。
+
+    函数引用字符串绑定到解释器编译好的函数（求值器已经把 function X
+    解析为编译好的函数），布尔表达式handle绑定到其编译后的谓词，
+    使触发器每次运行只需一次直接调用。
+
+    参数：
+        state_context: 状态上下文
+        func: 函数引用字符串、布尔表达式handle ID或可调用对象
+
+    返回：
+        接收state_context参数的可调用对象，无法解析时原样返回func
+    """
+    if isinstance(func, str):
+        if func.startswith("function:"):
+            interpreter = getattr(state_context, 'interpreter', None)
+            compiled = interpreter.compile_function(func[9:]) if interpreter else None
+            return compiled if compiled is not None else func
+        handle_manager = getattr(state_context, 'handle_manager', None)
+        boolexpr = handle_manager.get_handle(func) if handle_manager else None
+        if isinstance(boolexpr, BoolExpr):
+            func = boolexpr
+
+    if isinstance(func, BoolExpr):
+        predicate = func.predicate
+
+        def bound_boolexpr(state_context=None):
+            return predicate()
+
+        bound_boolexpr.__name__ = func.id
+        return bound_boolexpr
+    return func
+
+
 class CreateTrigger(NativeFunction):
     """创建新触发器的原生函数。
 
@@ -259,6 +295,7 @@ class TriggerAddAction(NativeFunction):
             return None
 
         # 添加动作
+        action_func = _bind_callback(state_context, action_func)
         action_handle = trigger.add_action(action_func)
         func_name = getattr(action_func, '__name__', None)
         if func_name:
@@ -402,6 +439,7 @@ class TriggerAddCondition(NativeFunction):
             return None
 
         # 添加条件
+        condition_func = _bind_callback(state_context, condition_func)
         condition_handle = trigger.add_condition(condition_func)
         logger.info(f"[TriggerAddCondition] Added condition {condition_handle} to trigger {trigger_id}")
         return condition_handle
@@ -627,8 +665,16 @@ class TriggerExecute(NativeFunction):
             logger.warning(f"[TriggerExecute] Trigger not found: {trigger_id}")
             return None
 
-        # 执行所有动作
-        trigger.execute_actions(state_context)
+        # 执行所有动作，沿用外层的事件数据，GetTriggeringTrigger 返回该触发器
+        responses = getattr(state_context, 'event_responses', None)
+        if responses is None:
+            trigger.execute_actions(state_context)
+        else:
+            responses.push_trigger(trigger_id, responses.top.event_data)
+            try:
+                trigger.execute_actions(state_context)
+            finally:
+                responses.pop()
         logger.info(f"[TriggerExecute] Executed trigger: {trigger_id}")
 
         # 始终返回None（nothing）
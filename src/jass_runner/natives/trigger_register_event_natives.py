@@ -20,8 +20,13 @@ class TriggerRegisterTimerEvent(NativeFunction):
     """注册计时器事件的原生函数。
 
     为触发器注册一个基于时间的周期性或一次性事件。
+    提供计时器系统时会为该事件创建专用计时器，
+    到期时只分发给注册该事件的触发器。
     """
 
+    def __init__(self, timer_system=None):
+        self._timer_system = timer_system
+
     @property
     def name(self) -> str:
         """获取native函数的名称。
@@ -52,10 +57,22 @@ class TriggerRegisterTimerEvent(NativeFunction):
             return None
 
         filter_data = {"timeout": timeout, "periodic": periodic}
+        timer = None
+        if self._timer_system is not None:
+            timer = self._timer_system.get_timer(self._timer_system.create_timer())
+            filter_data["timer_id"] = timer.timer_id
+
         result = state_context.trigger_manager.register_event(
             trigger_id, EVENT_GAME_TIMER_EXPIRED, filter_data
         )
 
+        if timer is not None:
+            if result:
+                timer.start(timeout, periodic, None)
+                state_context.trigger_manager.own_timer(timer.timer_id, self._timer_system.destroy_timer)
+            else:
+                self._timer_system.destroy_timer(timer.timer_id)
+
         if result:
             logger.info(
                 f"[TriggerRegisterTimerEvent] Registered timer event "
@@ -104,6 +121,8 @@ class TriggerRegisterTimerExpireEvent(NativeFunction):
             logger.error("[TriggerRegisterTimerExpireEvent] state_context or trigger_manager not found")
             return None
 
+        # 兼容直接传入 Timer 对象
+        timer_id = getattr(timer_id, 'timer_id', timer_id)
         filter_data = {"timer_id": timer_id}
         result = state_context.trigger_manager.register_event(
             trigger_id, EVENT_GAME_TIMER_EXPIRED, filter_data
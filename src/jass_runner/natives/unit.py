@@ -3,7 +3,7 @@
 此模块包含JASS单位handle的实现。
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 from .handle_base import Handle
 
@@ -25,6 +25,7 @@ class Unit(Handle):
         mana: 当前魔法值
         max_mana: 最大魔法值
         name: 单位名称，默认为unit_type
+        groups: 包含该单位的单位组（组ID -> Group），单位死亡时通知这些组
     """
 
     def __init__(self, handle_id: str, unit_type: str, player_id: int,
@@ -45,6 +46,7 @@ class Unit(Handle):
         self._abilities: Dict[int, int] = {}  # 技能ID -> 技能等级
         self._permanent_abilities: Set[int] = set()  # 永久技能ID集合
         self.inventory: List[Optional['Item']] = [None] * 6  # 6槽位背包
+        self.groups: Dict[str, Any] = {}  # 组ID -> Group
 
         # 技能格子槽位配置（用于商店出售物品/单位）
         self._item_type_slots = MAX_ITEM_TYPE_SLOTS  # 出售物品的槽位数
@@ -55,6 +57,9 @@ class Unit(Handle):
         self.life = 0
         self._abilities.clear()
         self._permanent_abilities.clear()
+        # 所在的组在下次读取时惰性移除该单位
+        for group in self.groups.values():
+            group.mark_dirty()
         super().destroy()
 
     def add_ability(self, ability_id: int) -> bool:
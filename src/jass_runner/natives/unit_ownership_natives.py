@@ -101,12 +101,12 @@ class IsUnitAlly(NativeFunction):
         """执行盟友关系检查。
 
         参数：
-            state_context: 状态上下文（包含HandleManager）
+            state_context: 状态上下文（包含AllianceManager）
             which_unit: 要检查的单位
             which_player: 要检查的玩家
 
         返回：
-            如果单位所属玩家与指定玩家是盟友返回True，否则返回False
+            如果指定玩家是单位所属玩家本身，或单位所属玩家对其设置了 ALLIANCE_PASSIVE 返回True，否则返回False
         """
         if which_unit is None or which_player is None:
             return False
@@ -114,12 +114,7 @@ class IsUnitAlly(NativeFunction):
         if state_context is None:
             return False
 
-        # 获取单位所属玩家对象
-        unit_owner = state_context.handle_manager.get_player_by_id(which_unit.player_id)
-        if unit_owner is None:
-            return False
-
-        return unit_owner.is_ally(which_player.player_id)
+        return state_context.alliance_manager.is_ally(which_unit.player_id, which_player.player_id)
 
 
 class IsUnitEnemy(NativeFunction):
@@ -137,12 +132,12 @@ class IsUnitEnemy(NativeFunction):
         """执行敌对关系检查。
 
         参数：
-            state_context: 状态上下文（包含HandleManager）
+            state_context: 状态上下文（包含AllianceManager）
             which_unit: 要检查的单位
             which_player: 要检查的玩家
 
         返回：
-            如果单位所属玩家与指定玩家是敌人返回True，否则返回False
+            如果指定玩家不是单位所属玩家本身，且单位所属玩家未对其设置 ALLIANCE_PASSIVE 返回True，否则返回False
         """
         if which_unit is None or which_player is None:
             return False
@@ -150,9 +145,4 @@ class IsUnitEnemy(NativeFunction):
         if state_context is None:
             return False
 
-        # 获取单位所属玩家对象
-        unit_owner = state_context.handle_manager.get_player_by_id(which_unit.player_id)
-        if unit_owner is None:
-            return False
-
-        return unit_owner.is_enemy(which_player.player_id)
+        return state_context.alliance_manager.is_enemy(which_unit.player_id, which_player.player_id)
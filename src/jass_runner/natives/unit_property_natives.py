@@ -120,8 +120,14 @@ class GetUnitLoc(NativeFunction):
             单位的 Location 对象，如果单位是 None 则返回 (0, 0, 0)
         """
         if unit is None:
-            return Location(0.0, 0.0, 0.0)
-        return Location(unit.x, unit.y, unit.z)
+            loc = Location(0.0, 0.0, 0.0)
+        else:
+            loc = Location(unit.x, unit.y, unit.z)
+        # null 单位同样会创建需要 RemoveLocation 的新 location
+        handle_manager = getattr(state_context, "handle_manager", None)
+        if handle_manager is not None:
+            handle_manager.track_value(loc, "location")
+        return loc
 
 
 class GetUnitTypeId(NativeFunction):
@@ -31,6 +31,7 @@ class LocalDecl:
     name: str
     type: str
     value: Any
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
@@ -61,6 +62,7 @@ class NativeCallNode:
     """原生函数调用节点。"""
     func_name: str
     args: List[Any]
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
@@ -68,6 +70,7 @@ class SetStmt:
     """变量赋值语句节点。"""
     var_name: str
     value: Any  # 可以是字面量或函数调用节点
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
@@ -77,6 +80,7 @@ class IfStmt:
     then_body: List[Any]  # then分支的语句列表
     elseif_branches: List[dict] = field(default_factory=list)  # elseif分支列表
     else_body: List[Any] = field(default_factory=list)  # else分支的语句列表
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
     def __post_init__(self):
         """初始化默认值。"""
@@ -90,18 +94,21 @@ class IfStmt:
 class LoopStmt:
     """loop循环语句节点。"""
     body: List[Any]  # 循环体内的语句列表
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
 class ExitWhenStmt:
     """exitwhen循环退出语句节点。"""
     condition: str  # 退出条件表达式
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
 class ReturnStmt:
     """return返回语句节点。"""
     value: Optional[Any]  # 返回值，如果是return nothing则为None
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
@@ -118,6 +125,7 @@ class ArrayDecl:
     element_type: str
     is_global: bool
     is_constant: bool = False
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
 
 
 @dataclass
@@ -164,3 +172,4 @@ class SetArrayStmt:
     array_name: str
     index: Any
     value: Any
+    line: int = field(default=0, compare=False, repr=False)  # 语句起始行号
@@ -13,10 +13,18 @@ class StatementParserMixin:
     """提供语句解析功能。"""
 
     def parse_statement(self: 'BaseParser') -> Optional[Any]:
-        """解析语句。"""
+        """解析语句，并在语句节点上记录起始行号。"""
         if not self.current_token:
             return None
 
+        line = self.current_token.line
+        statement = self._parse_statement_node()
+        if statement is not None:
+            statement.line = line
+        return statement
+
+    def _parse_statement_node(self: 'BaseParser') -> Optional[Any]:
+        """按起始关键词分派到具体的语句解析方法。"""
         # 解析局部声明
         if self.current_token.type == 'KEYWORD' and self.current_token.value == 'local':
             # 使用 cast 或假设 self 混合了 AssignmentParserMixin
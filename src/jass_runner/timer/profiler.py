@@ -0,0 +1,177 @@
+"""帧预算分析器。
+
+此模块包含 FrameProfiler 类，用于统计每帧中协程、计时器、触发器
+和游戏状态监听器的耗时，并记录超出帧预算的帧，帮助定位在真实游戏中
+可能造成卡顿的地图系统。
+"""
+
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FrameProfiler:
+    """每帧耗时分析器。
+
+    各子系统在执行一段工作前调用 enter()，结束后调用 exit()。
+    分析器使用栈记录嵌套调用，并只把"自身耗时"计入对应阶段，
+    例如计时器回调中触发的触发器耗时计入 triggers 而不是 timers。
+
+    属性：
+        frame_budget: 每帧的CPU预算（秒）
+        bucket_edges: 帧耗时直方图的桶上界（毫秒）
+        max_overruns: 最多保留的超预算帧记录数
+    """
+
+    PHASES = ("coroutines", "timers", "triggers", "gamestate", "hooks")
+
+    # 帧耗时直方图的默认桶上界（毫秒），最后一个桶收集所有更大的值
+    DEFAULT_BUCKET_EDGES = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0, 66.0, 133.0)
+
+    DEFAULT_MAX_OVERRUNS = 1000
+
+    def __init__(self, frame_budget: float, bucket_edges: Tuple[float, ...] = None,
+                 max_overruns: int = None):
+        """初始化帧预算分析器。
+
+        参数：
+            frame_budget: 每帧的CPU预算（秒）
+            bucket_edges: 直方图桶上界（毫秒，升序），默认使用 DEFAULT_BUCKET_EDGES
+            max_overruns: 最多保留的超预算帧记录数，默认1000
+        """
+        self.frame_budget = frame_budget
+        self.bucket_edges = tuple(bucket_edges) if bucket_edges else self.DEFAULT_BUCKET_EDGES
+        self.max_overruns = max_overruns or self.DEFAULT_MAX_OVERRUNS
+        self.reset()
+
+    def reset(self):
+        """清空所有统计数据。"""
+        self.frames = 0
+        self.total_time = 0.0
+        self.max_frame_time = 0.0
+        self.overrun_count = 0
+        self.histogram: List[int] = [0] * (len(self.bucket_edges) + 1)
+        self.phase_totals: Dict[str, float] = {phase: 0.0 for phase in self.PHASES}
+        self.overruns: List[Dict[str, Any]] = []
+        self._stack: List[list] = []
+        self._frame_number = 0
+        self._frame_time = 0.0
+        self._frame_start: Optional[float] = None
+        self._frame_phases: Dict[str, float] = {}
+        self._frame_labels: Dict[str, float] = {}
+
+    def begin_frame(self, frame_number: int, sim_time: float):
+        """开始记录一帧。
+
+        参数：
+            frame_number: 帧号
+            sim_time: 该帧对应的模拟时间（秒）
+        """
+        self._frame_number = frame_number
+        self._frame_time = sim_time
+        self._frame_phases = {}
+        self._frame_labels = {}
+        self._stack.clear()
+        self._frame_start = time.perf_counter()
+
+    def enter(self, phase: str, label: Optional[str] = None):
+        """进入一段被测量的工作。
+
+        参数：
+            phase: 所属阶段（PHASES 之一）
+            label: 负责该工作的JASS函数名或其他标识
+        """
+        # [阶段, 标签, 开始时间, 子调用耗时]
+        self._stack.append([phase, label or phase, time.perf_counter(), 0.0])
+
+    def exit(self):
+        """结束最近一次 enter() 开始的工作并累计自身耗时。"""
+        if not self._stack:
+            return
+        phase, label, start, child_time = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self_time = elapsed - child_time
+        if self._stack:
+            self._stack[-1][3] += elapsed
+
+        self._frame_phases[phase] = self._frame_phases.get(phase, 0.0) + self_time
+        self._frame_labels[label] = self._frame_labels.get(label, 0.0) + self_time
+
+    def end_frame(self) -> float:
+        """结束当前帧，更新直方图并检查是否超出预算。
+
+        返回：
+            该帧的总耗时（秒）
+        """
+        if self._frame_start is None:
+            return 0.0
+        duration = time.perf_counter() - self._frame_start
+        self._frame_start = None
+
+        self.frames += 1
+        self.total_time += duration
+        if duration > self.max_frame_time:
+            self.max_frame_time = duration
+
+        bucket = bisect.bisect_left(self.bucket_edges, duration * 1000.0)
+        self.histogram[bucket] += 1
+
+        for phase, spent in self._frame_phases.items():
+            self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + spent
+
+        if duration > self.frame_budget:
+            self.overrun_count += 1
+            if len(self.overruns) < self.max_overruns:
+                self.overruns.append(self._build_overrun(duration))
+
+        return duration
+
+    def _build_overrun(self, duration: float) -> Dict[str, Any]:
+        """构建一条超预算帧记录。
+
+        参数：
+            duration: 帧总耗时（秒）
+
+        返回：
+            超预算帧信息字典
+        """
+        culprit = None
+        culprit_time = 0.0
+        if self._frame_labels:
+            culprit, culprit_time = max(self._frame_labels.items(), key=lambda item: item[1])
+
+        return {
+            "frame": self._frame_number,
+            "time": self._frame_time,
+            "duration": duration,
+            "budget": self.frame_budget,
+            "phases": dict(self._frame_phases),
+            "culprit": culprit,
+            "culprit_time": culprit_time,
+        }
+
+    def get_histogram(self) -> List[Dict[str, Any]]:
+        """获取帧耗时直方图。
+
+        返回：
+            桶列表，每项包含 le_ms（桶上界，最后一桶为None）和 count
+        """
+        edges = list(self.bucket_edges) + [None]
+        return [{"le_ms": edge, "count": count} for edge, count in zip(edges, self.histogram)]
+
+    def get_report(self) -> Dict[str, Any]:
+        """生成帧预算报告。
+
+        返回：
+            包含帧数、平均/最大帧耗时、各阶段耗时、直方图和超预算帧的字典
+        """
+        return {
+            "frames": self.frames,
+            "frame_budget": self.frame_budget,
+            "avg_frame_time": self.total_time / self.frames if self.frames else 0.0,
+            "max_frame_time": self.max_frame_time,
+            "phase_totals": dict(self.phase_totals),
+            "histogram": self.get_histogram(),
+            "overrun_count": self.overrun_count,
+            "overruns": list(self.overruns),
+        }
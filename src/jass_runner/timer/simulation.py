@@ -3,8 +3,11 @@
 此模块包含 SimulationLoop 类，用于基于帧的计时器系统模拟。
 """
 
-from typing import Callable, Optional, Any
+import logging
+import time
+from typing import Callable, Optional, Any, List
 from .system import TimerSystem
+from .profiler import FrameProfiler
 from ..coroutine import CoroutineRunner
 
 
@@ -14,8 +17,26 @@ class SimulationLoop:
     此类通过离散时间步长（帧）而非实时来模拟计时器系统，
     允许快速模拟长时间的游戏行为。同时集成协程运行器，
     支持 JASS 脚本的异步执行。
+
+    速度模式：
+        unthrottled: 不等待墙钟时间，尽快推进（默认）
+        realtime: 按游戏速度（SetGameSpeed）与墙钟时间同步推进
+        max: 不等待墙钟时间，并在运行期间屏蔽 INFO 级别日志，用于批量长时间测试
     """
 
+    SPEED_UNTHROTTLED = "unthrottled"
+    SPEED_REALTIME = "realtime"
+    SPEED_MAX = "max"
+    SPEED_MODES = (SPEED_UNTHROTTLED, SPEED_REALTIME, SPEED_MAX)
+
+    # 游戏速度（0-4）对应的每墙钟秒推进的游戏秒数，
+    # 魔兽争霸 III 中 SLOWEST/FASTEST 分别按 SLOW/FAST 处理
+    GAME_SPEED_MULTIPLIERS = {0: 0.6, 1: 0.6, 2: 0.8, 3: 1.0, 4: 1.0}
+    DEFAULT_GAME_SPEED = 2
+
+    # max 模式下需要屏蔽日志的根日志记录器
+    SUPPRESSED_LOGGER = "jass_runner"
+
     def __init__(self, timer_system: TimerSystem = None, fps: float = 30.0, frame_duration: float = None):
         """初始化模拟循环。
 
@@ -37,6 +58,32 @@ class SimulationLoop:
         self.coroutine_runner = CoroutineRunner()
         self._running = False
         self._frame_callback: Optional[Callable] = None
+        self._frame_hooks: List[Callable] = []
+        self._trigger_manager: Optional[Any] = None
+        self._game_state_manager: Optional[Any] = None
+        self._state_context: Optional[Any] = None
+        self.profiler: Optional[FrameProfiler] = None
+        self.speed_mode = self.SPEED_UNTHROTTLED
+        self.wall_time = 0.0
+        self._pace_origin: Optional[tuple] = None
+
+    def attach_state_context(self, state_context: Any):
+        """关联状态上下文中的触发器管理器和游戏状态管理器。
+
+        关联后计时器到期会分发给注册了计时器事件的触发器，
+        每帧会推进游戏状态（日夜循环和状态监听器），
+        开启帧分析时触发器的耗时也会被统计。
+
+        参数：
+            state_context: StateContext 实例
+        """
+        self._state_context = state_context
+        self._trigger_manager = getattr(state_context, 'trigger_manager', None)
+        self._game_state_manager = getattr(state_context, 'game_state_manager', None)
+        if self._trigger_manager is not None:
+            self.timer_system.set_trigger_manager(self._trigger_manager)
+        if self.profiler is not None:
+            self._attach_profiler(self.profiler)
 
     def run(self, interpreter: Any, ast: Any, max_frames: int = None) -> dict:
         """运行模拟（主入口）。
@@ -52,12 +99,13 @@ class SimulationLoop:
         self._running = True
         self._start_main(interpreter, ast)
 
-        while self._running:
-            self._update_frame()
-            if self.coroutine_runner.is_finished():
-                break
-            if max_frames and self.frame_count >= max_frames:
-                break
+        with self._speed_scope():
+            while self._running:
+                self._update_frame()
+                if self.coroutine_runner.is_finished():
+                    break
+                if max_frames and self.frame_count >= max_frames:
+                    break
 
         return {
             'frames': self.frame_count,
@@ -66,12 +114,66 @@ class SimulationLoop:
         }
 
     def _update_frame(self):
-        """单帧更新。"""
+        """单帧更新。
+
+        依次推进协程、计时器和游戏状态，最后调用每帧钩子。
+        开启帧分析时，整帧耗时会被记录并与帧预算比较。
+        """
         delta = self.frame_duration
         self.current_time += delta
         self.frame_count += 1
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame(self.frame_count, self.current_time)
+
         self.coroutine_runner.update(delta)
         self.timer_system.update(delta)
+        if self._game_state_manager is not None:
+            self._game_state_manager.update(1)
+        self._run_frame_hooks()
+
+        if profiler is not None:
+            profiler.end_frame()
+
+        if self.speed_mode == self.SPEED_REALTIME:
+            self._pace()
+
+    def _pace(self):
+        """realtime 模式下等待墙钟时间追上按游戏速度换算的模拟时间。
+
+        游戏速度变化时重新确定起点，后续帧按新倍率推进。
+        """
+        multiplier = self.get_speed_multiplier()
+        now = time.perf_counter()
+        origin = self._pace_origin
+        if origin is None or origin[2] != multiplier:
+            self._pace_origin = (now, self.current_time, multiplier)
+            return
+
+        origin_wall, origin_time, _ = origin
+        target = origin_wall + (self.current_time - origin_time) / multiplier
+        if target > now:
+            time.sleep(target - now)
+
+    def _run_frame_hooks(self):
+        """调用帧回调和所有每帧钩子，参数为当前帧号。"""
+        hooks = self._frame_hooks
+        if self._frame_callback is not None:
+            hooks = [self._frame_callback] + hooks
+        if not hooks:
+            return
+
+        profiler = self.profiler
+        for hook in hooks:
+            if profiler is not None:
+                profiler.enter("hooks", getattr(hook, '__name__', None))
+                try:
+                    hook(self.frame_count)
+                finally:
+                    profiler.exit()
+            else:
+                hook(self.frame_count)
 
     def _start_main(self, interpreter: Any, ast: Any):
         """启动主协程。
@@ -106,8 +208,9 @@ class SimulationLoop:
         参数：
             num_frames: 要运行的帧数
         """
-        for i in range(num_frames):
-            self._update_frame()
+        with self._speed_scope():
+            for i in range(num_frames):
+                self._update_frame()
 
     def run_seconds(self, seconds: float):
         """运行指定秒数的模拟。
@@ -118,6 +221,62 @@ class SimulationLoop:
         num_frames = int(seconds / self.frame_duration)
         self.run_frames(num_frames)
 
+    def _speed_scope(self):
+        """返回包裹一次模拟运行的上下文管理器。
+
+        负责累计墙钟耗时、重置 realtime 起点，以及在 max 模式下屏蔽日志。
+        """
+        return _SpeedScope(self)
+
+    def set_speed_mode(self, mode: str) -> bool:
+        """设置速度模式。
+
+        参数：
+            mode: SPEED_MODES 之一
+
+        返回：
+            设置成功返回True，模式无效返回False
+        """
+        if mode not in self.SPEED_MODES:
+            return False
+        self.speed_mode = mode
+        self._pace_origin = None
+        return True
+
+    def get_game_speed(self) -> int:
+        """获取关联状态上下文中由脚本设置的游戏速度。
+
+        返回：
+            游戏速度（0-4），未关联或未设置时返回 DEFAULT_GAME_SPEED
+        """
+        return getattr(self._state_context, 'game_speed', self.DEFAULT_GAME_SPEED)
+
+    def get_speed_multiplier(self) -> float:
+        """获取当前游戏速度对应的墙钟倍率。
+
+        返回：
+            每墙钟秒推进的游戏秒数
+        """
+        return self.GAME_SPEED_MULTIPLIERS.get(
+            self.get_game_speed(), self.GAME_SPEED_MULTIPLIERS[self.DEFAULT_GAME_SPEED]
+        )
+
+    def get_speed_stats(self) -> dict:
+        """获取模拟速度统计。
+
+        返回：
+            包含速度模式、游戏速度、模拟时间、墙钟耗时和相对实时倍数的字典
+        """
+        simulated = self.get_simulated_time()
+        return {
+            'speed_mode': self.speed_mode,
+            'game_speed': self.get_game_speed(),
+            'speed_multiplier': self.get_speed_multiplier(),
+            'simulated_time': simulated,
+            'wall_time': self.wall_time,
+            'realtime_factor': simulated / self.wall_time if self.wall_time > 0 else 0.0,
+        }
+
     def set_frame_callback(self, callback: Callable):
         """设置每帧调用的回调函数。
 
@@ -126,6 +285,74 @@ class SimulationLoop:
         """
         self._frame_callback = callback
 
+    def add_frame_hook(self, hook: Callable):
+        """添加每帧钩子。
+
+        钩子在协程、计时器和游戏状态更新之后按添加顺序调用。
+
+        参数：
+            hook: 钩子函数，接收帧号作为参数
+        """
+        self._frame_hooks.append(hook)
+
+    def remove_frame_hook(self, hook: Callable) -> bool:
+        """移除每帧钩子。
+
+        参数：
+            hook: 要移除的钩子函数
+
+        返回：
+            成功移除返回True，未找到返回False
+        """
+        if hook in self._frame_hooks:
+            self._frame_hooks.remove(hook)
+            return True
+        return False
+
+    def enable_profiling(self, frame_budget: float = None, **kwargs) -> FrameProfiler:
+        """开启帧预算分析。
+
+        参数：
+            frame_budget: 每帧CPU预算（秒），默认为一帧的模拟时长
+            **kwargs: 传递给 FrameProfiler 的其他参数
+
+        返回：
+            FrameProfiler 实例
+        """
+        budget = frame_budget if frame_budget is not None else self.frame_duration
+        profiler = FrameProfiler(budget, **kwargs)
+        self.profiler = profiler
+        self._attach_profiler(profiler)
+        return profiler
+
+    def disable_profiling(self):
+        """关闭帧预算分析，各子系统恢复无分析开销的执行路径。"""
+        self.profiler = None
+        self._attach_profiler(None)
+
+    def _attach_profiler(self, profiler: Optional[FrameProfiler]):
+        """把分析器设置到所有已知子系统。
+
+        参数：
+            profiler: FrameProfiler 实例或None
+        """
+        self.coroutine_runner.set_profiler(profiler)
+        self.timer_system.set_profiler(profiler)
+        if self._trigger_manager is not None:
+            self._trigger_manager.set_profiler(profiler)
+        if self._game_state_manager is not None:
+            self._game_state_manager.set_profiler(profiler)
+
+    def get_frame_report(self) -> Optional[dict]:
+        """获取帧预算报告。
+
+        返回：
+            FrameProfiler.get_report() 的结果，未开启分析时返回None
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.get_report()
+
     def get_simulated_time(self) -> float:
         """获取总模拟时间（秒）。
 
@@ -133,3 +360,30 @@ class SimulationLoop:
             总模拟时间（秒）
         """
         return self.frame_count * self.frame_duration
+
+
+class _SpeedScope:
+    """一次模拟运行的速度模式上下文。"""
+
+    def __init__(self, loop: SimulationLoop):
+        self._loop = loop
+        self._logger: Optional[logging.Logger] = None
+        self._saved_level = logging.NOTSET
+        self._start = 0.0
+
+    def __enter__(self):
+        loop = self._loop
+        loop._pace_origin = None
+        if loop.speed_mode == SimulationLoop.SPEED_MAX:
+            self._logger = logging.getLogger(SimulationLoop.SUPPRESSED_LOGGER)
+            self._saved_level = self._logger.level
+            self._logger.setLevel(logging.WARNING)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._loop.wall_time += time.perf_counter() - self._start
+        if self._logger is not None:
+            self._logger.setLevel(self._saved_level)
+            self._logger = None
+        return False
@@ -1,6 +1,5 @@
 """用于管理多个计时器的计时器系统。"""
 
-import uuid
 from typing import Any, Dict, Optional
 from .timer import Timer
 
@@ -12,18 +11,34 @@ class TimerSystem:
         self._timers: Dict[str, Timer] = {}
         self._current_time: float = 0.0
         self._trigger_manager: Optional[Any] = None
+        self._profiler: Optional[Any] = None
+        # 计数器生成的ID保证相同脚本的多次运行得到相同的计时器ID
+        self._next_id = 0
 
     def set_trigger_manager(self, trigger_manager: Any):
         """设置触发器管理器。
 
+        已创建的计时器也会关联到该触发器管理器。
+
         参数：
             trigger_manager: TriggerManager 实例
         """
         self._trigger_manager = trigger_manager
+        for timer in self._timers.values():
+            timer.set_trigger_manager(trigger_manager)
+
+    def set_profiler(self, profiler: Any):
+        """设置帧预算分析器。
+
+        参数：
+            profiler: FrameProfiler 实例，None 表示关闭分析
+        """
+        self._profiler = profiler
 
     def create_timer(self) -> str:
         """创建一个新计时器并返回其 ID。"""
-        timer_id = f"timer_{uuid.uuid4().hex[:8]}"
+        timer_id = f"timer_{self._next_id}"
+        self._next_id += 1
         timer = Timer(timer_id)
         # 如果已设置 trigger_manager，传递给新创建的计时器
         if self._trigger_manager:
@@ -41,6 +56,8 @@ class TimerSystem:
             timer = self._timers[timer_id]
             timer.destroy()
             del self._timers[timer_id]
+            if self._trigger_manager:
+                self._trigger_manager.remove_timer(timer_id)
             return True
         return False
 
@@ -48,9 +65,17 @@ class TimerSystem:
         """更新所有计时器的经过时间。"""
         self._current_time += delta_time
 
+        profiler = self._profiler
         timers_to_remove = []
         for timer_id, timer in list(self._timers.items()):
-            fired = timer.update(delta_time)
+            if profiler is not None:
+                profiler.enter("timers", getattr(timer.callback, '__name__', timer_id))
+                try:
+                    fired = timer.update(delta_time)
+                finally:
+                    profiler.exit()
+            else:
+                fired = timer.update(delta_time)
             if fired and not timer.periodic and not timer.running:
                 timers_to_remove.append(timer_id)
 
@@ -44,13 +44,9 @@ class Timer:
             if self.callback:
                 self.callback(*self.callback_args)
 
-            # 触发计时器到期事件
+            # 触发计时器到期事件，只分发给订阅了该计时器的触发器
             if self._trigger_manager:
-                from ..trigger.event_types import EVENT_GAME_TIMER_EXPIRED, EVENT_ID_TO_NAME
-                event_name = EVENT_ID_TO_NAME.get(EVENT_GAME_TIMER_EXPIRED, "game_timer_expired")
-                self._trigger_manager.fire_event(event_name, {
-                    "timer_id": self.timer_id
-                })
+                self._trigger_manager.fire_timer_expired(self.timer_id)
 
             if self.periodic:
                 self.elapsed = 0.0
@@ -31,6 +31,7 @@ from jass_runner.trigger.event_types import (
     GAME_EVENTS,
     ALL_EVENTS,
 )
+from jass_runner.trigger.event_responses import EventResponseStack
 from jass_runner.trigger.manager import TriggerManager
 from jass_runner.trigger.trigger import Trigger
 
@@ -63,4 +64,5 @@ __all__ = [
     # 触发器类
     "Trigger",
     "TriggerManager",
+    "EventResponseStack",
 ]
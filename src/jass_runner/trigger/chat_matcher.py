@@ -0,0 +1,156 @@
+"""聊天消息多模式子字符串匹配模块。
+
+此模块提供 SubstringMatcher 类，把非精确匹配的聊天事件模式
+编译为 Aho–Corasick 自动机，对一条消息只扫描一遍即可得到
+所有包含于其中的模式及注册这些模式的触发器。
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+
+class SubstringMatcher:
+    """基于 Aho–Corasick 自动机的多模式子字符串匹配器。
+
+    注册新模式时直接插入字典树，只把失败链接标记为过期；
+    移除最后一个使用某模式的触发器时把整个自动机标记为过期。
+    过期的部分在下一次匹配前重建，连续注册多个模式只重建一次。
+    """
+
+    def __init__(self):
+        """初始化空匹配器。"""
+        # 模式 -> 注册该模式的触发器ID列表（按注册顺序）
+        self._patterns: Dict[str, List[str]] = {}
+        self._reset_trie()
+        self._trie_stale = False
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, trigger_id: str):
+        """注册一个模式。
+
+        参数：
+            pattern: 子字符串模式
+            trigger_id: 触发器ID
+        """
+        trigger_ids = self._patterns.get(pattern)
+        if trigger_ids is not None:
+            trigger_ids.append(trigger_id)
+            return
+        self._patterns[pattern] = [trigger_id]
+        if not self._trie_stale:
+            self._insert(pattern)
+
+    def remove_trigger(self, trigger_id: str):
+        """移除触发器注册的所有模式。
+
+        参数：
+            trigger_id: 触发器ID
+        """
+        for pattern in list(self._patterns):
+            trigger_ids = self._patterns[pattern]
+            if trigger_id not in trigger_ids:
+                continue
+            remaining = [tid for tid in trigger_ids if tid != trigger_id]
+            if remaining:
+                self._patterns[pattern] = remaining
+            else:
+                del self._patterns[pattern]
+                self._trie_stale = True
+
+    def match(self, message: str) -> List[str]:
+        """查找模式包含于消息中的所有触发器。
+
+        参数：
+            message: 聊天消息
+
+        返回：
+            匹配的触发器ID列表，同一触发器可能出现多次
+        """
+        if not self._patterns:
+            return []
+        if self._trie_stale:
+            self._rebuild_trie()
+        if self._links_stale:
+            self._build_links()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found: Set[str] = set()
+        state = 0
+        for char in message:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        # 空模式包含于任何消息中
+        if "" in self._patterns:
+            found.add("")
+
+        result: List[str] = []
+        for pattern in found:
+            result.extend(self._patterns[pattern])
+        return result
+
+    def _reset_trie(self):
+        """清空字典树。"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._terminal: List[Optional[str]] = [None]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        self._links_stale = False
+
+    def _rebuild_trie(self):
+        """按当前模式重建字典树。"""
+        self._reset_trie()
+        for pattern in self._patterns:
+            self._insert(pattern)
+        self._trie_stale = False
+
+    def _insert(self, pattern: str):
+        """把模式插入字典树，并标记失败链接过期。"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._terminal.append(None)
+                self._goto[state][char] = next_state
+            state = next_state
+        if pattern:
+            self._terminal[state] = pattern
+        self._links_stale = True
+
+    def _build_links(self):
+        """广度优先计算失败链接，并合并后缀模式的输出。"""
+        goto = self._goto
+        size = len(goto)
+        fail = [0] * size
+        output: List[List[str]] = [[] for _ in range(size)]
+
+        queue = deque(goto[0].values())
+        for child in queue:
+            pattern = self._terminal[child]
+            if pattern is not None:
+                output[child].append(pattern)
+
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+
+                pattern = self._terminal[child]
+                output[child] = ([pattern] if pattern is not None else []) + output[fail[child]]
+                queue.append(child)
+
+        self._fail = fail
+        self._output = output
+        self._links_stale = False
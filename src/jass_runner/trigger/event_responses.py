@@ -0,0 +1,121 @@
+"""事件响应上下文栈模块。
+
+此模块提供 EventResponseStack 类，保存当前正在处理的触发器事件
+以及 ForGroup / 单位枚举过滤器的当前单位和 ForForce 的当前玩家，
+供 GetTriggerUnit、GetEnumUnit、GetFilterUnit、GetEnumPlayer 等事件响应函数读取。
+"""
+
+from typing import Any, Dict, List, Optional
+
+# 没有事件数据时使用的共享空字典，只读
+_EMPTY_DATA: Dict[str, Any] = {}
+
+
+class EventResponseFrame:
+    """事件响应栈中的一帧。
+
+    属性：
+        trigger_id: 当前触发器ID
+        event_data: 当前事件数据字典
+        enum_unit: ForGroup 当前遍历的单位
+        filter_unit: 单位枚举过滤器当前检查的单位
+        enum_player: ForForce 当前遍历的玩家
+    """
+
+    __slots__ = ("trigger_id", "event_data", "enum_unit", "filter_unit", "enum_player")
+
+    def __init__(self, trigger_id: Optional[str], event_data: Dict[str, Any],
+                 enum_unit: Any = None, filter_unit: Any = None, enum_player: Any = None):
+        self.trigger_id = trigger_id
+        self.event_data = event_data
+        self.enum_unit = enum_unit
+        self.filter_unit = filter_unit
+        self.enum_player = enum_player
+
+
+class EventResponseStack:
+    """事件响应上下文栈。
+
+    每次分发触发器或开始遍历单位组时压入一帧，结束时弹出，
+    读取事件响应只访问栈顶。ForGroup、ForForce 和过滤器帧继承外层帧的
+    触发器和事件数据，因此在枚举回调中仍可读取触发事件的响应。
+    """
+
+    def __init__(self):
+        """初始化空栈。"""
+        self._frames: List[EventResponseFrame] = []
+        self._root = EventResponseFrame(None, _EMPTY_DATA)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def top(self) -> EventResponseFrame:
+        """获取栈顶帧，栈为空时返回所有字段为空的根帧。"""
+        frames = self._frames
+        return frames[-1] if frames else self._root
+
+    def push_trigger(self, trigger_id: str,
+                     event_data: Optional[Dict[str, Any]]) -> EventResponseFrame:
+        """压入触发器事件帧。
+
+        参数：
+            trigger_id: 触发器ID
+            event_data: 事件数据字典
+
+        返回：
+            压入的帧
+        """
+        frame = EventResponseFrame(trigger_id, event_data or _EMPTY_DATA)
+        self._frames.append(frame)
+        return frame
+
+    def push_enum(self, unit: Any = None) -> EventResponseFrame:
+        """压入 ForGroup 遍历帧，遍历过程中可直接修改帧的 enum_unit。
+
+        参数：
+            unit: 初始的当前遍历单位
+
+        返回：
+            压入的帧
+        """
+        top = self.top
+        frame = EventResponseFrame(top.trigger_id, top.event_data, unit, top.filter_unit,
+                                   top.enum_player)
+        self._frames.append(frame)
+        return frame
+
+    def push_filter(self, unit: Any = None) -> EventResponseFrame:
+        """压入单位枚举过滤帧，枚举过程中可直接修改帧的 filter_unit。
+
+        参数：
+            unit: 初始的当前过滤单位
+
+        返回：
+            压入的帧
+        """
+        top = self.top
+        frame = EventResponseFrame(top.trigger_id, top.event_data, top.enum_unit, unit,
+                                   top.enum_player)
+        self._frames.append(frame)
+        return frame
+
+    def push_enum_player(self, player: Any = None) -> EventResponseFrame:
+        """压入 ForForce 遍历帧，遍历过程中可直接修改帧的 enum_player。
+
+        参数：
+            player: 初始的当前遍历玩家
+
+        返回：
+            压入的帧
+        """
+        top = self.top
+        frame = EventResponseFrame(top.trigger_id, top.event_data, top.enum_unit,
+                                   top.filter_unit, player)
+        self._frames.append(frame)
+        return frame
+
+    def pop(self):
+        """弹出栈顶帧。"""
+        if self._frames:
+            self._frames.pop()
@@ -0,0 +1,204 @@
+"""事件过滤器索引模块。
+
+此模块提供 EventFilterIndex 类，按常用过滤字段（玩家ID、单位ID、
+计时器ID、精确聊天消息）为同一事件类型下注册的事件建立二级索引，
+使事件分发只访问可能匹配的触发器，而不是逐个检查过滤条件。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from jass_runner.trigger.chat_matcher import SubstringMatcher
+
+
+class _Leaf:
+    """索引叶子节点，按聊天消息过滤方式保存注册项。
+
+    属性：
+        any: 没有聊天消息过滤的触发器ID列表
+        exact: 精确消息 -> 触发器ID列表
+        substring: 子字符串模式匹配器，没有子字符串注册时为None
+    """
+
+    __slots__ = ("any", "exact", "substring")
+
+    def __init__(self):
+        self.any: List[str] = []
+        self.exact: Dict[str, List[str]] = {}
+        self.substring: Optional[SubstringMatcher] = None
+
+    def is_empty(self) -> bool:
+        return not self.any and not self.exact and self.substring is None
+
+
+class EventFilterIndex:
+    """单个事件类型的过滤器索引。
+
+    注册项按 KEY_FIELDS 逐层放入嵌套字典，每层用 None 表示"不过滤该字段"。
+    查询时事件带有某字段值的，只访问 None 和该值两个分支；
+    事件不带该字段的，视为不限制，匹配该层所有分支。
+    聊天消息在叶子节点中按精确匹配（字典查找）和子字符串匹配
+    （Aho–Corasick 自动机，一次扫描消息）分别处理，事件没有消息时按空字符串匹配。
+
+    同一触发器在一个事件类型下多次注册时只返回一次，
+    结果按触发器首次注册该事件类型的顺序排列。
+    """
+
+    KEY_FIELDS = ("player_id", "unit_id", "timer_id")
+
+    def __init__(self):
+        """初始化空索引。"""
+        self._root: Dict[Any, Any] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def __contains__(self, trigger_id: str) -> bool:
+        return trigger_id in self._order
+
+    def add(self, trigger_id: str, filter_data: Optional[Dict[str, Any]]):
+        """添加一次事件注册。
+
+        参数：
+            trigger_id: 触发器ID
+            filter_data: 事件过滤器数据字典
+        """
+        if trigger_id not in self._order:
+            self._order[trigger_id] = self._next_order
+            self._next_order += 1
+
+        leaf = self._find_leaf(filter_data, create=True)
+        message, exact = self._chat_filter(filter_data)
+        if message is None:
+            leaf.any.append(trigger_id)
+        elif exact:
+            leaf.exact.setdefault(message, []).append(trigger_id)
+        else:
+            if leaf.substring is None:
+                leaf.substring = SubstringMatcher()
+            leaf.substring.add(message, trigger_id)
+
+    def remove_trigger(self, trigger_id: str, filters: List[Optional[Dict[str, Any]]]):
+        """移除触发器在该事件类型下的所有注册。
+
+        参数：
+            trigger_id: 触发器ID
+            filters: 该触发器注册此事件类型时使用的过滤器数据列表
+        """
+        if self._order.pop(trigger_id, None) is None:
+            return
+        for filter_data in filters:
+            leaf = self._find_leaf(filter_data, create=False)
+            if leaf is None:
+                continue
+            message, exact = self._chat_filter(filter_data)
+            if message is None:
+                leaf.any = [tid for tid in leaf.any if tid != trigger_id]
+            elif exact:
+                remaining = [tid for tid in leaf.exact.get(message, ()) if tid != trigger_id]
+                if remaining:
+                    leaf.exact[message] = remaining
+                else:
+                    leaf.exact.pop(message, None)
+            elif leaf.substring is not None:
+                leaf.substring.remove_trigger(trigger_id)
+                if not leaf.substring:
+                    leaf.substring = None
+            if leaf.is_empty():
+                self._prune(filter_data)
+
+    def match(self, event_data: Dict[str, Any]) -> List[str]:
+        """查找过滤条件与事件数据匹配的触发器。
+
+        参数：
+            event_data: 事件数据字典
+
+        返回：
+            按首次注册顺序排列、去重后的触发器ID列表
+        """
+        leaves: List[_Leaf] = []
+        self._collect(self._root, 0, event_data, leaves)
+        if not leaves:
+            return []
+
+        message = event_data.get("message", "")
+        matched: Dict[str, None] = {}
+        for leaf in leaves:
+            for trigger_id in leaf.any:
+                matched[trigger_id] = None
+            if leaf.exact:
+                for trigger_id in leaf.exact.get(message, ()):
+                    matched[trigger_id] = None
+            if leaf.substring is not None:
+                for trigger_id in leaf.substring.match(message):
+                    matched[trigger_id] = None
+
+        if len(matched) < 2:
+            return list(matched)
+        order = self._order
+        return sorted(matched, key=order.__getitem__)
+
+    def _collect(self, node: Dict[Any, Any], depth: int, event_data: Dict[str, Any],
+                 leaves: List[_Leaf]):
+        """递归收集可能匹配事件的叶子节点。"""
+        if depth == len(self.KEY_FIELDS):
+            leaves.extend(node.values())
+            return
+
+        value = event_data.get(self.KEY_FIELDS[depth])
+        if value is None:
+            children = node.values()
+        else:
+            children = [child for child in (node.get(None), node.get(value)) if child is not None]
+        for child in children:
+            self._collect(child, depth + 1, event_data, leaves)
+
+    def _find_leaf(self, filter_data: Optional[Dict[str, Any]], create: bool) -> Optional[_Leaf]:
+        """根据过滤器数据定位叶子节点。
+
+        参数：
+            filter_data: 事件过滤器数据字典
+            create: 节点不存在时是否创建
+
+        返回：
+            叶子节点，不存在且不创建时返回None
+        """
+        filter_data = filter_data or {}
+        node = self._root
+        for field in self.KEY_FIELDS:
+            key = filter_data.get(field)
+            child = node.get(key)
+            if child is None:
+                if not create:
+                    return None
+                child = {}
+                node[key] = child
+            node = child
+
+        # 最后一层字典只保存一个叶子，键固定为None
+        leaf = node.get(None)
+        if leaf is None and create:
+            leaf = _Leaf()
+            node[None] = leaf
+        return leaf
+
+    def _prune(self, filter_data: Optional[Dict[str, Any]]):
+        """删除过滤器路径上已经为空的节点，避免动态注册的单位ID等长期残留。"""
+        filter_data = filter_data or {}
+        path = []
+        node = self._root
+        for field in self.KEY_FIELDS:
+            key = filter_data.get(field)
+            path.append((node, key))
+            node = node[key]
+
+        node.pop(None, None)
+        for parent, key in reversed(path):
+            if parent[key]:
+                break
+            del parent[key]
+
+    @staticmethod
+    def _chat_filter(filter_data: Optional[Dict[str, Any]]) -> Tuple[Optional[str], bool]:
+        """获取过滤器中的聊天消息及是否精确匹配。"""
+        if not filter_data:
+            return None, False
+        return filter_data.get("chat_message"), bool(filter_data.get("exact_match_only", False))
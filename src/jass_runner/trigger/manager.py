@@ -5,12 +5,23 @@
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
+from jass_runner.trigger.event_responses import EventResponseStack
+from jass_runner.trigger.event_types import EVENT_GAME_TIMER_EXPIRED, EVENT_ID_TO_NAME
+from jass_runner.trigger.filter_index import EventFilterIndex
 from jass_runner.trigger.trigger import Trigger
 
 logger = logging.getLogger(__name__)
 
+# 计时器到期事件的名称，Timer 触发的事件使用该名称
+TIMER_EXPIRED_EVENT = EVENT_ID_TO_NAME[EVENT_GAME_TIMER_EXPIRED]
+
+# 事件队列模式下默认的最大嵌套深度（触发器动作中引发的事件算一层）
+DEFAULT_MAX_EVENT_DEPTH = 8
+
 
 class TriggerManager:
     """触发器管理器类。
@@ -23,9 +34,146 @@ class TriggerManager:
     def __init__(self):
         """初始化触发器管理器。"""
         self._triggers: Dict[str, Trigger] = {}
-        self._event_index: Dict[str, List[str]] = {}
+        # 事件类型 -> 有序触发器ID集合（dict 键保持注册顺序，值恒为None）
+        self._event_index: Dict[str, Dict[str, None]] = {}
+        # 触发器ID -> 已注册的事件类型集合，用于销毁和清空事件时的反向查找
+        self._trigger_event_types: Dict[str, Dict[Any, None]] = {}
+        # 事件类型 -> 按过滤字段建立的二级索引
+        self._filter_indexes: Dict[str, EventFilterIndex] = {}
+        # 计时器ID -> 订阅该计时器到期事件的触发器ID列表
+        self._timer_subscriptions: Dict[str, Dict[str, None]] = {}
+        # 触发器ID -> 订阅的计时器ID集合
+        self._trigger_timers: Dict[str, Dict[str, None]] = {}
+        # 计时器ID -> 销毁函数，触发器注册时专门创建的计时器在最后一个订阅者移除时销毁
+        self._owned_timers: Dict[str, Callable[[str], Any]] = {}
         self._global_enabled: bool = True
         self._next_id: int = 0
+        self._profiler: Optional[Any] = None
+        # 触发器计时和事件计数，None 表示未开启
+        self._event_counts: Optional[Dict[Any, int]] = None
+        # 事件日志（EventJournal），None 表示不记录
+        self.journal: Optional[Any] = None
+        # 事件响应上下文栈，分发触发器时压入当前事件
+        self.event_responses = EventResponseStack()
+        # 事件队列模式：None 表示同步递归分发
+        self._event_queue: Optional[Deque[Tuple[Callable, tuple, int]]] = None
+        self._current_depth: Optional[int] = None
+        self.max_event_depth: int = DEFAULT_MAX_EVENT_DEPTH
+        self._queue_stats: Dict[str, int] = {}
+
+    def set_profiler(self, profiler: Any):
+        """设置帧预算分析器。
+
+        参数：
+            profiler: FrameProfiler 实例，None 表示关闭分析
+        """
+        self._profiler = profiler
+
+    def enable_stats(self):
+        """开启触发器计时和按事件类型的分发计数。
+
+        触发器的分发、条件、动作和异常计数始终记录，
+        开启后额外记录每个触发器的累计耗时和每种事件的触发次数。
+        """
+        if self._event_counts is None:
+            self._event_counts = {}
+
+    def disable_stats(self):
+        """关闭触发器计时和事件计数。"""
+        self._event_counts = None
+
+    def get_stats(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """获取触发器分发统计。
+
+        参数：
+            top: 只返回累计耗时最多的前 top 个触发器，None 表示全部
+
+        返回：
+            包含 timing、events（事件类型 -> 触发次数）和
+            triggers（按累计耗时、分发次数降序排列的触发器统计列表，
+            label 为第一个动作的函数名）的字典
+        """
+        triggers = []
+        for trigger in self._triggers.values():
+            stats = trigger.get_stats()
+            stats["label"] = self._profile_label(trigger)
+            triggers.append(stats)
+        triggers.sort(key=lambda stats: (stats["total_time"], stats["fires"]), reverse=True)
+        if top is not None:
+            triggers = triggers[:top]
+        return {
+            "timing": self._event_counts is not None,
+            "events": dict(self._event_counts or {}),
+            "triggers": triggers,
+        }
+
+    def enable_event_queue(self, max_depth: int = DEFAULT_MAX_EVENT_DEPTH):
+        """开启事件队列模式。
+
+        开启后，触发器动作中引发的事件不再递归分发，而是放入队列，
+        由最外层的分发循环依次处理，调用栈深度与连锁反应的长度无关。
+        嵌套深度超过 max_depth 的事件被丢弃并计数。
+
+        参数：
+            max_depth: 最大嵌套深度，0 表示动作中引发的事件全部丢弃
+        """
+        self.max_event_depth = max_depth
+        if self._event_queue is None:
+            self._event_queue = deque()
+        self._queue_stats = {"queued": 0, "processed": 0, "dropped": 0, "max_depth": 0}
+
+    def disable_event_queue(self):
+        """关闭事件队列模式，恢复同步递归分发。"""
+        self._event_queue = None
+
+    def get_event_queue_stats(self) -> Optional[Dict[str, int]]:
+        """获取事件队列统计。
+
+        返回：
+            包含 queued、processed、dropped、max_depth 和 pending 的字典，
+            未开启事件队列时返回None
+        """
+        if self._event_queue is None:
+            return None
+        stats = dict(self._queue_stats)
+        stats["pending"] = len(self._event_queue)
+        return stats
+
+    def _defer(self, handler: Callable, args: tuple):
+        """把一次事件分发放入队列。
+
+        正在分发事件时只入队，由外层循环处理；否则立即开始处理队列。
+
+        参数：
+            handler: 分发函数
+            args: 分发函数的参数
+        """
+        stats = self._queue_stats
+        depth = 0 if self._current_depth is None else self._current_depth + 1
+        if depth > self.max_event_depth:
+            stats["dropped"] += 1
+            logger.warning(f"事件嵌套深度超过 {self.max_event_depth}，已丢弃: {args[0]}")
+            return
+
+        self._event_queue.append((handler, args, depth))
+        stats["queued"] += 1
+        if depth > stats["max_depth"]:
+            stats["max_depth"] = depth
+        if self._current_depth is None:
+            self._drain_events()
+
+    def _drain_events(self):
+        """依次处理队列中的事件，直到队列为空。"""
+        queue = self._event_queue
+        stats = self._queue_stats
+        try:
+            while queue:
+                handler, args, depth = queue.popleft()
+                self._current_depth = depth
+                handler(*args)
+                stats["processed"] += 1
+        finally:
+            self._current_depth = None
 
     def _generate_trigger_id(self) -> str:
         """生成唯一的触发器ID。
@@ -51,7 +199,7 @@ class TriggerManager:
     def destroy_trigger(self, trigger_id: str) -> bool:
         """销毁触发器。
 
-        从所有事件索引中移除触发器的引用，
+        通过反向索引从其注册过的事件索引中移除触发器的引用，
         然后从触发器映射中删除。
 
         参数：
@@ -64,9 +212,7 @@ class TriggerManager:
             return False
 
         # 从所有事件索引中移除
-        for event_type, trigger_ids in self._event_index.items():
-            if trigger_id in trigger_ids:
-                trigger_ids.remove(trigger_id)
+        self._unregister_events(self._triggers[trigger_id])
 
         # 从触发器映射中删除
         del self._triggers[trigger_id]
@@ -136,6 +282,8 @@ class TriggerManager:
         """为触发器注册事件。
 
         在触发器上注册事件，并更新事件索引。
+        带 timer_id 过滤的计时器到期事件不进入通用索引，
+        而是记录到计时器订阅表中，由 fire_timer_expired 直接分发。
 
         参数：
             trigger_id: 触发器ID
@@ -152,14 +300,67 @@ class TriggerManager:
         # 在触发器上注册事件
         event_handle = trigger.register_event(event_type, filter_data)
 
-        # 更新事件索引
-        if event_type not in self._event_index:
-            self._event_index[event_type] = []
-        if trigger_id not in self._event_index[event_type]:
-            self._event_index[event_type].append(trigger_id)
+        timer_id = filter_data.get("timer_id") if filter_data else None
+        if timer_id is not None and self._is_timer_event(event_type):
+            self._timer_subscriptions.setdefault(timer_id, {})[trigger_id] = None
+            self._trigger_timers.setdefault(trigger_id, {})[timer_id] = None
+            return event_handle
+
+        # 更新事件索引和反向索引
+        self._event_index.setdefault(event_type, {})[trigger_id] = None
+        self._trigger_event_types.setdefault(trigger_id, {})[event_type] = None
+
+        index = self._filter_indexes.get(event_type)
+        if index is None:
+            index = EventFilterIndex()
+            self._filter_indexes[event_type] = index
+        index.add(trigger_id, filter_data)
 
         return event_handle
 
+    def _unregister_events(self, trigger: Trigger):
+        """移除触发器在所有索引中的事件注册。
+
+        只访问该触发器自己注册过的事件类型和计时器，
+        耗时与其注册数量成正比，与其他触发器的数量无关。
+
+        参数：
+            trigger: 触发器对象
+        """
+        trigger_id = trigger.trigger_id
+        for event_type in self._trigger_event_types.pop(trigger_id, ()):
+            trigger_ids = self._event_index.get(event_type)
+            if trigger_ids is not None:
+                trigger_ids.pop(trigger_id, None)
+                if not trigger_ids:
+                    del self._event_index[event_type]
+        self._remove_from_filter_indexes(trigger)
+
+        for timer_id in self._trigger_timers.pop(trigger_id, ()):
+            subscribers = self._timer_subscriptions.get(timer_id)
+            if subscribers is None:
+                continue
+            subscribers.pop(trigger_id, None)
+            if not subscribers:
+                del self._timer_subscriptions[timer_id]
+                destroy = self._owned_timers.pop(timer_id, None)
+                if destroy is not None:
+                    destroy(timer_id)
+
+    def _remove_from_filter_indexes(self, trigger: Trigger):
+        """从过滤器索引中移除触发器注册的所有事件。
+
+        参数：
+            trigger: 触发器对象
+        """
+        filters_by_type: Dict[Any, List[Optional[Dict]]] = {}
+        for event in trigger.events:
+            filters_by_type.setdefault(event["type"], []).append(event["filter"])
+        for event_type, filters in filters_by_type.items():
+            index = self._filter_indexes.get(event_type)
+            if index is not None:
+                index.remove_trigger(trigger.trigger_id, filters)
+
     def clear_trigger_events(self, trigger_id: str) -> bool:
         """清空触发器的所有事件。
 
@@ -174,74 +375,121 @@ class TriggerManager:
             return False
 
         # 从事件索引中移除该触发器的所有引用
-        for event_type, trigger_ids in self._event_index.items():
-            if trigger_id in trigger_ids:
-                trigger_ids.remove(trigger_id)
+        self._unregister_events(trigger)
 
         # 清空触发器的所有事件
         trigger.clear_events()
 
         return True
 
-    def _check_event_filter(self, event: Dict[str, Any], event_data: Dict[str, Any]) -> bool:
-        """检查事件是否匹配过滤条件。
+    @staticmethod
+    def _is_timer_event(event_type: Any) -> bool:
+        """判断事件类型是否为计时器到期事件（接受事件ID或名称）。"""
+        return event_type == EVENT_GAME_TIMER_EXPIRED or event_type == TIMER_EXPIRED_EVENT
+
+    def remove_timer(self, timer_id: str):
+        """计时器销毁时清除其订阅。
 
         参数：
-            event: 触发器上注册的事件信息
-            event_data: 当前触发的事件数据
+            timer_id: 计时器ID
+        """
+        for trigger_id in self._timer_subscriptions.pop(timer_id, ()):
+            timers = self._trigger_timers.get(trigger_id)
+            if timers is not None:
+                timers.pop(timer_id, None)
+                if not timers:
+                    del self._trigger_timers[trigger_id]
+        self._owned_timers.pop(timer_id, None)
 
-        返回：
-            事件匹配过滤条件返回True，否则返回False
+    def own_timer(self, timer_id: str, destroy: Callable[[str], Any]):
+        """登记只为触发器事件创建的计时器，最后一个订阅它的触发器被销毁或清空事件时销毁该计时器。
+
+        参数：
+            timer_id: 计时器ID
+            destroy: 销毁函数，接收计时器ID
         """
-        filter_data = event.get("filter")
-        if not filter_data:
-            return True
-
-        # 检查玩家ID匹配
-        filter_player_id = filter_data.get("player_id")
-        if filter_player_id is not None:
-            event_player_id = event_data.get("player_id")
-            if event_player_id is not None and filter_player_id != event_player_id:
-                return False
-
-        # 检查聊天消息匹配
-        chat_message = filter_data.get("chat_message")
-        if chat_message is not None:
-            event_message = event_data.get("message", "")
-            exact_match = filter_data.get("exact_match_only", False)
-
-            if exact_match:
-                # 精确匹配
-                if event_message != chat_message:
-                    return False
-            else:
-                # 子字符串匹配
-                if chat_message not in event_message:
-                    return False
+        self._owned_timers[timer_id] = destroy
 
-        return True
+    def fire_timer_expired(self, timer_id: str):
+        """分发计时器到期事件。
+
+        只处理订阅了该计时器的触发器，以及未指定计时器的通用计时器事件，
+        没有任何监听者时不构建事件数据。开启事件队列时按队列规则分发。
+
+        参数：
+            timer_id: 到期的计时器ID
+        """
+        if self.journal is not None:
+            self.journal.record("event", event_type=TIMER_EXPIRED_EVENT, timer_id=timer_id)
+        event_counts = self._event_counts
+        if event_counts is not None:
+            event_counts[TIMER_EXPIRED_EVENT] = event_counts.get(TIMER_EXPIRED_EVENT, 0) + 1
+        if self._event_queue is not None:
+            self._defer(self._fire_timer_expired_now, (timer_id,))
+            return
+        self._fire_timer_expired_now(timer_id)
+
+    def _fire_timer_expired_now(self, timer_id: str):
+        """立即分发计时器到期事件。
+
+        参数：
+            timer_id: 到期的计时器ID
+        """
+        subscribers = self._timer_subscriptions.get(timer_id)
+        if subscribers:
+            for trigger_id in list(subscribers):
+                trigger = self._triggers.get(trigger_id)
+                if trigger is not None and trigger.enabled:
+                    self._dispatch(trigger, {"event_data": {"timer_id": timer_id}})
+
+        if self._event_index.get(TIMER_EXPIRED_EVENT):
+            self._fire_event_now(TIMER_EXPIRED_EVENT, {"timer_id": timer_id})
 
     def fire_event(self, event_type: str, event_data: Dict[str, Any]):
         """触发事件。
 
-        遍历指定事件类型的所有候选触发器，
+        通过过滤器索引查找过滤条件与事件匹配的触发器，
         检查触发器是否启用，评估条件，执行动作。
 
         事件分发逻辑：
-        1. 根据event_type查询_event_index获取候选触发器列表
-        2. 对每个候选触发器：
+        1. 根据event_type获取过滤器索引，按玩家ID、单位ID、计时器ID
+           和聊天消息直接定位匹配的触发器（按注册顺序）
+        2. 对每个匹配的触发器：
+           - 事件数据指定trigger_id时，跳过其他触发器
            - 检查enabled状态，跳过禁用的
-           - 检查事件过滤条件，跳过不匹配的
            - 调用evaluate_conditions()，任一条件失败则跳过
            - 调用execute_actions()执行动作
 
+        开启事件队列时，触发器动作中引发的事件在当前事件处理完之后才分发。
+
         参数：
             event_type: 事件类型字符串
             event_data: 事件数据字典
         """
-        # 获取候选触发器列表
-        candidate_ids = self._event_index.get(event_type, [])
-        if not candidate_ids:
+        if self.journal is not None:
+            self.journal.record("event", **dict(event_data, event_type=event_type))
+        event_counts = self._event_counts
+        if event_counts is not None:
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        if self._event_queue is not None:
+            if event_type in self._filter_indexes:
+                self._defer(self._fire_event_now, (event_type, event_data))
+            return
+        self._fire_event_now(event_type, event_data)
+
+    def _fire_event_now(self, event_type: str, event_data: Dict[str, Any]):
+        """立即分发事件。
+
+        参数：
+            event_type: 事件类型字符串
+            event_data: 事件数据字典
+        """
+        index = self._filter_indexes.get(event_type)
+        if index is None:
+            return
+
+        matched_ids = index.match(event_data)
+        if not matched_ids:
             return
 
         # 构建状态上下文
@@ -250,40 +498,75 @@ class TriggerManager:
         # 获取目标触发器ID（如果事件数据中包含）
         target_trigger_id = event_data.get("trigger_id")
 
-        for trigger_id in candidate_ids:
+        for trigger_id in matched_ids:
             # 如果指定了目标触发器ID，则只处理该触发器
             if target_trigger_id is not None and trigger_id != target_trigger_id:
                 continue
 
             trigger = self._triggers.get(trigger_id)
-            if trigger is None:
+            if trigger is None or not trigger.enabled:
                 continue
 
-            # 检查触发器是否启用
-            if not trigger.enabled:
-                continue
+            self._dispatch(trigger, state_context)
 
-            # 检查事件过滤条件
-            event_matched = False
-            for event in trigger.events:
-                if event["type"] == event_type:
-                    if self._check_event_filter(event, event_data):
-                        event_matched = True
-                        break
+    def _dispatch(self, trigger: Trigger, state_context: Dict):
+        """运行触发器，开启帧分析或统计计时时记录其耗时。
 
-            if not event_matched:
-                continue
+        运行期间触发器和事件数据位于事件响应栈顶。
 
-            # 评估条件
-            if not trigger.evaluate_conditions(state_context):
-                continue
+        参数：
+            trigger: 触发器对象
+            state_context: 状态上下文字典
+        """
+        responses = self.event_responses
+        responses.push_trigger(trigger.trigger_id, state_context["event_data"])
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.enter("triggers", self._profile_label(trigger))
+        start = time.perf_counter() if self._event_counts is not None else None
+        try:
+            self._run_trigger(trigger, state_context)
+        finally:
+            if start is not None:
+                trigger.total_time += time.perf_counter() - start
+            if profiler is not None:
+                profiler.exit()
+            responses.pop()
+
+    def _run_trigger(self, trigger: Trigger, state_context: Dict):
+        """评估触发器条件并在通过时执行动作。
 
-            # 执行动作
-            try:
-                trigger.execute_actions(state_context)
-            except Exception as e:
-                # 记录异常但继续处理其他触发器
-                logger.warning(
-                    f"执行触发器动作时出错 [trigger_id={trigger_id}]: {e}"
-                )
-                continue
+        参数：
+            trigger: 触发器对象
+            state_context: 状态上下文字典
+        """
+        # 评估条件
+        if not trigger.evaluate_conditions(state_context):
+            return
+
+        # 执行动作
+        try:
+            trigger.execute_actions(state_context)
+        except Exception as e:
+            # 记录异常但继续处理其他触发器
+            trigger.error_count += 1
+            logger.warning(
+                f"执行触发器动作时出错 [trigger_id={trigger.trigger_id}]: {e}"
+            )
+
+    @staticmethod
+    def _profile_label(trigger: Trigger) -> str:
+        """获取帧分析器中代表触发器的标签。
+
+        优先使用第一个动作的JASS函数名，没有动作时使用触发器ID。
+
+        参数：
+            trigger: 触发器对象
+
+        返回：
+            标签字符串
+        """
+        for action in trigger.actions:
+            if action.func_name:
+                return action.func_name
+        return trigger.trigger_id
@@ -11,6 +11,38 @@ from typing import Any, Callable, Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 
+class TriggerAction:
+    """触发器动作记录。
+
+    属性：
+        handle: 动作handle字符串
+        func: 动作函数，接收state_context参数
+        func_name: 函数名，用于日志记录
+    """
+
+    __slots__ = ("handle", "func", "func_name")
+
+    def __init__(self, handle: str, func: Callable, func_name: Optional[str]):
+        self.handle = handle
+        self.func = func
+        self.func_name = func_name
+
+
+class TriggerCondition:
+    """触发器条件记录。
+
+    属性：
+        handle: 条件handle字符串
+        func: 条件函数，接收state_context参数，返回bool
+    """
+
+    __slots__ = ("handle", "func")
+
+    def __init__(self, handle: str, func: Callable):
+        self.handle = handle
+        self.func = func
+
+
 class Trigger:
     """JASS触发器类。
 
@@ -27,10 +59,35 @@ class Trigger:
         """
         self.trigger_id = trigger_id
         self.events: List[Dict[str, Any]] = []
-        self.conditions: List[Dict[str, Any]] = []
-        self.actions: List[Dict[str, Any]] = []
+        self.conditions: List[TriggerCondition] = []
+        self.actions: List[TriggerAction] = []
         self.enabled: bool = True
 
+        # 运行统计
+        self.fire_count: int = 0  # 被分发（评估条件）的次数
+        self.run_count: int = 0  # 条件通过并执行动作的次数
+        self.conditions_evaluated: int = 0
+        self.actions_executed: int = 0
+        self.error_count: int = 0  # 条件和动作中被捕获的异常数
+        self.total_time: float = 0.0  # 开启计时时累计的分发耗时（秒）
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取触发器的运行统计。
+
+        返回：
+            统计字典
+        """
+        return {
+            "trigger_id": self.trigger_id,
+            "fires": self.fire_count,
+            "runs": self.run_count,
+            "conditions_evaluated": self.conditions_evaluated,
+            "actions_executed": self.actions_executed,
+            "errors": self.error_count,
+            "total_time": self.total_time,
+            "avg_time": self.total_time / self.fire_count if self.fire_count else 0.0,
+        }
+
     def _generate_handle(self, prefix: str) -> str:
         """生成带前缀的handle。
 
@@ -53,11 +110,9 @@ class Trigger:
             动作handle字符串（格式：action_ + uuid前8位）
         """
         handle = self._generate_handle("action_")
-        self.actions.append({
-            "handle": handle,
-            "func": action_func,
-            "func_name": func_name or getattr(action_func, '__name__', None)
-        })
+        self.actions.append(TriggerAction(
+            handle, action_func, func_name or getattr(action_func, '__name__', None)
+        ))
         return handle
 
     def remove_action(self, action_handle: str) -> bool:
@@ -70,7 +125,7 @@ class Trigger:
             成功移除返回True，未找到返回False
         """
         for i, action in enumerate(self.actions):
-            if action["handle"] == action_handle:
+            if action.handle == action_handle:
                 self.actions.pop(i)
                 return True
         return False
@@ -89,10 +144,7 @@ class Trigger:
             条件handle字符串（格式：condition_ + uuid前8位）
         """
         handle = self._generate_handle("condition_")
-        self.conditions.append({
-            "handle": handle,
-            "func": condition_func
-        })
+        self.conditions.append(TriggerCondition(handle, condition_func))
         return handle
 
     def remove_condition(self, condition_handle: str) -> bool:
@@ -105,7 +157,7 @@ class Trigger:
             成功移除返回True，未找到返回False
         """
         for i, condition in enumerate(self.conditions):
-            if condition["handle"] == condition_handle:
+            if condition.handle == condition_handle:
                 self.conditions.pop(i)
                 return True
         return False
@@ -149,17 +201,21 @@ class Trigger:
         返回：
             所有条件是否通过
         """
+        self.fire_count += 1
+
         # 无条件时默认返回True
         if not self.conditions:
             return True
 
         # 依次评估所有条件，任一失败立即返回False
         for condition in self.conditions:
+            self.conditions_evaluated += 1
             try:
-                result = condition["func"](state_context)
+                result = condition.func(state_context)
                 if not result:
                     return False
             except Exception as e:
+                self.error_count += 1
                 logger.warning(
                     f"条件评估出错 [trigger_id={self.trigger_id}]: {e}"
                 )
@@ -176,20 +232,21 @@ class Trigger:
         参数：
             state_context: 状态上下文字典
         """
+        self.run_count += 1
+        self.actions_executed += len(self.actions)
         for action in self.actions:
             try:
-                action["func"](state_context)
+                action.func(state_context)
             except Exception as e:
                 # 记录异常但继续执行后续动作
-                func_name = action.get('func_name')
-                if func_name:
+                self.error_count += 1
+                if action.func_name:
                     logger.warning(
                         f"动作执行出错 [trigger_id={self.trigger_id}, "
-                        f"action='{func_name}' ({action['handle']})]: {e}"
+                        f"action='{action.func_name}' ({action.handle})]: {e}"
                     )
                 else:
                     logger.warning(
                         f"动作执行出错 [trigger_id={self.trigger_id}, "
-                        f"action={action['handle']}]: {e}"
+                        f"action={action.handle}]: {e}"
                     )
-                continue
@@ -4,19 +4,29 @@
 """
 
 from .memory import MemoryTracker, HandleMemoryMonitor
-from .performance import PerformanceMonitor, track_performance, get_global_monitor, reset_global_monitor
+from .performance import (
+    PerformanceMonitor, OperationStats, track_performance,
+    get_current_monitor, get_global_monitor, reset_global_monitor,
+)
 from .fourcc import fourcc_to_int, int_to_fourcc, is_fourcc
 from .constant_loader import ConstantLoader
+from .varint import write_varint, read_varint, zigzag, unzigzag
 
 __all__ = [
     "MemoryTracker",
     "HandleMemoryMonitor",
     "PerformanceMonitor",
+    "OperationStats",
     "track_performance",
+    "get_current_monitor",
     "get_global_monitor",
     "reset_global_monitor",
     "fourcc_to_int",
     "int_to_fourcc",
     "is_fourcc",
     "ConstantLoader",
+    "write_varint",
+    "read_varint",
+    "zigzag",
+    "unzigzag",
 ]
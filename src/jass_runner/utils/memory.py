@@ -1,44 +1,143 @@
 """内存监控工具。
 
-此模块提供内存使用监控功能，用于跟踪handle系统的内存消耗。
+此模块提供内存使用监控功能，基于 tracemalloc 统计 jass_runner 包内代码分配的内存，
+并按子系统（解析器、解释器、handle、hashtable、触发器、计时器等）拆分。
 """
 
+import os
 import sys
+import time
 import logging
-from typing import Dict, List, Any, Optional
+import tracemalloc
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# jass_runner 包的根目录
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (相对包根目录的路径前缀, 子系统名)，按顺序匹配第一个
+SUBSYSTEMS: Tuple[Tuple[str, str], ...] = (
+    ("parser/", "parser"),
+    ("interpreter/", "interpreter"),
+    ("natives/hashtable", "hashtables"),
+    ("trigger/", "triggers"),
+    ("natives/trigger", "triggers"),
+    ("timer/", "timers"),
+    ("natives/timer", "timers"),
+    ("natives/", "handles"),
+    ("vm/", "vm"),
+)
+
+# 不属于以上子系统的包内代码
+OTHER_SUBSYSTEM = "other"
+
+
+@lru_cache(maxsize=None)
+def subsystem_of(filename: str) -> Optional[str]:
+    """根据源文件路径判断所属子系统。
+
+    参数：
+        filename: 源文件路径
+
+    返回：
+        子系统名，不在 jass_runner 包内时返回None
+    """
+    if not filename.startswith(PACKAGE_DIR):
+        return None
+    relative = filename[len(PACKAGE_DIR) + 1:].replace(os.sep, "/")
+    for prefix, name in SUBSYSTEMS:
+        if relative.startswith(prefix):
+            return name
+    return OTHER_SUBSYSTEM
+
 
 class MemoryTracker:
     """内存使用追踪器。
 
-    用于监控handle系统的内存使用情况，帮助识别内存泄漏。
+    使用 tracemalloc 统计 jass_runner 包内代码分配且仍未释放的内存，
+    每次分配归属到调用栈中最近的包内源文件所在的子系统。
+    创建追踪器不会启动 tracemalloc：调用 start() 或进入 with 块时，
+    如果 tracemalloc 没有运行则启动它，并在 stop() 或退出 with 块时停止。
+    未启动时各项统计均为0。
+
+    snapshot() 和 get_breakdown() 需要遍历所有存活的分配，开销与分配数量成正比；
+    长时间模拟应使用 sample()，它只读取 tracemalloc 的累计计数（整个进程），
+    开销为常数，样本保存在固定长度的队列中。
 
     属性：
         initial_memory: 初始内存使用量（字节）
         peak_memory: 峰值内存使用量（字节）
         snapshots: 内存快照列表
+        samples: (时间, 进程已追踪内存字节数) 样本队列，只保留最近 max_samples 个
     """
 
-    def __init__(self):
-        """初始化内存追踪器。"""
+    def __init__(self, frames: int = 4, max_samples: int = 1024):
+        """初始化内存追踪器。
+
+        参数：
+            frames: tracemalloc 为每次分配保存的调用栈深度，
+                    越深归属越准确（dataclass 生成的构造函数等不在包内的帧会被跳过），开销也越大；
+                    tracemalloc 已在运行时沿用其设置
+            max_samples: sample() 保留的最大样本数
+        """
+        self._frames = frames
+        self._started_tracing = False
+        self._filters = [tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*"), all_frames=True)]
         self.initial_memory = 0
         self.peak_memory = 0
         self.snapshots: List[Dict[str, Any]] = []
+        self.samples: deque = deque(maxlen=max_samples)
+
+    def start(self) -> "MemoryTracker":
+        """开始追踪，tracemalloc 没有运行时启动它，并以当前内存作为初始值。
+
+        返回：
+            追踪器本身
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._started_tracing = True
         self._start_tracking()
+        return self
+
+    def __enter__(self) -> "MemoryTracker":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _measure(self) -> Tuple[int, Dict[str, int]]:
+        """统计包内代码分配的内存。
+
+        返回：
+            (总字节数, 子系统名 -> 字节数)，tracemalloc 已停止时返回 (0, {})
+        """
+        if not tracemalloc.is_tracing():
+            return 0, {}
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        by_subsystem: Dict[str, int] = {}
+        total = 0
+        for trace in snapshot.traces:
+            # 调用栈按从旧到新排列，从最近的帧开始找包内文件
+            for frame in reversed(trace.traceback):
+                name = subsystem_of(frame.filename)
+                if name is not None:
+                    by_subsystem[name] = by_subsystem.get(name, 0) + trace.size
+                    break
+            total += trace.size
+        return total, by_subsystem
 
     def _get_current_memory(self) -> int:
         """获取当前内存使用量。
 
         返回：
-            当前内存使用量（字节）
+            jass_runner 包内代码分配且仍未释放的内存（字节）
         """
-        # 使用sys.getsizeof估算，实际生产环境可使用psutil
-        import gc
-        gc.collect()  # 强制垃圾回收获取准确值
-        return 0  # 基线实现，可扩展为使用tracemalloc
+        return self._measure()[0]
 
     def _start_tracking(self):
         """开始追踪内存。"""
@@ -53,9 +152,9 @@ class MemoryTracker:
             point_name: 快照点名称
 
         返回：
-            快照信息字典
+            快照信息字典，subsystems 为各子系统的字节数
         """
-        current = self._get_current_memory()
+        current, by_subsystem = self._measure()
 
         # 更新峰值
         if current > self.peak_memory:
@@ -65,12 +164,37 @@ class MemoryTracker:
             "point": point_name,
             "memory": current,
             "delta": current - self.initial_memory,
+            "subsystems": by_subsystem,
         }
         self.snapshots.append(snapshot)
 
         logger.debug(f"内存快照 [{point_name}]: {self._format_bytes(current)}")
         return snapshot
 
+    def get_breakdown(self) -> Dict[str, int]:
+        """获取各子系统当前占用的内存。
+
+        返回：
+            子系统名 -> 字节数，按字节数降序排列
+        """
+        by_subsystem = self._measure()[1]
+        return dict(sorted(by_subsystem.items(), key=lambda item: -item[1]))
+
+    def sample(self, at: Optional[float] = None) -> int:
+        """记录一个低开销样本。
+
+        样本值为 tracemalloc 追踪到的整个进程当前内存，不按包路径过滤。
+
+        参数：
+            at: 样本时间（如模拟时间），默认为 time.perf_counter()
+
+        返回：
+            当前已追踪内存（字节），tracemalloc 已停止时返回0
+        """
+        current = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        self.samples.append((time.perf_counter() if at is None else at, current))
+        return current
+
     def get_stats(self) -> Dict[str, Any]:
         """获取内存统计信息。
 
@@ -78,6 +202,8 @@ class MemoryTracker:
             统计信息字典
         """
         current = self._get_current_memory()
+        if current > self.peak_memory:
+            self.peak_memory = current
         return {
             "initial_memory": self.initial_memory,
             "peak_memory": self.peak_memory,
@@ -89,8 +215,15 @@ class MemoryTracker:
     def reset(self):
         """重置追踪器。"""
         self.snapshots.clear()
+        self.samples.clear()
         self._start_tracking()
 
+    def stop(self):
+        """停止追踪。只有由本追踪器启动的 tracemalloc 才会被停止。"""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
     @staticmethod
     def _format_bytes(bytes_value: int) -> str:
         """格式化字节值为可读字符串。
@@ -108,20 +241,44 @@ class MemoryTracker:
         return f"{bytes_value:.2f} TB"
 
 
+def estimate_size(obj: Any) -> int:
+    """估算对象占用的内存。
+
+    统计对象本身、实例字典及字典中直接引用的容器（列表、字典、集合等），
+    不递归统计容器中的元素，也不统计共享的字符串和数值。
+
+    参数：
+        obj: 任意对象
+
+    返回：
+        估算的字节数
+    """
+    size = sys.getsizeof(obj)
+    attributes = getattr(obj, "__dict__", None)
+    if attributes is not None:
+        size += sys.getsizeof(attributes)
+        for value in attributes.values():
+            if isinstance(value, (list, dict, set, tuple, bytearray)):
+                size += sys.getsizeof(value)
+    return size
+
+
 class HandleMemoryMonitor:
     """Handle系统内存监控器。
 
     专门用于监控HandleManager的内存使用情况。
     """
 
-    def __init__(self, handle_manager):
+    def __init__(self, handle_manager, tracker: Optional[MemoryTracker] = None):
         """初始化监控器。
 
         参数：
             handle_manager: HandleManager实例
+            tracker: 使用的内存追踪器，默认创建新的 MemoryTracker；
+                     监控器不会启动或停止追踪器，需要时由调用方调用 tracker.start()/stop()
         """
         self.handle_manager = handle_manager
-        self.tracker = MemoryTracker()
+        self.tracker = tracker if tracker is not None else MemoryTracker()
 
     def monitor_create_unit(self, unit_type: str, player_id: int,
                            x: float, y: float, facing: float):
@@ -142,6 +299,23 @@ class HandleMemoryMonitor:
         self.tracker.snapshot(f"after_create_{unit_type}")
         return unit
 
+    def get_memory_by_type(self) -> Dict[str, Dict[str, int]]:
+        """按handle类型估算存活handle占用的内存。
+
+        返回：
+            类型名 -> {"count": 存活数量, "bytes": 估算字节数}，按字节数降序排列
+        """
+        by_type: Dict[str, Dict[str, int]] = {}
+        for handle in self.handle_manager._handles.values():
+            if not handle.is_alive():
+                continue
+            entry = by_type.get(handle.type_name)
+            if entry is None:
+                entry = by_type[handle.type_name] = {"count": 0, "bytes": 0}
+            entry["count"] += 1
+            entry["bytes"] += estimate_size(handle)
+        return dict(sorted(by_type.items(), key=lambda item: -item[1]["bytes"]))
+
     def get_handle_memory_report(self) -> Dict[str, Any]:
         """获取handle内存使用报告。
 
@@ -149,10 +323,14 @@ class HandleMemoryMonitor:
             内存报告字典
         """
         stats = self.tracker.get_stats()
+        by_type = self.get_memory_by_type()
+        alive = sum(entry["count"] for entry in by_type.values())
+        handle_bytes = sum(entry["bytes"] for entry in by_type.values())
         handle_stats = {
             "total_handles": self.handle_manager.get_total_handles(),
             "alive_handles": self.handle_manager.get_alive_handles(),
-            "memory_per_handle": stats["current_memory"] / max(stats["snapshots_count"], 1),
+            "memory_per_handle": handle_bytes / max(alive, 1),
+            "by_type": by_type,
         }
         return {
             "memory_stats": stats,
@@ -1,30 +1,107 @@
 """性能监控工具。
 
 此模块提供性能监控功能，用于跟踪handle系统的性能指标。
+每个操作只保存固定大小的流式统计（次数、总和、最小/最大值和对数分桶直方图），
+内存占用与记录次数无关。
 """
 
+import math
 import time
 import logging
 import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, List, Any, Optional, Callable
-from collections import defaultdict
 
 
 logger = logging.getLogger(__name__)
 
+# 直方图第0个桶的上界（秒），更短的耗时都计入第0个桶
+HISTOGRAM_MIN = 1e-7
+# 相邻桶上界之比，分位数的相对误差不超过约 19%
+HISTOGRAM_GROWTH = 2 ** 0.25
+# 桶数量，最后一个桶的上界约为 HISTOGRAM_MIN * HISTOGRAM_GROWTH ** 139 ≈ 2.8e3 秒
+HISTOGRAM_BUCKETS = 140
+
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+
+class OperationStats:
+    """单个操作的流式统计。
+
+    属性：
+        count: 记录次数
+        total: 总耗时（秒）
+        min: 最小耗时
+        max: 最大耗时
+        buckets: 对数分桶直方图，第 i 个桶的上界为 HISTOGRAM_MIN * HISTOGRAM_GROWTH ** i
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        """初始化空的统计。"""
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: List[int] = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration: float):
+        """记录一次耗时。
+
+        参数：
+            duration: 耗时（秒）
+        """
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        if duration <= HISTOGRAM_MIN:
+            index = 0
+        else:
+            index = math.ceil(math.log(duration / HISTOGRAM_MIN) / _LOG_GROWTH)
+            if index >= HISTOGRAM_BUCKETS:
+                index = HISTOGRAM_BUCKETS - 1
+        self.buckets[index] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """估算分位数。
+
+        参数：
+            fraction: 分位（0-1），如 0.95
+
+        返回：
+            所在桶的上界，限制在 [min, max] 范围内；没有记录时返回0
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                bound = HISTOGRAM_MIN * HISTOGRAM_GROWTH ** index
+                return min(max(bound, self.min), self.max)
+        return self.max
+
 
 class PerformanceMonitor:
     """性能监控器。
 
     用于跟踪handle系统的性能指标，如操作耗时。
+    每个 JassVM 拥有自己的监控器，执行期间通过 activate() 设为当前监控器，
+    track_performance 装饰的函数记录到当前监控器，并行运行的虚拟机互不干扰。
 
     属性：
-        metrics: 性能指标字典
+        metrics: 操作名称 -> OperationStats
     """
 
     def __init__(self):
         """初始化性能监控器。"""
-        self.metrics: Dict[str, List[float]] = defaultdict(list)
+        self.metrics: Dict[str, OperationStats] = {}
 
     def record(self, operation: str, duration: float):
         """记录操作耗时。
@@ -33,7 +110,10 @@ class PerformanceMonitor:
             operation: 操作名称
             duration: 耗时（秒）
         """
-        self.metrics[operation].append(duration)
+        stats = self.metrics.get(operation)
+        if stats is None:
+            stats = self.metrics[operation] = OperationStats()
+        stats.add(duration)
 
     def get_stats(self, operation: str) -> Dict[str, Any]:
         """获取指定操作的统计信息。
@@ -42,18 +122,21 @@ class PerformanceMonitor:
             operation: 操作名称
 
         返回：
-            统计信息字典
+            统计信息字典，p50/p95/p99 为直方图估算的分位数
         """
-        times = self.metrics.get(operation, [])
-        if not times:
-            return {"count": 0, "min": 0, "max": 0, "avg": 0, "total": 0}
+        stats = self.metrics.get(operation)
+        if stats is None or stats.count == 0:
+            return {"count": 0, "min": 0, "max": 0, "avg": 0, "total": 0, "p50": 0, "p95": 0, "p99": 0}
 
         return {
-            "count": len(times),
-            "min": min(times),
-            "max": max(times),
-            "avg": sum(times) / len(times),
-            "total": sum(times),
+            "count": stats.count,
+            "min": stats.min,
+            "max": stats.max,
+            "avg": stats.total / stats.count,
+            "total": stats.total,
+            "p50": stats.percentile(0.50),
+            "p95": stats.percentile(0.95),
+            "p99": stats.percentile(0.99),
         }
 
     def get_report(self) -> Dict[str, Dict[str, Any]]:
@@ -68,6 +151,15 @@ class PerformanceMonitor:
         """重置所有指标。"""
         self.metrics.clear()
 
+    @contextmanager
+    def activate(self):
+        """在 with 块内把本监控器设为当前监控器。"""
+        token = _current_monitor.set(self)
+        try:
+            yield self
+        finally:
+            _current_monitor.reset(token)
+
     def log_report(self):
         """将性能报告输出到日志。"""
         report = self.get_report()
@@ -81,16 +173,19 @@ class PerformanceMonitor:
             logger.info(f"  最小耗时: {stats['min']*1000:.3f} ms")
             logger.info(f"  最大耗时: {stats['max']*1000:.3f} ms")
             logger.info(f"  平均耗时: {stats['avg']*1000:.3f} ms")
+            logger.info(f"  P50/P95/P99: {stats['p50']*1000:.3f} / {stats['p95']*1000:.3f} / "
+                        f"{stats['p99']*1000:.3f} ms")
             logger.info(f"  总耗时: {stats['total']*1000:.3f} ms")
 
 
-def track_performance(operation_name: str):
+def track_performance(operation_name: str, monitor: Optional[PerformanceMonitor] = None):
     """性能监控装饰器。
 
     用于自动追踪函数执行时间。
 
     参数：
         operation_name: 操作名称
+        monitor: 固定记录到的监控器，默认记录到调用时的当前监控器（见 get_current_monitor）
 
     返回：
         装饰器函数
@@ -108,14 +203,24 @@ def track_performance(operation_name: str):
                 return func(*args, **kwargs)
             finally:
                 duration = time.perf_counter() - start
-                # 使用全局监控器记录
-                _global_monitor.record(operation_name, duration)
+                (monitor or _current_monitor.get()).record(operation_name, duration)
         return wrapper
     return decorator
 
 
-# 全局性能监控器
+# 全局性能监控器，没有激活其他监控器时使用
 _global_monitor = PerformanceMonitor()
+# 当前监控器，按线程/协程上下文隔离
+_current_monitor: ContextVar[PerformanceMonitor] = ContextVar("jass_performance_monitor", default=_global_monitor)
+
+
+def get_current_monitor() -> PerformanceMonitor:
+    """获取当前监控器。
+
+    返回：
+        当前上下文中激活的PerformanceMonitor，没有激活时返回全局监控器
+    """
+    return _current_monitor.get()
 
 
 def get_global_monitor() -> PerformanceMonitor:
@@ -0,0 +1,60 @@
+"""变长整数编码工具。
+
+事件日志和 hashtable 快照共用的 LEB128 变长整数与 zigzag 编码。
+"""
+
+from typing import IO, Optional
+
+
+def zigzag(value: int) -> int:
+    """把有符号整数映射为非负整数（0, -1, 1, -2 -> 0, 1, 2, 3）。"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    """zigzag 的逆运算。"""
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def write_varint(out: bytearray, value: int):
+    """把非负整数以 LEB128 变长编码追加到缓冲区。
+
+    参数：
+        out: 输出缓冲区
+        value: 非负整数
+    """
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(stream: IO[bytes], first: Optional[int] = None) -> int:
+    """从流中读取一个 LEB128 变长整数。
+
+    参数：
+        stream: 可读的二进制流
+        first: 已经读出的第一个字节
+
+    返回：
+        解码后的非负整数
+
+    异常：
+        ValueError: 数据被截断
+    """
+    if first is None:
+        data = stream.read(1)
+        if not data:
+            raise ValueError("变长整数被截断")
+        first = data[0]
+    value = first & 0x7F
+    shift = 7
+    byte = first
+    while byte & 0x80:
+        data = stream.read(1)
+        if not data:
+            raise ValueError("变长整数被截断")
+        byte = data[0]
+        value |= (byte & 0x7F) << shift
+        shift += 7
+    return value
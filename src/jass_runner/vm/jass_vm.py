@@ -6,7 +6,8 @@
 
 import logging
 import os
-from typing import Optional
+import sys
+from typing import Optional, Union
 
 from ..parser.parser import Parser
 from ..interpreter.interpreter import Interpreter
@@ -14,7 +15,12 @@ from ..natives.factory import NativeFactory
 from ..timer.system import TimerSystem
 from ..timer.simulation import SimulationLoop
 from ..utils.constant_loader import ConstantLoader
+from ..utils.memory import HandleMemoryMonitor, MemoryTracker
+from ..utils.performance import PerformanceMonitor
 from ..trigger.event_types import EVENT_PLAYER_CHAT
+from ..trigger.manager import DEFAULT_MAX_EVENT_DEPTH
+from .journal import EventJournal, JournalRecorder, JournalVerifier
+from .timeline import InputTimeline
 
 
 logger = logging.getLogger(__name__)
@@ -45,6 +51,8 @@ class JassVM:
         # 创建解释器，传入coroutine_runner（如果simulation_loop存在）
         coroutine_runner = self.simulation_loop.coroutine_runner if self.simulation_loop else None
         self.interpreter = Interpreter(native_registry=self.native_registry, coroutine_runner=coroutine_runner)
+        if self.simulation_loop:
+            self.simulation_loop.attach_state_context(self.interpreter.state_context)
 
         # 初始化常量加载器
         self.constant_loader = ConstantLoader(self.interpreter)
@@ -53,6 +61,13 @@ class JassVM:
         self.loaded = False
         self.blizzard_ast = None  # 存储 blizzard.j 的 AST
         self.blizzard_loaded = False  # blizzard.j 是否已加载
+        self.timeline: Optional[InputTimeline] = None  # 脚本化输入时间线
+        self.journal: Optional[EventJournal] = None  # 事件日志
+        self.memory_tracker: Optional[MemoryTracker] = None  # 内存追踪
+        # 本虚拟机的性能监控器，execute() 和 run_simulation() 期间为当前监控器
+        self.performance_monitor = PerformanceMonitor()
+        self._memory_sample_interval = 0.0
+        self._next_memory_sample = 0.0
 
         # 加载 common.j 中的常量
         self._load_constants()
@@ -128,12 +143,13 @@ class JassVM:
 
         logger.info("开始脚本执行")
         try:
-            # 如果已加载 blizzard.j，先执行它
-            if self.blizzard_loaded and self.blizzard_ast is not None:
-                logger.debug("执行 blizzard.j")
-                self.interpreter.execute(self.blizzard_ast)
+            with self.performance_monitor.activate():
+                # 如果已加载 blizzard.j，先执行它
+                if self.blizzard_loaded and self.blizzard_ast is not None:
+                    logger.debug("执行 blizzard.j")
+                    self.interpreter.execute(self.blizzard_ast)
 
-            self.interpreter.execute(self.ast)
+                self.interpreter.execute(self.ast)
             logger.info("脚本执行成功完成")
         except Exception as e:
             logger.error(f"执行期间出错: {e}")
@@ -146,7 +162,8 @@ class JassVM:
             return
 
         logger.info(f"运行模拟 {seconds} 秒")
-        self.simulation_loop.run_seconds(seconds)
+        with self.performance_monitor.activate():
+            self.simulation_loop.run_seconds(seconds)
         logger.info(f"模拟完成。模拟时间: {self.simulation_loop.get_simulated_time():.2f}秒")
 
     def run(self, script_content: str, simulate_seconds: float = 0.0,
@@ -169,6 +186,209 @@ class JassVM:
         if simulate_seconds > 0 and self.enable_timers:
             self.run_simulation(simulate_seconds)
 
+    def enable_frame_profiling(self, frame_budget: float = None):
+        """开启每帧耗时分析。
+
+        参数：
+            frame_budget: 每帧CPU预算（秒），默认为一帧的模拟时长
+
+        返回：
+            FrameProfiler 实例，计时器系统未启用时返回None
+        """
+        if not self.simulation_loop:
+            logger.warning("计时器系统未启用，无法开启帧分析")
+            return None
+        return self.simulation_loop.enable_profiling(frame_budget)
+
+    def set_speed_mode(self, mode: str) -> bool:
+        """设置模拟速度模式。
+
+        参数：
+            mode: "unthrottled"、"realtime" 或 "max"
+
+        返回：
+            设置成功返回True，计时器系统未启用或模式无效返回False
+        """
+        if not self.simulation_loop:
+            logger.warning("计时器系统未启用，无法设置速度模式")
+            return False
+        if not self.simulation_loop.set_speed_mode(mode):
+            logger.warning(f"无效的速度模式: {mode}")
+            return False
+        return True
+
+    def get_speed_stats(self) -> Optional[dict]:
+        """获取模拟速度统计。
+
+        返回：
+            速度统计字典，计时器系统未启用时返回None
+        """
+        if not self.simulation_loop:
+            return None
+        return self.simulation_loop.get_speed_stats()
+
+    def get_frame_report(self) -> Optional[dict]:
+        """获取帧预算报告。
+
+        返回：
+            报告字典，未开启帧分析时返回None
+        """
+        if not self.simulation_loop:
+            return None
+        return self.simulation_loop.get_frame_report()
+
+    def enable_event_queue(self, max_depth: int = DEFAULT_MAX_EVENT_DEPTH):
+        """开启事件队列模式，触发器动作中引发的事件排队分发而不是递归分发。
+
+        参数：
+            max_depth: 最大事件嵌套深度，超过的事件被丢弃
+        """
+        self.interpreter.state_context.trigger_manager.enable_event_queue(max_depth)
+
+    def get_event_queue_stats(self) -> Optional[dict]:
+        """获取事件队列统计。
+
+        返回：
+            统计字典，未开启事件队列时返回None
+        """
+        return self.interpreter.state_context.trigger_manager.get_event_queue_stats()
+
+    def enable_trigger_stats(self):
+        """开启触发器计时和按事件类型的分发计数。"""
+        self.interpreter.state_context.trigger_manager.enable_stats()
+
+    def trigger_stats(self, top: Optional[int] = None) -> dict:
+        """获取触发器分发统计。
+
+        参数：
+            top: 只返回累计耗时最多的前 top 个触发器，None 表示全部
+
+        返回：
+            统计字典，格式见 TriggerManager.get_stats()
+        """
+        return self.interpreter.state_context.trigger_manager.get_stats(top)
+
+    def enable_leak_tracking(self):
+        """开启handle泄漏检测，记录之后创建的每个handle所在的JASS函数和行号。
+
+        应在 execute() 之前调用，才能覆盖地图初始化时创建的handle。
+
+        返回：
+            LeakTracker 实例
+        """
+        return self.interpreter.state_context.handle_manager.enable_leak_tracking(
+            self.interpreter.current_site, self._simulation_time)
+
+    def leak_report(self, top: Optional[int] = None) -> Optional[dict]:
+        """获取仍然存活的handle报告，按类型和创建位置分组。
+
+        参数：
+            top: 只返回存活数量最多的前 top 个创建位置，None 表示全部
+
+        返回：
+            报告字典，格式见 LeakTracker.report()，未开启泄漏检测时返回None
+        """
+        return self.interpreter.state_context.handle_manager.leak_report(top)
+
+    def _simulation_time(self) -> float:
+        """当前模拟时间（秒）：模拟开始前为0。"""
+        return self.simulation_loop.current_time if self.simulation_loop else 0.0
+
+    def enable_native_profiling(self):
+        """开启native调用分析，统计每个native的调用次数、总耗时、自身耗时和调用位置。
+
+        耗时同时记录到 performance_monitor，操作名称为 "native:函数名"。
+
+        返回：
+            NativeProfiler 实例
+        """
+        return self.native_registry.enable_profiling(self.performance_monitor, self.interpreter.current_site)
+
+    def disable_native_profiling(self):
+        """关闭native调用分析，换回原来的native函数。"""
+        self.native_registry.disable_profiling()
+
+    def native_profile(self, top: Optional[int] = None, top_sites: int = 5) -> Optional[dict]:
+        """获取native调用报告。
+
+        参数：
+            top: 只返回自身耗时最多的前 top 个native，None 表示全部
+            top_sites: 每个native返回的调用位置数量
+
+        返回：
+            报告字典，格式见 NativeProfiler.report()，未开启调用分析时返回None
+        """
+        profiler = self.native_registry.profiler
+        if profiler is None:
+            return None
+        return profiler.report(top, top_sites)
+
+    def enable_memory_tracking(self, sample_interval: float = 60.0, frames: int = 4) -> MemoryTracker:
+        """开启内存追踪（tracemalloc）。
+
+        应在 load_script()/load_file() 之前调用，才能统计到解析器生成的AST。
+        模拟期间每隔 sample_interval 秒模拟时间记录一个低开销样本。
+
+        参数：
+            sample_interval: 采样间隔（模拟秒），0 表示不采样
+            frames: tracemalloc 保存的调用栈深度，1 开销最小，
+                    但 dataclass 构造函数等生成代码中的分配无法归属到子系统
+
+        返回：
+            MemoryTracker 实例
+        """
+        if self.memory_tracker is not None:
+            self.memory_tracker.stop()
+        elif self.simulation_loop:
+            self.simulation_loop.add_frame_hook(self._sample_memory)
+        self.memory_tracker = MemoryTracker(frames=frames).start()
+        self._memory_sample_interval = sample_interval
+        self._next_memory_sample = 0.0
+        return self.memory_tracker
+
+    def _sample_memory(self, frame: int):
+        """每帧钩子：到达采样时间时记录内存样本。
+
+        参数：
+            frame: 当前帧号
+        """
+        tracker = self.memory_tracker
+        now = self.simulation_loop.current_time
+        if tracker is None or self._memory_sample_interval <= 0 or now < self._next_memory_sample:
+            return
+        tracker.sample(now)
+        self._next_memory_sample = now + self._memory_sample_interval
+
+    def memory_report(self) -> Optional[dict]:
+        """获取按子系统拆分的内存报告。
+
+        返回：
+            报告字典：
+                current: jass_runner 包内代码分配的内存（字节）
+                peak: 各次统计中的峰值
+                subsystems: 子系统名 -> 字节数（按分配所在源文件归属）
+                interpreter_arrays: 全局数组列表占用的字节数
+                handles: 类型名 -> {"count", "bytes"}（按对象估算）
+                hashtables: hashtable 数量和保存的条目数
+                samples: [(模拟时间, 进程已追踪内存字节数)]
+            未开启内存追踪时返回None
+        """
+        tracker = self.memory_tracker
+        if tracker is None:
+            return None
+        snapshot = tracker.snapshot("report")
+        handle_manager = self.interpreter.state_context.handle_manager
+        return {
+            "current": snapshot["memory"],
+            "peak": tracker.peak_memory,
+            "subsystems": dict(sorted(snapshot["subsystems"].items(), key=lambda item: -item[1])),
+            "interpreter_arrays": sum(
+                sys.getsizeof(values) for values in self.interpreter.global_context.arrays.values()),
+            "handles": HandleMemoryMonitor(handle_manager, tracker).get_memory_by_type(),
+            "hashtables": handle_manager.hashtable_stats(),
+            "samples": list(tracker.samples),
+        }
+
     def simulate_player_chat(self, player_id: int, message: str):
         """模拟玩家聊天输入。
 
@@ -190,6 +410,114 @@ class JassVM:
             }
         )
 
+    def load_timeline(self, timeline: Union[str, InputTimeline]) -> Optional[InputTimeline]:
+        """加载脚本化输入时间线，模拟期间按时间自动注入事件。
+
+        时间线事件在到达其时间的那一帧（计时器和游戏状态更新之后）触发。
+        再次调用会替换之前的时间线。
+
+        参数：
+            timeline: JSONL 文件路径或 InputTimeline 实例
+
+        返回：
+            加载的 InputTimeline，计时器系统未启用时返回None
+        """
+        if not self.simulation_loop:
+            logger.warning("计时器系统未启用，无法加载输入时间线")
+            return None
+
+        if isinstance(timeline, str):
+            timeline = InputTimeline.load(timeline)
+        if self.timeline is None:
+            self.simulation_loop.add_frame_hook(self._play_timeline)
+        self.timeline = timeline
+        logger.info(f"已加载输入时间线，包含 {len(timeline)} 个事件")
+        return timeline
+
+    def _play_timeline(self, frame: int):
+        """每帧钩子：触发时间线中已到期的事件。
+
+        参数：
+            frame: 当前帧号
+        """
+        timeline = self.timeline
+        next_time = timeline.next_time()
+        if next_time is None or next_time > self.simulation_loop.current_time + timeline.TIME_EPSILON:
+            return
+        timeline.play(self.interpreter.state_context, self.simulation_loop.current_time)
+
+    def record_journal(self, path: str) -> JournalRecorder:
+        """开始把事件写入二进制日志文件，之前的日志会先结束。
+
+        参数：
+            path: 日志文件路径
+
+        返回：
+            JournalRecorder 实例
+        """
+        return self._attach_journal(JournalRecorder(path, self._journal_clock))
+
+    def verify_journal(self, path: str) -> JournalVerifier:
+        """开始把事件与基准日志逐条比较，之前的日志会先结束。
+
+        参数：
+            path: 基准日志文件路径
+
+        返回：
+            JournalVerifier 实例
+        """
+        return self._attach_journal(JournalVerifier(path, self._journal_clock))
+
+    def close_journal(self) -> Optional[dict]:
+        """结束当前事件日志。
+
+        返回：
+            结果字典（校验模式下包含 ok 和 mismatch），没有日志时返回None
+        """
+        journal = self.journal
+        if journal is None:
+            return None
+        self.interpreter.state_context.set_journal(None)
+        self.journal = None
+        return journal.close()
+
+    def _attach_journal(self, journal: EventJournal) -> EventJournal:
+        self.close_journal()
+        self.journal = journal
+        self.interpreter.state_context.set_journal(journal)
+        return journal
+
+    def _journal_clock(self) -> int:
+        """事件日志的帧号：模拟开始前为0。"""
+        return self.simulation_loop.frame_count if self.simulation_loop else 0
+
+    def save_hashtables(self, path: str):
+        """把所有 hashtable 的快照写入文件。
+
+        参数：
+            path: 快照文件路径
+        """
+        data = self.interpreter.state_context.handle_manager.snapshot_hashtables()
+        with open(path, "wb") as f:
+            f.write(data)
+        logger.info(f"已保存 hashtable 快照: {path}（{len(data)} 字节）")
+
+    def load_hashtables(self, path: str) -> bool:
+        """从快照文件恢复 hashtable 数据。
+
+        通常在 execute() 之后调用，用保存的数据替换地图初始化写入的内容，
+        之后的模拟从该状态开始。
+
+        参数：
+            path: 快照文件路径
+
+        返回：
+            恢复成功返回True，快照无效返回False
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        return self.interpreter.state_context.handle_manager.restore_hashtables(data)
+
     def _load_constants(self):
         """从 common.j 加载常量定义。"""
         path = self._find_resource_path('common.j')
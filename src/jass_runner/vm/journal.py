@@ -0,0 +1,323 @@
+"""事件日志的记录与回放校验。
+
+此模块包含 JournalRecorder 和 JournalVerifier 类，用于把模拟期间
+所有外部可观察的事件（TriggerManager 分发的事件、单位创建、击杀、
+单位状态修改）按帧号写入紧凑的二进制日志，并在之后的模拟中
+逐条与基准日志流式比较，用于长时间模拟的回归测试。
+
+二进制格式：文件以 MAGIC 开头，之后每条记录依次为
+    帧号增量（zigzag varint）、记录类型（字符串）、字段数（varint）、
+    每个字段的名称（字符串）和值。
+值以一个标签字节开头：None、False、True、整数（zigzag varint）、
+浮点数（8 字节小端 double）或字符串。字符串第一次出现时内联其 UTF-8 内容，
+之后只写它在字符串表中的编号。
+"""
+
+import logging
+import struct
+from abc import ABC, abstractmethod
+from typing import IO, Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from ..natives.handle_base import Handle
+from ..utils.varint import read_varint, unzigzag, write_varint, zigzag
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"JRNL\x01"
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+
+_DOUBLE = struct.Struct("<d")
+
+
+class JournalRecord(NamedTuple):
+    """日志中的一条记录。"""
+    tick: int
+    kind: str
+    fields: Tuple[Tuple[str, Any], ...]
+
+
+def _normalize(value: Any) -> Any:
+    """把字段值转换为日志可保存的基本类型，handle对象保存为其ID。
+
+    异常：
+        TypeError: 值不是 None、bool、int、float、str 或 Handle
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Handle):
+        return value.id
+    raise TypeError(f"事件日志不支持的字段类型: {type(value).__name__}")
+
+
+def make_record(tick: int, kind: str, fields: Dict[str, Any]) -> JournalRecord:
+    """创建按字段名排序、值已规范化的记录。
+
+    参数：
+        tick: 帧号
+        kind: 记录类型
+        fields: 字段字典
+
+    返回：
+        JournalRecord 实例
+    """
+    return JournalRecord(tick, kind, tuple(
+        (name, _normalize(fields[name])) for name in sorted(fields)
+    ))
+
+
+class JournalWriter:
+    """把记录编码写入二进制流。"""
+
+    def __init__(self, stream: IO[bytes]):
+        """初始化写入器并写入文件头。
+
+        参数：
+            stream: 以二进制模式打开的可写流
+        """
+        self._stream = stream
+        self._strings: Dict[str, int] = {}
+        self._last_tick = 0
+        stream.write(MAGIC)
+
+    def write(self, record: JournalRecord):
+        """写入一条记录。
+
+        参数：
+            record: 日志记录
+        """
+        out = bytearray()
+        write_varint(out, zigzag(record.tick - self._last_tick))
+        self._last_tick = record.tick
+        self._write_string(out, record.kind)
+        write_varint(out, len(record.fields))
+        for name, value in record.fields:
+            self._write_string(out, name)
+            self._write_value(out, value)
+        self._stream.write(out)
+
+    def _write_string(self, out: bytearray, text: str):
+        index = self._strings.get(text)
+        if index is not None:
+            write_varint(out, index)
+            return
+        index = len(self._strings)
+        self._strings[text] = index
+        data = text.encode("utf-8")
+        write_varint(out, index)
+        write_varint(out, len(data))
+        out.extend(data)
+
+    def _write_value(self, out: bytearray, value: Any):
+        if value is None:
+            out.append(_TAG_NONE)
+        elif value is True:
+            out.append(_TAG_TRUE)
+        elif value is False:
+            out.append(_TAG_FALSE)
+        elif isinstance(value, int):
+            out.append(_TAG_INT)
+            write_varint(out, zigzag(value))
+        elif isinstance(value, float):
+            out.append(_TAG_FLOAT)
+            out.extend(_DOUBLE.pack(value))
+        else:
+            out.append(_TAG_STR)
+            self._write_string(out, value)
+
+
+class JournalReader:
+    """从二进制流中逐条解码记录。"""
+
+    def __init__(self, stream: IO[bytes]):
+        """初始化读取器并校验文件头。
+
+        参数：
+            stream: 以二进制模式打开的可读流
+
+        异常：
+            ValueError: 文件头不匹配
+        """
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError("不是有效的事件日志文件")
+        self._stream = stream
+        self._strings = []
+        self._tick = 0
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        while True:
+            first = self._stream.read(1)
+            if not first:
+                return
+            self._tick += unzigzag(self._read_varint(first[0]))
+            kind = self._read_string()
+            count = self._read_varint()
+            fields = tuple((self._read_string(), self._read_value()) for _ in range(count))
+            yield JournalRecord(self._tick, kind, fields)
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._stream.read(size)
+        if len(data) != size:
+            raise ValueError("事件日志文件被截断")
+        return data
+
+    def _read_varint(self, first: Optional[int] = None) -> int:
+        try:
+            return read_varint(self._stream, first)
+        except ValueError:
+            raise ValueError("事件日志文件被截断") from None
+
+    def _read_string(self) -> str:
+        index = self._read_varint()
+        if index < len(self._strings):
+            return self._strings[index]
+        text = self._read_exact(self._read_varint()).decode("utf-8")
+        self._strings.append(text)
+        return text
+
+    def _read_value(self) -> Any:
+        tag = self._read_exact(1)[0]
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_INT:
+            return unzigzag(self._read_varint())
+        if tag == _TAG_FLOAT:
+            return _DOUBLE.unpack(self._read_exact(8))[0]
+        if tag == _TAG_STR:
+            return self._read_string()
+        raise ValueError(f"未知的值标签: {tag}")
+
+
+class EventJournal(ABC):
+    """事件日志的抽象基类，由 TriggerManager 和 HandleManager 调用，子类实现 _consume。
+
+    属性：
+        clock: 返回当前帧号的函数，None 时所有记录的帧号为0
+        record_count: 已记录的条数
+    """
+
+    def __init__(self, clock: Optional[Callable[[], int]] = None):
+        """初始化日志。
+
+        参数：
+            clock: 返回当前帧号的函数
+        """
+        self.clock = clock
+        self.record_count = 0
+
+    def record(self, kind: str, **fields):
+        """记录一个事件。
+
+        参数：
+            kind: 记录类型，如 "event"、"unit_created"
+            **fields: 记录字段
+        """
+        self.record_count += 1
+        tick = self.clock() if self.clock is not None else 0
+        self._consume(make_record(tick, kind, fields))
+
+    @abstractmethod
+    def _consume(self, record: JournalRecord):
+        """处理一条记录。
+
+        参数：
+            record: 日志记录
+        """
+
+    def close(self) -> Dict[str, Any]:
+        """结束记录。
+
+        返回：
+            结果字典
+        """
+        return {"records": self.record_count}
+
+
+class JournalRecorder(EventJournal):
+    """把事件写入二进制日志文件。"""
+
+    def __init__(self, path: str, clock: Optional[Callable[[], int]] = None):
+        """创建日志文件。
+
+        参数：
+            path: 日志文件路径
+            clock: 返回当前帧号的函数
+        """
+        super().__init__(clock)
+        self._file = open(path, "wb")
+        self._writer = JournalWriter(self._file)
+
+    def _consume(self, record: JournalRecord):
+        self._writer.write(record)
+
+    def close(self) -> Dict[str, Any]:
+        if not self._file.closed:
+            self._file.close()
+        return super().close()
+
+
+class JournalVerifier(EventJournal):
+    """把事件与基准日志逐条流式比较，只保留第一处差异。
+
+    属性：
+        mismatch: 第一处差异，包含 index、expected 和 actual，没有差异时为None
+    """
+
+    def __init__(self, path: str, clock: Optional[Callable[[], int]] = None):
+        """打开基准日志。
+
+        参数：
+            path: 基准日志文件路径
+            clock: 返回当前帧号的函数
+        """
+        super().__init__(clock)
+        self._file = open(path, "rb")
+        self._expected = iter(JournalReader(self._file))
+        self.mismatch: Optional[Dict[str, Any]] = None
+
+    @property
+    def ok(self) -> bool:
+        """到目前为止是否与基准日志一致。"""
+        return self.mismatch is None
+
+    def _consume(self, record: JournalRecord):
+        if self.mismatch is not None:
+            return
+        expected = next(self._expected, None)
+        if expected != record:
+            self._report(expected, record)
+
+    def _report(self, expected: Optional[JournalRecord], actual: Optional[JournalRecord]):
+        self.mismatch = {
+            "index": self.record_count - 1 if actual is not None else self.record_count,
+            "expected": expected,
+            "actual": actual,
+        }
+        logger.warning(f"[Journal] 第 {self.mismatch['index']} 条记录与基准不一致: "
+                       f"期望 {expected}，实际 {actual}")
+
+    def close(self) -> Dict[str, Any]:
+        """结束校验，基准日志还有剩余记录时也视为不一致。
+
+        返回：
+            包含 records、ok 和 mismatch 的结果字典
+        """
+        if not self._file.closed:
+            if self.mismatch is None:
+                remaining = next(self._expected, None)
+                if remaining is not None:
+                    self._report(remaining, None)
+            self._file.close()
+        result = super().close()
+        result["ok"] = self.ok
+        result["mismatch"] = self.mismatch
+        return result
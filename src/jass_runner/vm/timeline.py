@@ -0,0 +1,232 @@
+"""脚本化输入时间线。
+
+此模块包含 InputTimeline 类，用于在批量模拟中按时间注入外部事件
+（玩家聊天、击杀单位、玩家离开、伤害），使一次 run_simulation
+调用即可回放成千上万条输入，无需在帧之间由 Python 代码轮询。
+
+时间线文件为 JSONL 格式，每行一个事件，例如：
+    {"time": 1.5, "type": "chat", "player_id": 0, "message": "-start"}
+    {"time": 3.0, "type": "damage", "target_id": "unit_5", "amount": 50}
+    {"time": 4.0, "type": "unit_kill", "unit_id": "unit_5"}
+    {"time": 9.0, "type": "player_leave", "player_id": 1}
+"""
+
+import heapq
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..trigger.event_types import (
+    EVENT_ID_TO_NAME,
+    EVENT_PLAYER_CHAT,
+    EVENT_PLAYER_LEAVE,
+    EVENT_UNIT_DAMAGED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class TimelineEvent:
+    """时间线中的一个外部事件。"""
+    time: float
+    seq: int
+    event_type: str = field(compare=False)
+    data: Dict[str, Any] = field(compare=False, default_factory=dict)
+
+
+class InputTimeline:
+    """按模拟时间排序的外部输入事件队列。
+
+    事件按 (时间, 添加顺序) 保存在最小堆中，play() 每帧只比较堆顶时间，
+    没有到期事件时几乎没有开销。
+    """
+
+    # 事件类型 -> 必需字段
+    EVENT_FIELDS = {
+        "chat": ("player_id", "message"),
+        "unit_kill": ("unit_id",),
+        "player_leave": ("player_id",),
+        "damage": ("target_id", "amount"),
+    }
+
+    # 浮点帧时间累加误差的容差（秒）
+    TIME_EPSILON = 1e-6
+
+    def __init__(self):
+        """初始化空时间线。"""
+        self._queue: List[TimelineEvent] = []
+        self._next_seq = 0
+        self.fired_count = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(self, time: float, event_type: str, **data) -> TimelineEvent:
+        """添加一个事件。
+
+        参数：
+            time: 事件发生的模拟时间（秒）
+            event_type: 事件类型（EVENT_FIELDS 的键之一）
+            **data: 事件字段
+
+        返回：
+            添加的 TimelineEvent
+
+        异常：
+            ValueError: 事件类型未知或缺少必需字段
+        """
+        required = self.EVENT_FIELDS.get(event_type)
+        if required is None:
+            raise ValueError(f"未知的时间线事件类型: {event_type}")
+        missing = [name for name in required if name not in data]
+        if missing:
+            raise ValueError(f"时间线事件 {event_type} 缺少字段: {', '.join(missing)}")
+
+        event = TimelineEvent(float(time), self._next_seq, event_type, data)
+        self._next_seq += 1
+        heapq.heappush(self._queue, event)
+        return event
+
+    def chat(self, time: float, player_id: int, message: str) -> TimelineEvent:
+        """添加玩家聊天事件。"""
+        return self.add(time, "chat", player_id=player_id, message=message)
+
+    def unit_kill(self, time: float, unit_id: str) -> TimelineEvent:
+        """添加击杀单位事件。"""
+        return self.add(time, "unit_kill", unit_id=unit_id)
+
+    def player_leave(self, time: float, player_id: int) -> TimelineEvent:
+        """添加玩家离开事件。"""
+        return self.add(time, "player_leave", player_id=player_id)
+
+    def damage(self, time: float, target_id: str, amount: float,
+               source_id: Optional[str] = None) -> TimelineEvent:
+        """添加伤害事件。"""
+        return self.add(time, "damage", target_id=target_id, amount=amount,
+                        source_id=source_id)
+
+    @classmethod
+    def from_jsonl(cls, text: str) -> "InputTimeline":
+        """从 JSONL 文本创建时间线。
+
+        参数：
+            text: JSONL 文本，空行会被忽略
+
+        返回：
+            InputTimeline 实例
+
+        异常：
+            ValueError: 某一行不是合法的事件
+        """
+        timeline = cls()
+        for line_number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                data = dict(record)
+                time = data.pop("time")
+                event_type = data.pop("type")
+                timeline.add(time, event_type, **data)
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"时间线第 {line_number} 行无效: {e}") from e
+        return timeline
+
+    @classmethod
+    def load(cls, path: str) -> "InputTimeline":
+        """从 JSONL 文件加载时间线。
+
+        参数：
+            path: 文件路径
+
+        返回：
+            InputTimeline 实例
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_jsonl(f.read())
+
+    def next_time(self) -> Optional[float]:
+        """获取下一个待触发事件的时间。
+
+        返回：
+            事件时间（秒），时间线为空时返回None
+        """
+        if not self._queue:
+            return None
+        return self._queue[0].time
+
+    def play(self, state_context: Any, current_time: float) -> int:
+        """触发所有时间不晚于 current_time 的事件。
+
+        参数：
+            state_context: StateContext 实例
+            current_time: 当前模拟时间（秒）
+
+        返回：
+            本次触发的事件数
+        """
+        queue = self._queue
+        limit = current_time + self.TIME_EPSILON
+        fired = 0
+        while queue and queue[0].time <= limit:
+            event = heapq.heappop(queue)
+            self._dispatch(event, state_context)
+            fired += 1
+        self.fired_count += fired
+        return fired
+
+    def _dispatch(self, event: TimelineEvent, state_context: Any):
+        """把一个事件应用到状态上下文。
+
+        参数：
+            event: 时间线事件
+            state_context: StateContext 实例
+        """
+        data = event.data
+        trigger_manager = state_context.trigger_manager
+        handle_manager = state_context.handle_manager
+
+        if event.event_type == "chat":
+            trigger_manager.fire_event(EVENT_PLAYER_CHAT, {
+                "player_id": data["player_id"],
+                "message": data["message"],
+            })
+        elif event.event_type == "player_leave":
+            player = handle_manager.get_player(data["player_id"])
+            if player is not None:
+                player.slot_state = 2  # PLAYER_SLOT_STATE_LEFT
+            trigger_manager.fire_event(EVENT_ID_TO_NAME[EVENT_PLAYER_LEAVE], {
+                "player_id": data["player_id"],
+            })
+        elif event.event_type == "unit_kill":
+            if not handle_manager.kill_unit(data["unit_id"]):
+                logger.warning(f"[Timeline] 单位不存在: {data['unit_id']} (t={event.time})")
+        elif event.event_type == "damage":
+            self._apply_damage(event, state_context)
+
+    def _apply_damage(self, event: TimelineEvent, state_context: Any):
+        """对目标单位造成伤害，生命值耗尽时杀死单位。
+
+        参数：
+            event: 伤害事件
+            state_context: StateContext 实例
+        """
+        data = event.data
+        handle_manager = state_context.handle_manager
+        target = handle_manager.get_unit(data["target_id"])
+        if target is None or not target.is_alive():
+            logger.warning(f"[Timeline] 伤害目标不存在: {data['target_id']} (t={event.time})")
+            return
+
+        amount = float(data["amount"])
+        target.life -= amount
+        state_context.trigger_manager.fire_event(EVENT_ID_TO_NAME[EVENT_UNIT_DAMAGED], {
+            "unit_id": target.id,
+            "source_id": data.get("source_id"),
+            "amount": amount,
+        })
+        if target.life <= 0:
+            handle_manager.kill_unit(target.id)
@@ -135,3 +135,59 @@ class TestGameStateManager:
 
         # 验证事件没有再次触发
         assert len(triggered_events) == 1
+
+    def test_listener_due_frame_predicted_at_registration(self):
+        """测试注册时预测条件首次满足的帧号。"""
+        from jass_runner.gamestate.manager import GameStateManager
+        from jass_runner.types.gamestate import FGameState
+        from jass_runner.types.limitop import LimitOp
+
+        manager = GameStateManager()
+        manager.update(3000)
+        manager.register_state_listener(
+            "trigger_0", FGameState.TIME_OF_DAY, LimitOp.GREATER_THAN_OR_EQUAL, 18.0
+        )
+        manager.register_state_listener(
+            "trigger_1", FGameState.TIME_OF_DAY, LimitOp.LESS_THAN, 6.0
+        )
+
+        # 18:00 = 6750帧；6:00前的下一次满足是第二天0:00 = 9000帧
+        assert manager.get_next_due_frame() == 6750
+        manager.update(3750)
+        assert manager.get_next_due_frame() == 9000
+
+    def test_listener_fires_when_crossed_inside_large_step(self):
+        """测试一次推进多帧时越过的阈值仍会触发，并报告越过时的值。"""
+        from jass_runner.gamestate.manager import GameStateManager
+        from jass_runner.types.gamestate import FGameState
+        from jass_runner.types.limitop import LimitOp
+
+        triggered_events = []
+
+        class MockTriggerManager:
+            def fire_event(self, event_type, event_data):
+                triggered_events.append(event_data)
+
+        manager = GameStateManager(trigger_manager=MockTriggerManager())
+        manager.register_state_listener(
+            "trigger_0", FGameState.TIME_OF_DAY, LimitOp.EQUAL, 12.0
+        )
+
+        # 推进到第二天6:00，途中经过12:00
+        manager.update(11250)
+
+        assert len(triggered_events) == 1
+        assert abs(triggered_events[0]["value"] - 12.0) < 0.001
+
+    def test_unreachable_threshold_never_scheduled(self):
+        """测试永远不会满足的条件不进入调度。"""
+        from jass_runner.gamestate.manager import GameStateManager
+        from jass_runner.types.gamestate import FGameState
+        from jass_runner.types.limitop import LimitOp
+
+        manager = GameStateManager()
+        manager.register_state_listener(
+            "trigger_0", FGameState.TIME_OF_DAY, LimitOp.GREATER_THAN, 24.0
+        )
+
+        assert manager.get_next_due_frame() is None
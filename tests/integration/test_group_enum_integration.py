@@ -63,3 +63,59 @@ class TestGroupEnumIntegration:
         vm = JassVM()
         vm.load_script(code)
         vm.execute()
+
+    def test_event_responses_in_filter_and_for_group(self):
+        """测试过滤器和ForGroup回调中读取GetFilterUnit、GetEnumUnit和GetTriggerUnit。"""
+        from jass_runner.trigger.event_types import EVENT_ID_TO_NAME, EVENT_UNIT_DEATH
+
+        code = '''
+        globals
+            integer filtered = 0
+            real sumX = 0
+            boolean sawTriggerUnit = false
+            trigger deathTrigger = null
+            unit victim = null
+        endglobals
+
+        function IsFar takes nothing returns boolean
+            local real x = GetUnitX(GetFilterUnit())
+            set filtered = filtered + 1
+            return x > 50
+        endfunction
+
+        function AddX takes nothing returns nothing
+            local unit dying = GetTriggerUnit()
+            set sumX = sumX + GetUnitX(GetEnumUnit())
+            set sawTriggerUnit = dying == victim
+        endfunction
+
+        function OnDeath takes nothing returns nothing
+            local group g = CreateGroup()
+            call GroupEnumUnitsInRange(g, 0, 0, 1000, Filter(function IsFar))
+            call ForGroup(g, function AddX)
+        endfunction
+
+        function main takes nothing returns nothing
+            set victim = CreateUnit(Player(0), 1213484355, 500.0, 0.0, 0.0)
+            call CreateUnit(Player(0), 1213484355, 10.0, 0.0, 0.0)
+            call CreateUnit(Player(0), 1213484355, 100.0, 0.0, 0.0)
+            call CreateUnit(Player(0), 1213484355, 200.0, 0.0, 0.0)
+            set deathTrigger = CreateTrigger()
+            call TriggerAddAction(deathTrigger, function OnDeath)
+        endfunction
+        '''
+
+        vm = JassVM(enable_timers=False)
+        vm.run(code, load_blizzard=False)
+
+        global_context = vm.interpreter.global_context
+        state_context = vm.interpreter.state_context
+        state_context.trigger_manager.register_event(
+            global_context.get_variable('deathTrigger'), EVENT_ID_TO_NAME[EVENT_UNIT_DEATH]
+        )
+        state_context.handle_manager.kill_unit(global_context.get_variable('victim').id)
+
+        assert global_context.get_variable('filtered') == 3
+        assert global_context.get_variable('sumX') == 300.0
+        assert global_context.get_variable('sawTriggerUnit') is True
+        assert len(state_context.event_responses) == 0
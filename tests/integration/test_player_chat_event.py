@@ -140,3 +140,64 @@ endfunction
         vm.simulate_player_chat(0, "hello there")
         # 触发bye
         vm.simulate_player_chat(0, "goodbye and bye")
+
+    def test_condition_function_gates_actions(self):
+        """测试Condition(function X)条件的返回值决定动作是否执行。"""
+        from jass_runner.vm.jass_vm import JassVM
+
+        script = '''
+globals
+    integer count = 0
+    boolean allow = false
+endglobals
+
+function CanRun takes nothing returns boolean
+    return allow
+endfunction
+
+function onChat takes nothing returns nothing
+    set count = count + 1
+endfunction
+
+function main takes nothing returns nothing
+    local trigger t = CreateTrigger()
+    call TriggerRegisterPlayerChatEvent(t, Player(0), "-go", true)
+    call TriggerAddCondition(t, Condition(function CanRun))
+    call TriggerAddAction(t, function onChat)
+endfunction
+'''
+        vm = JassVM(enable_timers=False)
+        vm.run(script, load_blizzard=False)
+        global_context = vm.interpreter.global_context
+
+        vm.simulate_player_chat(0, "-go")
+        assert global_context.get_variable('count') == 0
+
+        global_context.set_variable('allow', True)
+        vm.simulate_player_chat(0, "-go")
+        assert global_context.get_variable('count') == 1
+
+    def test_actions_bound_to_compiled_functions(self):
+        """测试触发器动作在注册时绑定到解释器编译的函数。"""
+        from jass_runner.vm.jass_vm import JassVM
+
+        script = '''
+function onChat takes nothing returns nothing
+endfunction
+
+function main takes nothing returns nothing
+    local trigger t1 = CreateTrigger()
+    local trigger t2 = CreateTrigger()
+    call TriggerAddAction(t1, function onChat)
+    call TriggerAddAction(t2, function onChat)
+endfunction
+'''
+        vm = JassVM(enable_timers=False)
+        vm.run(script, load_blizzard=False)
+
+        trigger_manager = vm.interpreter.state_context.trigger_manager
+        first = trigger_manager.get_trigger("trigger_0").actions[0]
+        second = trigger_manager.get_trigger("trigger_1").actions[0]
+        assert first.func is vm.interpreter.compile_function("onChat")
+        assert second.func is first.func
+        assert first.func_name == "onChat"
@@ -273,3 +273,123 @@ class TestTriggerTimerIntegration:
 
         # 验证：动作未执行（因为条件返回False）
         assert len(action_executed) == 0, "条件失败时不应该执行动作"
+
+    def test_expire_event_only_reaches_subscribed_trigger(self):
+        """测试计时器过期事件只分发给订阅该计时器的触发器。"""
+        from jass_runner.natives.trigger_register_event_natives import (
+            TriggerRegisterTimerExpireEvent,
+        )
+
+        state_context = StateContext()
+        timer_system = TimerSystem()
+        timer_system.set_trigger_manager(state_context.trigger_manager)
+        trigger_manager = state_context.trigger_manager
+
+        timer_a = timer_system.get_timer(timer_system.create_timer())
+        timer_b = timer_system.get_timer(timer_system.create_timer())
+
+        fired = []
+        trigger_id = trigger_manager.create_trigger()
+        trigger_manager.get_trigger(trigger_id).add_action(
+            lambda ctx: fired.append(ctx["event_data"]["timer_id"])
+        )
+        TriggerRegisterTimerExpireEvent().execute(state_context, trigger_id, timer_a)
+
+        timer_a.start(1.0, False, None)
+        timer_b.start(1.0, False, None)
+        timer_system.update(1.0)
+
+        assert fired == [timer_a.timer_id]
+        assert trigger_manager._event_index.get("game_timer_expired") is None
+
+    def test_register_timer_event_creates_dedicated_timer(self):
+        """测试 TriggerRegisterTimerEvent 为触发器创建专用计时器。"""
+        from jass_runner.natives.trigger_register_event_natives import TriggerRegisterTimerEvent
+
+        state_context = StateContext()
+        timer_system = TimerSystem()
+        timer_system.set_trigger_manager(state_context.trigger_manager)
+        trigger_manager = state_context.trigger_manager
+
+        periodic_count = []
+        periodic_id = trigger_manager.create_trigger()
+        trigger_manager.get_trigger(periodic_id).add_action(lambda ctx: periodic_count.append(1))
+        once_count = []
+        once_id = trigger_manager.create_trigger()
+        trigger_manager.get_trigger(once_id).add_action(lambda ctx: once_count.append(1))
+
+        native = TriggerRegisterTimerEvent(timer_system)
+        assert native.execute(state_context, periodic_id, 0.5, True) is not None
+        assert native.execute(state_context, once_id, 1.0, False) is not None
+
+        for _ in range(4):
+            timer_system.update(0.5)
+
+        assert len(periodic_count) == 4
+        assert len(once_count) == 1
+
+    def test_destroy_trigger_removes_timer_subscription(self):
+        """测试销毁触发器后不再收到计时器过期事件。"""
+        state_context = StateContext()
+        timer_system = TimerSystem()
+        timer_system.set_trigger_manager(state_context.trigger_manager)
+        trigger_manager = state_context.trigger_manager
+
+        timer = timer_system.get_timer(timer_system.create_timer())
+        trigger_id = trigger_manager.create_trigger()
+        trigger_manager.register_event(
+            trigger_id, EVENT_GAME_TIMER_EXPIRED, {"timer_id": timer.timer_id}
+        )
+        assert list(trigger_manager._timer_subscriptions[timer.timer_id]) == [trigger_id]
+
+        trigger_manager.destroy_trigger(trigger_id)
+        assert timer.timer_id not in trigger_manager._timer_subscriptions
+        # 计时器由外部创建，销毁触发器不会销毁它
+        assert timer_system.get_timer(timer.timer_id) is timer
+
+    def test_register_timer_event_destroys_dedicated_timer(self):
+        """测试最后一个订阅者移除后销毁 TriggerRegisterTimerEvent 创建的计时器。"""
+        from jass_runner.natives.trigger_register_event_natives import TriggerRegisterTimerEvent
+
+        state_context = StateContext()
+        timer_system = TimerSystem()
+        timer_system.set_trigger_manager(state_context.trigger_manager)
+        trigger_manager = state_context.trigger_manager
+        native = TriggerRegisterTimerEvent(timer_system)
+
+        destroyed_id = trigger_manager.create_trigger()
+        native.execute(state_context, destroyed_id, 1.0, True)
+        cleared_id = trigger_manager.create_trigger()
+        native.execute(state_context, cleared_id, 1.0, True)
+        timer_ids = list(trigger_manager._owned_timers)
+        assert len(timer_ids) == 2
+
+        trigger_manager.destroy_trigger(destroyed_id)
+        trigger_manager.clear_trigger_events(cleared_id)
+
+        assert all(timer_system.get_timer(timer_id) is None for timer_id in timer_ids)
+        assert trigger_manager._owned_timers == {}
+
+    def test_timer_event_context_is_fresh_per_fire(self):
+        """测试每次计时器过期都构建新的状态上下文。"""
+        state_context = StateContext()
+        timer_system = TimerSystem()
+        timer_system.set_trigger_manager(state_context.trigger_manager)
+        trigger_manager = state_context.trigger_manager
+
+        contexts = []
+        timer = timer_system.get_timer(timer_system.create_timer())
+        trigger_id = trigger_manager.create_trigger()
+        trigger_manager.get_trigger(trigger_id).add_action(lambda ctx: contexts.append(ctx))
+        trigger_manager.register_event(
+            trigger_id, EVENT_GAME_TIMER_EXPIRED, {"timer_id": timer.timer_id}
+        )
+
+        timer.start(1.0, True, None)
+        timer_system.update(1.0)
+        contexts[0]["event_data"]["timer_id"] = "changed"
+        timer_system.update(1.0)
+
+        assert len(contexts) == 2
+        assert contexts[0] is not contexts[1]
+        assert contexts[1]["event_data"]["timer_id"] == timer.timer_id
@@ -4,6 +4,8 @@
 """
 
 import pytest
+from jass_runner.natives.alliance import ALLIANCE_PASSIVE
+from jass_runner.natives.alliance_natives import SetPlayerAlliance
 from jass_runner.natives.state import StateContext
 from jass_runner.natives.unit_ownership_natives import (
     IsUnitOwnedByPlayer,
@@ -46,29 +48,32 @@ class TestUnitOwnershipWorkflow:
         assert is_owned.execute(state, unit, player1) is True
 
     def test_ally_and_enemy_detection(self):
-        """测试盟友和敌人检测。"""
+        """测试盟友和敌人检测读取 SetPlayerAlliance 设置的联盟关系。"""
         state = StateContext()
+        set_alliance = SetPlayerAlliance()
         is_ally = IsUnitAlly()
         is_enemy = IsUnitEnemy()
 
         # 创建玩家0的单位
         unit = state.handle_manager.create_unit("hfoo", 0, 100.0, 200.0, 0.0)
-        # 获取玩家1
+        player0 = state.handle_manager.get_player(0)
         player1 = state.handle_manager.get_player(1)
+        player2 = state.handle_manager.get_player(2)
 
-        # 初始无关系
+        # 初始没有联盟，其他玩家都是敌人
         assert is_ally.execute(state, unit, player1) is False
-        assert is_enemy.execute(state, unit, player1) is False
+        assert is_enemy.execute(state, unit, player1) is True
 
-        # 设置为盟友
-        unit_owner = state.handle_manager.get_player(0)
-        unit_owner.set_alliance(1, True)
+        # 玩家0与玩家1结盟
+        set_alliance.execute(state, player0, player1, ALLIANCE_PASSIVE, True)
 
         assert is_ally.execute(state, unit, player1) is True
         assert is_enemy.execute(state, unit, player1) is False
+        assert is_ally.execute(state, unit, player2) is False
+        assert is_enemy.execute(state, unit, player2) is True
 
-        # 改为敌人
-        unit_owner.set_alliance(1, False)
+        # 取消结盟
+        set_alliance.execute(state, player0, player1, ALLIANCE_PASSIVE, False)
 
         assert is_ally.execute(state, unit, player1) is False
         assert is_enemy.execute(state, unit, player1) is True
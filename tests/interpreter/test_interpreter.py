@@ -431,4 +431,28 @@ def test_execute_set_array_statement():
     )
     interpreter.execute_statement(set_stmt)
 
-    assert interpreter.current_context.get_array_element("counts", 5) == 100
\ No newline at end of file
+    assert interpreter.current_context.get_array_element("counts", 5) == 100
+
+
+def test_function_references_are_interned():
+    """测试同一函数的多次引用得到同一个可调用对象，且调用返回函数返回值。"""
+    from jass_runner.interpreter.interpreter import Interpreter
+    from jass_runner.parser.parser import Parser
+
+    code = """
+    function Answer takes nothing returns integer
+        return 42
+    endfunction
+
+    function main takes nothing returns nothing
+    endfunction
+    """
+
+    interpreter = Interpreter()
+    interpreter.execute(Parser(code).parse())
+
+    first = interpreter.evaluator.evaluate("function:Answer")
+    second = interpreter.evaluator.evaluate("function:Answer")
+    assert first is second
+    assert first is interpreter.compile_function("Answer")
+    assert first() == 42
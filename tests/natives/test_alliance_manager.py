@@ -58,3 +58,36 @@ class TestAllianceManager:
         alliances = manager.get_all_alliances(0, 1)
         assert ALLIANCE_PASSIVE in alliances
         assert ALLIANCE_SHARED_VISION in alliances
+
+    def test_ally_and_enemy_masks_follow_passive_alliance(self):
+        """测试盟友/敌人掩码由 ALLIANCE_PASSIVE 决定，修改后缓存失效。"""
+        manager = AllianceManager()
+
+        # 玩家总是自己的盟友，未结盟的其他玩家都是敌人
+        assert manager.ally_mask(0) == 1 << 0
+        assert manager.is_ally(0, 0) is True
+        assert manager.is_enemy(0, 3) is True
+        assert manager.is_enemy(0, 0) is False
+
+        manager.set_alliance(0, 3, ALLIANCE_PASSIVE, True)
+        manager.set_alliance(0, 5, ALLIANCE_SHARED_VISION, True)
+
+        assert manager.ally_mask(0) == (1 << 0) | (1 << 3)
+        assert manager.is_ally(0, 3) is True
+        assert manager.is_enemy(0, 3) is False
+        assert manager.is_enemy(0, 5) is True
+        assert manager.get_alliance_mask(0, 5) == 1 << ALLIANCE_SHARED_VISION
+
+        manager.set_alliance(0, 3, ALLIANCE_PASSIVE, False)
+        assert manager.is_ally(0, 3) is False
+        assert manager.is_enemy(0, 3) is True
+
+    def test_out_of_range_players_are_ignored(self):
+        """测试超出 0-15 的玩家ID不会写入矩阵。"""
+        manager = AllianceManager()
+
+        manager.set_alliance(0, 16, ALLIANCE_PASSIVE, True)
+
+        assert manager.get_alliance(0, 16, ALLIANCE_PASSIVE) is False
+        assert manager.is_ally(0, 16) is False
+        assert manager.ally_mask(0) == 1 << 0
@@ -0,0 +1,77 @@
+"""测试布尔表达式的编译。"""
+
+from jass_runner.natives.boolexpr import AndExpr, BoolExpr, ConditionFunc, FilterFunc, NotExpr, OrExpr
+
+
+class TestBoolExprCompile:
+    """测试布尔表达式编译为谓词。"""
+
+    def test_nested_and_or_short_circuit(self):
+        """测试嵌套 And/Or 展平后保持短路顺序。"""
+        calls = []
+
+        def make(name, result):
+            def func(unit):
+                calls.append(name)
+                return result
+            return FilterFunc(f"filter_{name}", func)
+
+        # (a and b and c) or d
+        chain = AndExpr("boolexpr_1", AndExpr("boolexpr_2", make("a", True), make("b", False)),
+                        make("c", True))
+        expr = OrExpr("boolexpr_3", chain, make("d", True))
+
+        assert expr.evaluate("unit_1") is True
+        assert calls == ["a", "b", "d"]
+
+    def test_predicate_is_cached_per_handle(self):
+        """测试同一handle的谓词只编译一次，条件函数忽略参数。"""
+        condition = ConditionFunc("condition_1", lambda: 1)
+        expr = NotExpr("boolexpr_1", NotExpr("boolexpr_2", condition))
+
+        assert expr.predicate is expr.predicate
+        assert expr.predicate("ignored") is True
+        assert condition.evaluate() is True
+
+    def test_constant_folding(self):
+        """测试没有函数的表达式折叠为常量。"""
+        empty = BoolExpr("boolexpr_0")
+        filter_func = FilterFunc("filter_1", lambda unit: unit == "unit_1")
+
+        assert AndExpr("boolexpr_1", empty, filter_func).compile() is False
+        assert OrExpr("boolexpr_2", NotExpr("boolexpr_3", empty), filter_func).compile() is True
+
+        # 不影响结果的常量被省略，只剩下过滤函数本身的谓词
+        folded = OrExpr("boolexpr_4", empty, filter_func)
+        assert folded.compile() is filter_func.compile()
+        assert folded.evaluate("unit_1") is True
+        assert folded.evaluate("unit_2") is False
+
+
+class TestFilterNative:
+    """测试 Filter native 函数。"""
+
+    def test_filter_wrapper_reused_per_function(self):
+        """测试同一函数重复 Filter 时复用同一个过滤包装函数。"""
+        from jass_runner.interpreter.interpreter import Interpreter
+        from jass_runner.natives.boolexpr_natives import Filter
+        from jass_runner.parser.parser import Parser
+
+        interpreter = Interpreter()
+        interpreter.execute(Parser("""
+        function IsFar takes nothing returns boolean
+            return true
+        endfunction
+
+        function main takes nothing returns nothing
+        endfunction
+        """).parse())
+        state_context = interpreter.state_context
+        native = Filter()
+
+        first = state_context.handle_manager.get_handle(native.execute(state_context, "function:IsFar"))
+        second = state_context.handle_manager.get_handle(native.execute(state_context, "function:IsFar"))
+
+        assert first is not second
+        assert first._func is second._func
+        assert first.evaluate(None) is True
@@ -126,7 +126,7 @@ def test_create_default_registry():
 
     # 检查注册的函数总数
     all_funcs = registry.get_all()
-    assert len(all_funcs) == 211  # 原有177个 + 27个hashtable函数 + SuspendTimeOfDay + DzUnlockOpCodeLimit + 5个事件Convert函数
+    assert len(all_funcs) == 221  # 原有177个 + 27个hashtable函数 + SuspendTimeOfDay + DzUnlockOpCodeLimit + 5个事件Convert函数 + 5个事件响应函数 + 2个整组合并函数 + ForForce、IsPlayerInForce、GetEnumPlayer
 
 
 def test_all_math_natives_registered():
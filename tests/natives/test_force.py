@@ -0,0 +1,80 @@
+"""Force玩家组测试。"""
+
+from jass_runner.natives.force import Force, players_in_mask
+from jass_runner.vm.jass_vm import JassVM
+
+
+class TestForceMask:
+    """测试 Force 的掩码存储。"""
+
+    def test_add_remove_contains(self):
+        """测试添加、移除和包含检查，无效玩家ID被忽略。"""
+        force = Force("force_1")
+
+        assert force.add_player(3) is True
+        assert force.add_player(3) is False
+        assert force.add_player(16) is False
+        force.add_player(0)
+
+        assert force.mask == 0b1001
+        assert force.contains(3) is True
+        assert force.contains(-1) is False
+        assert force.players() == (0, 3)
+
+        assert force.remove_player(3) is True
+        assert force.remove_player(3) is False
+        assert force.get_players() == {0}
+
+    def test_union_intersection_and_cached_order(self):
+        """测试并集、交集，相同掩码共享同一个遍历元组。"""
+        first = Force("force_1")
+        second = Force("force_2")
+        for player_id in (1, 2, 5):
+            first.add_player(player_id)
+        for player_id in (2, 5, 7):
+            second.add_player(player_id)
+
+        first.intersect(second)
+        assert first.players() == (2, 5)
+
+        first.add_force(second)
+        assert first.players() == (2, 5, 7)
+        assert first.size() == 3
+        assert first.players() is second.players()
+        assert players_in_mask(0) == ()
+
+
+class TestForForce:
+    """测试 ForForce 遍历。"""
+
+    def test_for_force_enumerates_players(self):
+        """测试 ForForce 按玩家ID顺序回调，GetEnumPlayer 返回当前玩家。"""
+        vm = JassVM(enable_timers=False)
+        vm.load_script('''
+globals
+    force f = null
+    integer count = 0
+    integer members = 0
+endglobals
+
+function Visit takes nothing returns nothing
+    set count = count + 1
+    if IsPlayerInForce(GetEnumPlayer(), f) then
+        set members = members + 1
+    endif
+endfunction
+
+function main takes nothing returns nothing
+    set f = CreateForce()
+    call ForceAddPlayer(f, Player(4))
+    call ForceAddPlayer(f, Player(1))
+    call ForceAddPlayer(f, Player(4))
+    call ForForce(f, function Visit)
+endfunction
+''')
+        vm.execute()
+
+        globals_ = vm.interpreter.global_context.variables
+        assert globals_["count"] == 2
+        assert globals_["members"] == 2
+        assert vm.interpreter.state_context.event_responses.top.enum_player is None
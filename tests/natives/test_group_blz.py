@@ -3,7 +3,8 @@
 import pytest
 from jass_runner.natives.state import StateContext
 from jass_runner.natives.group_natives import (
-    CreateGroup, GroupAddUnit, BlzGroupGetSize, BlzGroupUnitAt
+    CreateGroup, GroupAddUnit, BlzGroupGetSize, BlzGroupUnitAt,
+    BlzGroupAddGroupFast, BlzGroupRemoveGroupFast, FirstOfGroup
 )
 
 
@@ -86,3 +87,86 @@ class TestBlzGroupUnitAt:
         result = get_unit.execute(state, None, 0)
 
         assert result is None
+
+
+class TestBlzGroupBulkOperations:
+    """测试整组合并与移除。"""
+
+    def test_add_and_remove_group_fast(self):
+        """测试整组添加跳过已有成员，整组移除只移除共同成员。"""
+        state = StateContext()
+        manager = state.handle_manager
+        units = [manager.create_unit("hfoo", 0, 0.0, 0.0, 0.0) for _ in range(4)]
+        target = CreateGroup().execute(state)
+        source = CreateGroup().execute(state)
+        target.add_units(units[:2])
+        source.add_units(units[1:])
+
+        assert BlzGroupAddGroupFast().execute(state, target, source) == 2
+        assert target.get_units() == [unit.id for unit in units]
+
+        source.remove_unit(units[3])
+        assert BlzGroupRemoveGroupFast().execute(state, target, source) == 2
+        assert target.get_units() == [units[0].id, units[3].id]
+
+    def test_dead_members_are_pruned_lazily(self):
+        """测试成员死亡后组在下次读取时移除该单位。"""
+        state = StateContext()
+        manager = state.handle_manager
+        units = [manager.create_unit("hfoo", 0, 0.0, 0.0, 0.0) for _ in range(3)]
+        group = CreateGroup().execute(state)
+        group.add_units(units)
+
+        manager.kill_unit(units[0].id)
+
+        assert FirstOfGroup().execute(state, group) is units[1]
+        assert BlzGroupGetSize().execute(state, group) == 2
+        assert units[0].groups == {}
+        assert group.id in units[1].groups
+
+
+class TestBlizzardGroupAddGroup:
+    """测试 blizzard.j 的 GroupAddGroup 不被同名 native 遮蔽。"""
+
+    def test_bj_group_add_group_honors_want_destroy(self):
+        """测试脚本定义的 GroupAddGroup 被调用，重置 bj_wantDestroyGroup 并销毁来源组。"""
+        from jass_runner.vm.jass_vm import JassVM
+
+        vm = JassVM(enable_timers=False)
+        vm.load_script('''
+globals
+    boolean bj_wantDestroyGroup = false
+    group bj_groupAddGroupDest = null
+    group a = null
+    group b = null
+endglobals
+
+function GroupAddGroupEnum takes nothing returns nothing
+    call GroupAddUnit(bj_groupAddGroupDest, GetEnumUnit())
+endfunction
+
+function GroupAddGroup takes group sourceGroup, group destGroup returns nothing
+    local boolean wantDestroy
+    set wantDestroy = bj_wantDestroyGroup
+    set bj_wantDestroyGroup = false
+    set bj_groupAddGroupDest = destGroup
+    call ForGroup(sourceGroup, function GroupAddGroupEnum)
+    if wantDestroy then
+        call DestroyGroup(sourceGroup)
+    endif
+endfunction
+
+function main takes nothing returns nothing
+    set a = CreateGroup()
+    set b = CreateGroup()
+    call GroupAddUnit(a, CreateUnit(Player(0), 'hfoo', 0.0, 0.0, 0.0))
+    set bj_wantDestroyGroup = true
+    call GroupAddGroup(a, b)
+endfunction
+''')
+        vm.execute()
+
+        globals_ = vm.interpreter.global_context.variables
+        assert globals_["bj_wantDestroyGroup"] is False
+        assert globals_["a"].is_alive() is False
+        assert len(globals_["b"].get_units()) == 1
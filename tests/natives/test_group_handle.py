@@ -128,6 +128,29 @@ class TestGroupHandle:
         group.add_unit(unit2)
         assert group.size() == 2
 
+    def test_order_is_deterministic_with_swap_remove(self):
+        """测试组内顺序按添加顺序排列，移除时由最后一个成员补位。"""
+        group = Group("group_1")
+        units = [Unit(f"unit_{i}", "hfoo", 0, 0.0, 0.0, 0.0) for i in range(4)]
+        for unit in units:
+            group.add_unit(unit)
+
+        assert group.get_units() == ["unit_0", "unit_1", "unit_2", "unit_3"]
+
+        group.remove_unit(units[1])
+        assert group.get_units() == ["unit_0", "unit_3", "unit_2"]
+        assert group.unit_at(1) == "unit_3"
+        assert group.contains(units[3]) is True
+
+        # FirstOfGroup / GroupRemoveUnit 循环依次取出所有成员
+        drained = []
+        while group.first() is not None:
+            first_id = group.first()
+            drained.append(first_id)
+            group.remove_unit(units[int(first_id.split("_")[1])])
+        assert drained == ["unit_0", "unit_2", "unit_3"]
+        assert group.size() == 0
+
 
 class TestHandleManagerGroupSupport:
     """测试HandleManager对Group的支持。"""
@@ -99,7 +99,7 @@ class TestHashtableHandleTypes:
         ht.save_unit_handle(0, 0, mock_unit)
 
         # 验证存储的是 handle_id
-        assert ht._data[0][0]["unit"] == "unit_123"
+        assert ht._units[0][0] == "unit_123"
 
     def test_load_unit_handle(self):
         """测试加载单位 handle"""
@@ -109,7 +109,7 @@ class TestHashtableHandleTypes:
         mock_manager.get_unit.return_value = mock_unit
 
         # 直接设置内部数据
-        ht._data[0] = {0: {"unit": "unit_123"}}
+        ht._units[0] = {0: "unit_123"}
 
         result = ht.load_unit_handle(0, 0, mock_manager)
 
@@ -122,7 +122,7 @@ class TestHashtableHandleTypes:
         mock_manager = Mock()
         mock_manager.get_unit.return_value = None
 
-        ht._data[0] = {0: {"unit": "unit_123"}}
+        ht._units[0] = {0: "unit_123"}
 
         result = ht.load_unit_handle(0, 0, mock_manager)
 
@@ -146,7 +146,7 @@ class TestHashtableHandleTypes:
 
         ht.save_player_handle(0, 0, mock_player)
 
-        assert ht._data[0][0]["player"] == "player_0"
+        assert ht._players[0][0] == "player_0"
 
     def test_save_and_load_item_handle(self):
         """测试物品 handle 存储和加载"""
@@ -156,7 +156,7 @@ class TestHashtableHandleTypes:
 
         ht.save_item_handle(0, 0, mock_item)
 
-        assert ht._data[0][0]["item"] == "item_456"
+        assert ht._items[0][0] == "item_456"
 
 
 class TestHashtableExistenceAndRemoval:
@@ -213,6 +213,20 @@ class TestHashtableExistenceAndRemoval:
         assert ht.have_saved_handle(0, 0) is False
         assert ht.have_saved_integer(0, 0) is True  # 整数仍然存在
 
+    def test_remove_last_child_prunes_parent(self):
+        """测试删除 parentKey 下最后一个值后不再保留空的子字典"""
+        ht = Hashtable("ht_1")
+        ht.save_integer(3, 1, 10)
+        ht.save_integer(3, 2, 20)
+
+        ht.remove_saved_integer(3, 1)
+        assert ht._integers == {3: {2: 20}}
+
+        ht.remove_saved_integer(3, 2)
+        ht.remove_saved_integer(4, 0)
+        assert ht._integers == {}
+        assert ht.is_empty() is True
+
 
 class TestHashtableFlush:
     """测试清空方法"""
@@ -230,6 +244,26 @@ class TestHashtableFlush:
         assert ht.load_integer(0, 1) == 0
         assert ht.load_integer(1, 0) == 200  # parentKey=1 的数据保留
 
+    def test_flush_child_removes_every_type(self):
+        """测试清空 parentKey 时同时删除该键下所有类型的数据"""
+        ht = Hashtable("ht_1")
+        ht.save_integer(5, 1, 42)
+        ht.save_real(5, 2, 1.5)
+        ht.save_string(5, 1, "abc")
+        ht.save_boolean(6, 1, True)
+
+        ht.flush_child(5)
+
+        assert ht.have_saved_integer(5, 1) is False
+        assert ht.have_saved_real(5, 2) is False
+        assert ht.have_saved_string(5, 1) is False
+        assert ht.load_boolean(6, 1) is True
+
+        ht.save_integer(5, 3, 7)
+        ht.flush_child(5)
+        assert ht.load_integer(5, 3) == 0
+        assert ht.load_boolean(6, 1) is True
+
     def test_flush_all(self):
         """测试清空整个 hashtable"""
         ht = Hashtable("ht_1")
@@ -240,4 +274,91 @@ class TestHashtableFlush:
 
         assert ht.load_integer(0, 0) == 0
         assert ht.load_real(1, 1) == 0.0
-        assert ht._data == {}
+        assert ht.is_empty()
+
+
+class TestHashtableSnapshot:
+    """测试快照导出与恢复"""
+
+    def _filled(self, handle_id="ht_1"):
+        ht = Hashtable(handle_id)
+        for i in range(20):
+            ht.save_integer(0x100000 + i, 3, -i * 1000)
+            ht.save_real(0x100000 + i, 4, i / 3)
+        ht.save_boolean(7, -2, True)
+        ht.save_boolean(7, 5, False)
+        ht.save_string(7, 0, "名字")
+        ht.save_string(8, 0, "名字")
+        ht.save_string(9, 0, None)
+        mock_unit = Mock()
+        mock_unit.id = "unit_42"
+        ht.save_unit_handle(-1, 2, mock_unit)
+        return ht
+
+    def test_round_trip(self):
+        """测试快照恢复后所有类型的数据一致，子键索引可用于清空"""
+        source = self._filled()
+        data = source.snapshot()
+
+        restored = Hashtable("ht_2")
+        restored.save_integer(99, 99, 1)
+        restored.restore(data)
+
+        assert restored.have_saved_integer(99, 99) is False
+        assert restored.load_integer(0x100000 + 7, 3) == -7000
+        assert restored.load_real(0x100000 + 2, 4) == 2 / 3
+        assert restored.load_boolean(7, -2) is True
+        assert restored.have_saved_boolean(7, 5) is True
+        assert restored.load_string(8, 0) == "名字"
+        assert restored.have_saved_string(9, 0) is True
+        assert restored._units[-1][2] == "unit_42"
+        assert restored.snapshot() == data
+        # 相同字符串只保存一次
+        assert data.count("名字".encode("utf-8")) == 1
+
+        restored.flush_child(7)
+        assert restored.have_saved_string(7, 0) is False
+        assert restored.load_string(8, 0) == "名字"
+
+    def test_non_int_integer_is_coerced_and_snapshots(self):
+        """测试以非整数值保存整数时转换为整数，快照不会因此失败"""
+        from jass_runner.natives.manager import HandleManager
+
+        manager = HandleManager()
+        ht = manager.create_hashtable()
+        ht.save_integer(0, 0, 3.0)
+        ht.save_integer(0, 1, -2.7)
+
+        assert ht.load_integer(0, 0) == 3
+        assert ht.load_integer(0, 1) == -2
+
+        fresh = HandleManager()
+        assert fresh.restore_hashtables(manager.snapshot_hashtables()) is True
+        assert fresh.get_hashtable(ht.id).load_integer(0, 0) == 3
+
+    def test_invalid_snapshot_raises(self):
+        """测试无效或截断的快照抛出 ValueError"""
+        ht = Hashtable("ht_1")
+        with pytest.raises(ValueError):
+            ht.restore(b"not a snapshot")
+        with pytest.raises(ValueError):
+            ht.restore(self._filled().snapshot()[:-3])
+
+    def test_manager_snapshot_restores_missing_tables(self):
+        """测试 HandleManager 快照恢复到新的管理器时按原ID创建 hashtable"""
+        from jass_runner.natives.manager import HandleManager
+
+        manager = HandleManager()
+        first = manager.create_hashtable()
+        second = manager.create_hashtable()
+        first.save_integer(1, 2, 3)
+        second.save_string(4, 5, "abc")
+        data = manager.snapshot_hashtables()
+
+        fresh = HandleManager()
+        assert fresh.restore_hashtables(data) is True
+        assert fresh.get_hashtable(first.id).load_integer(1, 2) == 3
+        assert fresh.get_hashtable(second.id).load_string(4, 5) == "abc"
+        assert fresh.create_hashtable().id not in (first.id, second.id)
+
+        assert fresh.restore_hashtables(b"garbage") is False
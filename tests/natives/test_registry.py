@@ -23,4 +23,52 @@ def test_register_and_get_native_function():
 
     retrieved = registry.get("DisplayTextToPlayer")
     assert retrieved is native
-    assert retrieved.name == "DisplayTextToPlayer"
\ No newline at end of file
+    assert retrieved.name == "DisplayTextToPlayer"
+
+
+def test_native_profiling_wraps_and_restores():
+    """Test profiling wraps registered natives, counts self time, and swaps the originals back."""
+    from jass_runner.natives.base import NativeFunction
+    from jass_runner.natives.registry import NativeRegistry
+    from jass_runner.utils.performance import PerformanceMonitor
+
+    ticks = iter(range(100))
+
+    class Inner(NativeFunction):
+        name = "Inner"
+
+        def execute(self, state_context):
+            return "inner"
+
+    class Outer(NativeFunction):
+        name = "Outer"
+
+        def execute(self, state_context):
+            return registry.get("Inner").execute(state_context)
+
+    registry = NativeRegistry()
+    inner = Inner()
+    outer = Outer()
+    registry.register(outer)
+    monitor = PerformanceMonitor()
+    registry.enable_profiling(monitor, site_provider=lambda: "main:3",
+                              clock=lambda: float(next(ticks)))
+    # Natives registered while profiling is on are wrapped too
+    registry.register(inner)
+
+    assert registry.get("Outer").execute(None) == "inner"
+    assert registry.get("Outer").source == "common.j"
+
+    report = registry.profiler.report()
+    by_name = {item["name"]: item for item in report["natives"]}
+    assert by_name["Outer"]["calls"] == 1
+    assert by_name["Outer"]["total"] == 3.0
+    assert by_name["Outer"]["self"] == 2.0
+    assert by_name["Inner"]["self"] == 1.0
+    assert by_name["Inner"]["sites"] == [{"site": "main:3", "calls": 1}]
+    assert monitor.get_stats("native:Outer")["count"] == 1
+
+    registry.disable_profiling()
+    assert registry.get("Outer") is outer
+    assert registry.get("Inner") is inner
+    assert registry.profiler is None
@@ -4,6 +4,7 @@
 """
 
 import pytest
+from jass_runner.natives.alliance import ALLIANCE_PASSIVE
 from jass_runner.natives.state import StateContext
 from jass_runner.natives.unit_ownership_natives import IsUnitOwnedByPlayer, IsUnitAlly, IsUnitEnemy
 
@@ -134,12 +135,11 @@ class TestIsUnitAlly:
 
         # 创建玩家0的单位
         unit = state.handle_manager.create_unit("hfoo", 0, 100.0, 200.0, 0.0)
-        # 获取玩家0（单位所有者）和玩家1
-        unit_owner = state.handle_manager.get_player(0)
+        # 获取玩家1
         other_player = state.handle_manager.get_player(1)
 
-        # 设置盟友关系
-        unit_owner.set_alliance(1, True)
+        # 玩家0对玩家1设置 ALLIANCE_PASSIVE
+        state.alliance_manager.set_alliance(0, 1, ALLIANCE_PASSIVE, True)
 
         result = native.execute(state, unit, other_player)
 
@@ -176,25 +176,22 @@ class TestIsUnitEnemy:
     """测试IsUnitEnemy native函数。"""
 
     def test_unit_is_enemy_returns_true(self):
-        """测试单位所属玩家与指定玩家是敌人返回True。"""
+        """测试单位所属玩家未对指定玩家设置 ALLIANCE_PASSIVE 时返回True。"""
         state = StateContext()
         native = IsUnitEnemy()
 
         # 创建玩家0的单位
         unit = state.handle_manager.create_unit("hfoo", 0, 100.0, 200.0, 0.0)
-        # 获取玩家0（单位所有者）和玩家1
-        unit_owner = state.handle_manager.get_player(0)
+        # 获取玩家1
         other_player = state.handle_manager.get_player(1)
 
-        # 设置敌对关系
-        unit_owner.set_alliance(1, False)
-
+        # 不设置联盟关系
         result = native.execute(state, unit, other_player)
 
         assert result is True
 
     def test_unit_is_not_enemy_returns_false(self):
-        """测试单位所属玩家与指定玩家不是敌人返回False。"""
+        """测试单位所属玩家与指定玩家结盟时返回False。"""
         state = StateContext()
         native = IsUnitEnemy()
 
@@ -203,7 +200,28 @@ class TestIsUnitEnemy:
         # 获取玩家1
         other_player = state.handle_manager.get_player(1)
 
-        # 不设置敌对关系
+        # 玩家0对玩家1设置 ALLIANCE_PASSIVE
+        state.alliance_manager.set_alliance(0, 1, ALLIANCE_PASSIVE, True)
         result = native.execute(state, unit, other_player)
 
         assert result is False
+
+    def test_unit_owner_is_not_enemy(self):
+        """测试单位所属玩家不是自己的敌人。"""
+        state = StateContext()
+        native = IsUnitEnemy()
+
+        unit = state.handle_manager.create_unit("hfoo", 0, 100.0, 200.0, 0.0)
+        owner = state.handle_manager.get_player(0)
+
+        assert native.execute(state, unit, owner) is False
+
+    def test_unit_owner_is_ally(self):
+        """测试单位所属玩家总是自己的盟友。"""
+        state = StateContext()
+        native = IsUnitAlly()
+
+        unit = state.handle_manager.create_unit("hfoo", 0, 100.0, 200.0, 0.0)
+        owner = state.handle_manager.get_player(0)
+
+        assert native.execute(state, unit, owner) is True
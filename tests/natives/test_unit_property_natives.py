@@ -175,6 +175,19 @@ class TestGetUnitLoc:
         assert result.y == 0.0
         assert result.z == 0.0
 
+    def test_get_unit_loc_none_unit_is_leak_tracked(self):
+        """测试 None 单位返回的 location 同样计入泄漏检测。"""
+        manager = HandleManager()
+        manager.enable_leak_tracking(lambda: "main:1", lambda: 0.0)
+        get_unit_loc = GetUnitLoc()
+
+        class MockStateContext:
+            def __init__(self):
+                self.handle_manager = manager
+
+        get_unit_loc.execute(MockStateContext(), None)
+        assert manager.leak_report()["by_type"] == {"location": 1}
+
 
 class TestGetUnitTypeId:
     """测试 GetUnitTypeId native 函数。"""
@@ -78,3 +78,106 @@ def test_is_fourcc_with_other_types():
     assert is_fourcc(None) is False
     assert is_fourcc(3.14) is False
     assert is_fourcc([]) is False
+
+
+def test_memory_tracker_attributes_allocations_to_subsystems():
+    """测试MemoryTracker按子系统统计包内代码分配的内存。"""
+    from jass_runner.natives.manager import HandleManager
+    from jass_runner.utils import MemoryTracker
+
+    with MemoryTracker() as tracker:
+        manager = HandleManager()
+        hashtable = manager.create_hashtable()
+        for i in range(2000):
+            hashtable.save_integer(i, 0, i)
+        units = [manager.create_unit("hfoo", 0, 0.0, 0.0, 0.0) for _ in range(200)]
+
+        snapshot = tracker.snapshot("filled")
+        assert snapshot["delta"] > 0
+        assert snapshot["subsystems"]["hashtables"] > 50_000
+        assert snapshot["subsystems"]["handles"] > 0
+
+        for size in (tracker.sample(1.0), tracker.sample(2.0)):
+            assert size > 0
+        assert [at for at, _ in tracker.samples] == [1.0, 2.0]
+        assert len(units) == 200
+
+
+def test_memory_tracker_starts_tracing_only_when_started():
+    """测试创建追踪器和监控器不会启动 tracemalloc，退出 with 块后停止。"""
+    import tracemalloc
+    from jass_runner.natives.manager import HandleManager
+    from jass_runner.utils import HandleMemoryMonitor, MemoryTracker
+
+    assert not tracemalloc.is_tracing()
+    monitor = HandleMemoryMonitor(HandleManager())
+    assert not tracemalloc.is_tracing()
+    assert monitor.tracker.get_stats()["current_memory"] == 0
+
+    with MemoryTracker():
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_subsystem_of_package_paths():
+    """测试按源文件路径判断子系统，包外文件返回None。"""
+    import os
+    from jass_runner.utils.memory import PACKAGE_DIR, subsystem_of
+
+    assert subsystem_of(os.path.join(PACKAGE_DIR, "parser", "lexer.py")) == "parser"
+    assert subsystem_of(os.path.join(PACKAGE_DIR, "natives", "hashtable.py")) == "hashtables"
+    assert subsystem_of(os.path.join(PACKAGE_DIR, "natives", "trigger_natives.py")) == "triggers"
+    assert subsystem_of(os.path.join(PACKAGE_DIR, "natives", "group.py")) == "handles"
+    assert subsystem_of(os.path.join(PACKAGE_DIR, "cli.py")) == "other"
+    assert subsystem_of(os.__file__) is None
+
+
+def test_performance_monitor_streaming_percentiles():
+    """测试PerformanceMonitor使用固定大小的直方图估算分位数。"""
+    from jass_runner.utils import PerformanceMonitor
+    from jass_runner.utils.performance import HISTOGRAM_BUCKETS
+
+    monitor = PerformanceMonitor()
+    for i in range(1, 10001):
+        monitor.record("op", i * 1e-6)
+
+    stats = monitor.get_stats("op")
+    assert stats["count"] == 10000
+    assert stats["min"] == 1e-6
+    assert stats["max"] == 10000 * 1e-6
+    assert abs(stats["total"] - sum(i * 1e-6 for i in range(1, 10001))) < 1e-9
+    for key, expected in (("p50", 5e-3), ("p95", 9.5e-3), ("p99", 9.9e-3)):
+        assert expected <= stats[key] <= expected * 1.2
+    assert len(monitor.metrics["op"].buckets) == HISTOGRAM_BUCKETS
+
+    assert monitor.get_stats("missing")["count"] == 0
+
+
+def test_track_performance_records_to_active_monitor():
+    """测试track_performance记录到当前激活的监控器，其他线程不受影响。"""
+    import threading
+    from jass_runner.utils import PerformanceMonitor, get_current_monitor, get_global_monitor, track_performance
+
+    @track_performance("work")
+    def work():
+        return get_current_monitor()
+
+    first = PerformanceMonitor()
+    second = PerformanceMonitor()
+    seen = {}
+
+    def run(name, monitor):
+        with monitor.activate():
+            seen[name] = work()
+
+    threads = [threading.Thread(target=run, args=("first", first)),
+               threading.Thread(target=run, args=("second", second))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"first": first, "second": second}
+    assert first.get_stats("work")["count"] == 1
+    assert second.get_stats("work")["count"] == 1
+    assert get_current_monitor() is get_global_monitor()
@@ -0,0 +1,143 @@
+"""测试帧预算分析器。"""
+
+import time
+
+import pytest
+
+from jass_runner.timer.profiler import FrameProfiler
+from jass_runner.timer.system import TimerSystem
+from jass_runner.timer.simulation import SimulationLoop
+
+
+class TestFrameProfiler:
+    """测试 FrameProfiler 类。"""
+
+    def test_nested_self_time_attributed_to_inner_phase(self):
+        """测试嵌套调用的耗时只计入内层阶段。"""
+        profiler = FrameProfiler(frame_budget=10.0)
+        profiler.begin_frame(1, 0.03)
+        profiler.enter("timers", "Tick")
+        profiler.enter("triggers", "OnTimer")
+        time.sleep(0.005)
+        profiler.exit()
+        profiler.exit()
+        profiler.end_frame()
+
+        report = profiler.get_report()
+        assert report["frames"] == 1
+        assert report["phase_totals"]["triggers"] >= 0.004
+        assert report["phase_totals"]["timers"] < report["phase_totals"]["triggers"]
+
+    def test_overrun_records_culprit(self):
+        """测试超预算帧记录负责的JASS函数。"""
+        profiler = FrameProfiler(frame_budget=0.001)
+        profiler.begin_frame(7, 0.21)
+        profiler.enter("coroutines", "FastFunc")
+        profiler.exit()
+        profiler.enter("timers", "SlowTick")
+        time.sleep(0.003)
+        profiler.exit()
+        profiler.end_frame()
+
+        assert profiler.overrun_count == 1
+        overrun = profiler.overruns[0]
+        assert overrun["frame"] == 7
+        assert overrun["culprit"] == "SlowTick"
+        assert overrun["duration"] > overrun["budget"]
+
+    def test_failing_timer_callback_leaves_stack_balanced(self):
+        """测试计时器回调抛出异常时仍然退出分析阶段。"""
+        def explode():
+            raise RuntimeError("boom")
+
+        profiler = FrameProfiler(frame_budget=10.0)
+        timer_system = TimerSystem()
+        timer_system.set_profiler(profiler)
+        timer_system.get_timer(timer_system.create_timer()).start(0.01, False, explode)
+
+        profiler.begin_frame(1, 0.01)
+        with pytest.raises(RuntimeError):
+            timer_system.update(0.01)
+
+        assert profiler._stack == []
+
+    def test_histogram_counts_every_frame(self):
+        """测试直方图统计每一帧。"""
+        profiler = FrameProfiler(frame_budget=1.0, bucket_edges=(1.0, 10.0))
+        for frame in range(5):
+            profiler.begin_frame(frame, frame * 0.03)
+            profiler.end_frame()
+
+        histogram = profiler.get_histogram()
+        assert len(histogram) == 3
+        assert histogram[-1]["le_ms"] is None
+        assert sum(bucket["count"] for bucket in histogram) == 5
+        assert profiler.overrun_count == 0
+
+
+class TestSimulationLoopFrameHooks:
+    """测试 SimulationLoop 的每帧钩子和帧分析。"""
+
+    def test_frame_callback_invoked_each_frame(self):
+        """测试 set_frame_callback 设置的回调每帧调用一次。"""
+        loop = SimulationLoop()
+        frames = []
+        loop.set_frame_callback(frames.append)
+        loop.run_frames(3)
+        assert frames == [1, 2, 3]
+
+    def test_frame_hooks_run_after_callback(self):
+        """测试每帧钩子按顺序调用，并可以移除。"""
+        loop = SimulationLoop()
+        calls = []
+        loop.set_frame_callback(lambda frame: calls.append(("callback", frame)))
+
+        def hook(frame):
+            calls.append(("hook", frame))
+
+        loop.add_frame_hook(hook)
+        loop.run_frames(1)
+        assert calls == [("callback", 1), ("hook", 1)]
+
+        assert loop.remove_frame_hook(hook) is True
+        loop.run_frames(1)
+        assert calls[-1] == ("callback", 2)
+
+    def test_profiling_reports_timer_callback(self):
+        """测试开启帧分析后记录计时器回调的耗时。"""
+        loop = SimulationLoop(fps=30.0)
+        loop.enable_profiling(frame_budget=0.001)
+
+        def SlowTick():
+            time.sleep(0.002)
+
+        timer_id = loop.timer_system.create_timer()
+        loop.timer_system.get_timer(timer_id).start(0.03, True, SlowTick)
+        loop.run_frames(3)
+
+        report = loop.get_frame_report()
+        assert report["frames"] == 3
+        assert report["overrun_count"] >= 1
+        assert report["overruns"][0]["culprit"] == "SlowTick"
+        assert report["phase_totals"]["timers"] > 0
+
+    def test_disable_profiling_detaches_subsystems(self):
+        """测试关闭帧分析后子系统不再持有分析器。"""
+        loop = SimulationLoop()
+        loop.enable_profiling()
+        loop.disable_profiling()
+
+        assert loop.get_frame_report() is None
+        assert loop.timer_system._profiler is None
+        assert loop.coroutine_runner._profiler is None
+
+    def test_attached_game_state_advances_each_frame(self):
+        """测试关联状态上下文后每帧推进游戏状态。"""
+        from jass_runner.natives.state import StateContext
+
+        state_context = StateContext()
+        loop = SimulationLoop()
+        loop.attach_state_context(state_context)
+        loop.run_frames(5)
+
+        assert state_context.game_state_manager.current_frame == 5
@@ -0,0 +1,69 @@
+"""测试模拟循环的游戏速度和速度模式。"""
+
+import logging
+import time
+
+from jass_runner.natives.state import StateContext
+from jass_runner.timer.simulation import SimulationLoop
+
+
+class TestSimulationSpeedMode:
+    """测试 SimulationLoop 的速度模式。"""
+
+    def test_game_speed_read_from_state_context(self):
+        """测试游戏速度来自关联的状态上下文。"""
+        state_context = StateContext()
+        loop = SimulationLoop()
+        assert loop.get_game_speed() == SimulationLoop.DEFAULT_GAME_SPEED
+
+        loop.attach_state_context(state_context)
+        state_context.game_speed = 3
+        assert loop.get_game_speed() == 3
+        assert loop.get_speed_multiplier() == 1.0
+
+    def test_invalid_speed_mode_rejected(self):
+        """测试无效的速度模式不会被设置。"""
+        loop = SimulationLoop()
+        assert loop.set_speed_mode("warp") is False
+        assert loop.speed_mode == SimulationLoop.SPEED_UNTHROTTLED
+
+    def test_realtime_mode_paces_by_game_speed(self):
+        """测试 realtime 模式按游戏速度等待墙钟时间。"""
+        state_context = StateContext()
+        state_context.game_speed = 3
+        loop = SimulationLoop(fps=100.0)
+        loop.attach_state_context(state_context)
+        loop.set_speed_mode(SimulationLoop.SPEED_REALTIME)
+
+        start = time.perf_counter()
+        loop.run_frames(6)
+        elapsed = time.perf_counter() - start
+
+        # 第一帧确定起点，后5帧共0.05游戏秒，按1.0倍率至少等待约0.05秒
+        assert elapsed >= 0.045
+
+    def test_max_mode_suppresses_info_logging(self, caplog):
+        """测试 max 模式运行期间屏蔽 INFO 日志，结束后恢复。"""
+        loop = SimulationLoop()
+        loop.set_speed_mode(SimulationLoop.SPEED_MAX)
+        logger = logging.getLogger("jass_runner.test")
+
+        loop.add_frame_hook(lambda frame: logger.info("frame %d", frame))
+        with caplog.at_level(logging.INFO):
+            loop.run_frames(3)
+            assert not [r for r in caplog.records if r.name == "jass_runner.test"]
+
+            logger.info("after run")
+            assert caplog.records[-1].getMessage() == "after run"
+
+    def test_speed_stats_report_realtime_factor(self):
+        """测试速度统计包含模拟时间和墙钟耗时。"""
+        loop = SimulationLoop()
+        loop.set_speed_mode(SimulationLoop.SPEED_MAX)
+        loop.run_seconds(10)
+
+        stats = loop.get_speed_stats()
+        assert stats["speed_mode"] == "max"
+        assert abs(stats["simulated_time"] - 10.0) < 0.05
+        assert stats["wall_time"] > 0
+        assert stats["realtime_factor"] > 1.0
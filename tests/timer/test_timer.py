@@ -39,11 +39,8 @@ def test_timer_fires_event_on_expire():
     timer.start(timeout=1.0, periodic=False, callback=callback)
     timer.update(1.0)  # 触发到期
 
-    # 验证 trigger_manager.fire_event 被调用
-    mock_trigger_manager.fire_event.assert_called_once()
-    call_args = mock_trigger_manager.fire_event.call_args
-    assert call_args[0][0] == "game_timer_expired"
-    assert call_args[0][1]["timer_id"] == "timer_001"
+    # 验证 trigger_manager.fire_timer_expired 被调用
+    mock_trigger_manager.fire_timer_expired.assert_called_once_with("timer_001")
 
 
 def test_timer_no_error_without_trigger_manager():
@@ -0,0 +1,50 @@
+"""SubstringMatcher测试模块。
+
+验证非精确聊天事件的多模式子字符串匹配。
+"""
+
+import random
+
+from jass_runner.trigger.chat_matcher import SubstringMatcher
+
+
+class TestSubstringMatcher:
+    """测试SubstringMatcher类的功能。"""
+
+    def test_overlapping_patterns_found_in_one_pass(self):
+        """测试重叠和互为后缀的模式都能被找到。"""
+        matcher = SubstringMatcher()
+        for pattern in ("he", "she", "his", "hers"):
+            matcher.add(pattern, f"t_{pattern}")
+
+        assert sorted(matcher.match("ushers")) == ["t_he", "t_hers", "t_she"]
+        assert matcher.match("xyz") == []
+
+    def test_remove_trigger_rebuilds_automaton(self):
+        """测试移除触发器后不再匹配其模式，共享模式的其他触发器不受影响。"""
+        matcher = SubstringMatcher()
+        matcher.add("-kick", "t1")
+        matcher.add("-kick", "t2")
+        matcher.add("-ban", "t1")
+        assert sorted(matcher.match("-kick -ban")) == ["t1", "t1", "t2"]
+
+        matcher.remove_trigger("t1")
+
+        assert matcher.match("-kick -ban") == ["t2"]
+        assert len(matcher) == 1
+
+    def test_matches_naive_substring_check(self):
+        """测试随机模式和消息的结果与逐个 in 判断一致。"""
+        rng = random.Random(7)
+        alphabet = "ab-c"
+        patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                    for _ in range(40)}
+        matcher = SubstringMatcher()
+        for pattern in patterns:
+            matcher.add(pattern, pattern)
+        matcher.add("", "empty")
+
+        for _ in range(200):
+            message = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            expected = sorted([p for p in patterns if p in message] + ["empty"])
+            assert sorted(matcher.match(message)) == expected
@@ -0,0 +1,59 @@
+"""测试事件响应上下文栈。"""
+
+from jass_runner.trigger.event_responses import EventResponseStack
+
+
+class TestEventResponseStack:
+    """测试 EventResponseStack 类。"""
+
+    def test_empty_stack_reads_empty_frame(self):
+        """测试空栈读取到所有字段为空的帧。"""
+        stack = EventResponseStack()
+        assert stack.top.trigger_id is None
+        assert stack.top.event_data == {}
+        assert stack.top.enum_unit is None
+        stack.pop()
+        assert len(stack) == 0
+
+    def test_enum_frame_inherits_trigger_event(self):
+        """测试枚举帧继承外层触发器事件，弹出后恢复外层帧。"""
+        stack = EventResponseStack()
+        stack.push_trigger("trigger_0", {"unit_id": "unit_1"})
+        frame = stack.push_enum("unit_2")
+        frame.enum_unit = "unit_3"
+
+        assert stack.top.trigger_id == "trigger_0"
+        assert stack.top.event_data["unit_id"] == "unit_1"
+        assert stack.top.enum_unit == "unit_3"
+
+        stack.pop()
+        assert stack.top.enum_unit is None
+        assert stack.top.trigger_id == "trigger_0"
+
+    def test_nested_dispatch_restores_outer_event(self):
+        """测试触发器动作中嵌套分发事件后，外层事件响应保持不变。"""
+        from jass_runner.trigger.manager import TriggerManager
+
+        manager = TriggerManager()
+        outer = manager.create_trigger()
+        inner = manager.create_trigger()
+        manager.register_event(outer, "unit_death", None)
+        manager.register_event(inner, "player_chat", None)
+        seen = []
+
+        def outer_action(state_context):
+            responses = manager.event_responses
+            seen.append(responses.top.event_data["unit_id"])
+            manager.fire_event("player_chat", {"player_id": 2})
+            seen.append(responses.top.event_data["unit_id"])
+
+        def inner_action(state_context):
+            top = manager.event_responses.top
+            seen.append((top.trigger_id, top.event_data["player_id"]))
+
+        manager.get_trigger(outer).add_action(outer_action)
+        manager.get_trigger(inner).add_action(inner_action)
+        manager.fire_event("unit_death", {"unit_id": "unit_7"})
+
+        assert seen == ["unit_7", (inner, 2), "unit_7"]
+        assert len(manager.event_responses) == 0
@@ -0,0 +1,58 @@
+"""EventFilterIndex测试模块。
+
+验证按玩家ID、单位ID和聊天消息建立的二级事件索引。
+"""
+
+from jass_runner.trigger.filter_index import EventFilterIndex
+
+
+class TestEventFilterIndex:
+    """测试EventFilterIndex类的功能。"""
+
+    def test_exact_chat_reaches_only_registered_triggers(self):
+        """测试精确聊天消息只匹配对应玩家和消息的触发器。"""
+        index = EventFilterIndex()
+        for player_id in range(12):
+            for command in ("-ar", "-ap", "-cm"):
+                index.add(f"{player_id}{command}", {
+                    "player_id": player_id,
+                    "chat_message": command,
+                    "exact_match_only": True,
+                })
+        index.add("any_chat", None)
+
+        matched = index.match({"player_id": 3, "message": "-ar"})
+
+        assert matched == ["3-ar", "any_chat"]
+
+    def test_substring_and_order(self):
+        """测试子字符串匹配并按首次注册顺序返回且去重。"""
+        index = EventFilterIndex()
+        index.add("t_sub", {"player_id": 0, "chat_message": "gg", "exact_match_only": False})
+        index.add("t_all", {})
+        index.add("t_sub", {"player_id": None, "chat_message": "g"})
+
+        assert index.match({"player_id": 0, "message": "ggwp"}) == ["t_sub", "t_all"]
+        assert index.match({"player_id": 1, "message": "hello"}) == ["t_all"]
+
+    def test_event_without_field_matches_all_values(self):
+        """测试事件不带过滤字段时匹配该字段的所有注册。"""
+        index = EventFilterIndex()
+        index.add("unit_a", {"unit_id": "unit_1"})
+        index.add("unit_b", {"unit_id": "unit_2"})
+
+        assert index.match({"unit_id": "unit_2"}) == ["unit_b"]
+        assert index.match({}) == ["unit_a", "unit_b"]
+
+    def test_remove_trigger_prunes_empty_branches(self):
+        """测试移除触发器后删除空分支。"""
+        index = EventFilterIndex()
+        filters = [{"unit_id": "unit_1"}, {"unit_id": "unit_1", "player_id": 2}]
+        for filter_data in filters:
+            index.add("dynamic", filter_data)
+
+        index.remove_trigger("dynamic", filters)
+
+        assert "dynamic" not in index
+        assert index.match({"unit_id": "unit_1"}) == []
+        assert index._root == {}
@@ -330,6 +330,24 @@ class TestEventRegistration:
 
         assert trigger_id not in manager._event_index.get("unit_death", [])
 
+    def test_destroy_trigger_keeps_other_triggers_in_order(self):
+        """测试销毁触发器只清理其自身注册，其他触发器保持注册顺序。"""
+        from jass_runner.trigger.manager import TriggerManager
+
+        manager = TriggerManager()
+        trigger_ids = [manager.create_trigger() for _ in range(4)]
+        for trigger_id in trigger_ids:
+            manager.register_event(trigger_id, "unit_death", None)
+        manager.register_event(trigger_ids[1], "unit_damaged", None)
+
+        manager.destroy_trigger(trigger_ids[1])
+
+        assert list(manager._event_index["unit_death"]) == [
+            trigger_ids[0], trigger_ids[2], trigger_ids[3]
+        ]
+        assert "unit_damaged" not in manager._event_index
+        assert trigger_ids[1] not in manager._trigger_event_types
+
 
 class TestEventDispatch:
     """测试事件分发功能。"""
@@ -464,3 +482,115 @@ class TestEventDispatch:
         # 应该不抛出异常
         manager.fire_event("unknown_event", {"data": "test"})
 
+
+class TestEventQueue:
+    """测试事件队列模式。"""
+
+    def _chain_manager(self, max_depth):
+        """创建一个每次处理事件都再引发一次同类事件的管理器。"""
+        from jass_runner.trigger.manager import TriggerManager
+
+        manager = TriggerManager()
+        manager.enable_event_queue(max_depth)
+        trigger_id = manager.create_trigger()
+        manager.register_event(trigger_id, "unit_death", None)
+        levels = []
+
+        def chain_action(state_context):
+            level = state_context["event_data"]["level"]
+            levels.append(level)
+            manager.fire_event("unit_death", {"level": level + 1})
+            # 嵌套事件排队到当前动作结束之后才处理
+            assert levels[-1] == level
+
+        manager.get_trigger(trigger_id).add_action(chain_action)
+        return manager, levels
+
+    def test_nested_events_drain_iteratively(self):
+        """测试动作中引发的事件不递归分发，按深度限制停止。"""
+        manager, levels = self._chain_manager(max_depth=3)
+        manager.fire_event("unit_death", {"level": 0})
+
+        assert levels == [0, 1, 2, 3]
+        assert manager.get_event_queue_stats() == {
+            "queued": 4, "processed": 4, "dropped": 1, "max_depth": 3, "pending": 0,
+        }
+
+    def test_deep_chain_does_not_overflow_stack(self):
+        """测试超过Python递归限制的连锁反应可以在有限栈深度内完成。"""
+        import sys
+
+        depth = sys.getrecursionlimit() * 2
+        manager, levels = self._chain_manager(max_depth=depth)
+        manager.fire_event("unit_death", {"level": 0})
+
+        assert len(levels) == depth + 1
+        assert manager.get_event_queue_stats()["dropped"] == 1
+
+    def test_disabled_queue_has_no_stats(self):
+        """测试未开启事件队列时没有统计。"""
+        from jass_runner.trigger.manager import TriggerManager
+
+        manager = TriggerManager()
+        assert manager.get_event_queue_stats() is None
+        manager.enable_event_queue()
+        manager.disable_event_queue()
+        assert manager.get_event_queue_stats() is None
+
+
+class TestTriggerStats:
+    """测试触发器分发统计。"""
+
+    def test_counters_and_timing(self):
+        """测试分发、条件、动作和异常计数，以及开启计时后的事件计数。"""
+        from jass_runner.trigger.manager import TriggerManager
+
+        manager = TriggerManager()
+        manager.enable_stats()
+        trigger_id = manager.create_trigger()
+        manager.register_event(trigger_id, "unit_death", None)
+        trigger = manager.get_trigger(trigger_id)
+
+        def is_even(state_context):
+            return state_context["event_data"]["unit_id"] % 2 == 0
+
+        def failing_action(state_context):
+            raise RuntimeError("boom")
+
+        trigger.add_condition(is_even)
+        trigger.add_action(lambda state_context: None)
+        trigger.add_action(failing_action)
+
+        for unit_id in range(4):
+            manager.fire_event("unit_death", {"unit_id": unit_id})
+        manager.fire_event("player_chat", {"player_id": 0})
+
+        stats = manager.get_stats()
+        assert stats["timing"] is True
+        assert stats["events"] == {"unit_death": 4, "player_chat": 1}
+
+        trigger_stats = stats["triggers"][0]
+        assert trigger_stats["trigger_id"] == trigger_id
+        assert trigger_stats["label"] == "<lambda>"
+        assert trigger_stats["fires"] == 4
+        assert trigger_stats["runs"] == 2
+        assert trigger_stats["conditions_evaluated"] == 4
+        assert trigger_stats["actions_executed"] == 4
+        assert trigger_stats["errors"] == 2
+        assert trigger_stats["total_time"] > 0
+
+    def test_top_limits_triggers_and_timing_is_optional(self):
+        """测试 top 参数限制返回的触发器数量，未开启计时时不记录耗时和事件。"""
+        from jass_runner.trigger.manager import TriggerManager
+
+        manager = TriggerManager()
+        for _ in range(3):
+            trigger_id = manager.create_trigger()
+            manager.register_event(trigger_id, "unit_death", None)
+        manager.fire_event("unit_death", {"unit_id": 1})
+
+        stats = manager.get_stats(top=2)
+        assert stats["timing"] is False
+        assert stats["events"] == {}
+        assert len(stats["triggers"]) == 2
+        assert all(t["fires"] == 1 and t["total_time"] == 0.0 for t in stats["triggers"])
@@ -0,0 +1,100 @@
+"""测试事件日志的记录与回放校验。"""
+
+import io
+
+import pytest
+
+from jass_runner.natives.handle import Player
+from jass_runner.vm.jass_vm import JassVM
+from jass_runner.vm.journal import EventJournal, JournalReader, JournalWriter, make_record
+
+SCRIPT = '''
+globals
+    integer ticks = 0
+endglobals
+
+function Tick takes nothing returns nothing
+    set ticks = ticks + 1
+    call KillUnit(CreateUnit(Player(0), 'hfoo', ticks * TICK_X, 0, 0))
+endfunction
+
+function main takes nothing returns nothing
+    local trigger t = CreateTrigger()
+    call TriggerRegisterTimerEvent(t, 0.5, true)
+    call TriggerAddAction(t, function Tick)
+endfunction
+'''
+
+
+def _run(script: str, tick_x: int, journal_path: str, verify: bool) -> dict:
+    vm = JassVM()
+    if verify:
+        vm.verify_journal(journal_path)
+    else:
+        vm.record_journal(journal_path)
+    vm.load_script(script.replace("TICK_X", str(tick_x)))
+    vm.execute()
+    vm.run_simulation(2.0)
+    return vm.close_journal()
+
+
+class TestJournalEncoding:
+    """测试二进制编码。"""
+
+    def test_round_trip(self):
+        """测试记录写入后可按原值读回，重复字符串只保存一次。"""
+        records = [
+            make_record(0, "event", {"event_type": 203, "player_id": 0, "message": "-go"}),
+            make_record(3, "unit_state", {"unit_id": "unit_5", "state": "UNIT_STATE_LIFE",
+                                          "value": -12.5}),
+            make_record(3, "event", {"event_type": 203, "player_id": 1, "message": "-go",
+                                     "flag": True, "extra": None}),
+        ]
+        stream = io.BytesIO()
+        writer = JournalWriter(stream)
+        for record in records:
+            writer.write(record)
+
+        assert stream.getvalue().count(b"-go") == 1
+        stream.seek(0)
+        assert list(JournalReader(stream)) == records
+
+    def test_handles_saved_as_id_and_unknown_types_rejected(self):
+        """测试handle字段保存为其ID，其他类型抛出 TypeError 而不是写入 repr。"""
+        record = make_record(0, "event", {"player": Player("player_1", 1)})
+        assert record.fields == (("player", "player_1"),)
+
+        with pytest.raises(TypeError):
+            make_record(0, "event", {"where": (1.0, 2.0)})
+
+    def test_event_journal_is_abstract(self):
+        """测试没有实现 _consume 的日志不能实例化。"""
+        with pytest.raises(TypeError):
+            EventJournal()
+
+
+class TestJournalReplay:
+    """测试模拟的记录与校验。"""
+
+    def test_identical_run_verifies(self, tmp_path):
+        """测试相同脚本的回放与基准日志一致。"""
+        path = str(tmp_path / "golden.jrnl")
+        recorded = _run(SCRIPT, 10, path, verify=False)
+        assert recorded["records"] > 0
+
+        verified = _run(SCRIPT, 10, path, verify=True)
+        assert verified["ok"] is True
+        assert verified["records"] == recorded["records"]
+
+    def test_changed_behaviour_reports_first_mismatch(self, tmp_path):
+        """测试行为改变时报告第一处不一致的记录。"""
+        path = str(tmp_path / "golden.jrnl")
+        _run(SCRIPT, 10, path, verify=False)
+
+        result = _run(SCRIPT, 20, path, verify=True)
+        assert result["ok"] is False
+        mismatch = result["mismatch"]
+        assert mismatch["expected"].kind == "unit_created"
+        assert dict(mismatch["expected"].fields)["x"] == 10.0
+        assert dict(mismatch["actual"].fields)["x"] == 20.0
+        assert mismatch["actual"].tick > 0
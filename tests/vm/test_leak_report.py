@@ -0,0 +1,69 @@
+"""Handle泄漏报告测试。"""
+
+import pytest
+
+from jass_runner.vm.jass_vm import JassVM
+
+
+SCRIPT = '''
+globals
+    group keep = null
+    integer ticks = 0
+endglobals
+
+function Tick takes nothing returns nothing
+    local group g = CreateGroup()
+    local location loc = Location(0.0, 0.0)
+    local group tmp = CreateGroup()
+    call RemoveLocation(loc)
+    call DestroyGroup(tmp)
+    set ticks = ticks + 1
+endfunction
+
+function main takes nothing returns nothing
+    local trigger t = CreateTrigger()
+    set keep = CreateGroup()
+    call TriggerRegisterTimerEvent(t, 1.0, true)
+    call TriggerAddAction(t, function Tick)
+endfunction
+'''
+
+
+class TestLeakReport:
+    """测试按类型和创建位置汇总存活的handle。"""
+
+    def test_reports_alive_handles_by_site(self):
+        """测试只报告未释放的handle，并按模拟时间计算每分钟增长量。"""
+        vm = JassVM()
+        vm.enable_leak_tracking()
+        vm.load_script(SCRIPT)
+        vm.execute()
+        vm.run_simulation(30.5)
+
+        report = vm.leak_report()
+        sites = {(site["type"], site["site"]): site for site in report["sites"]}
+
+        ticks = vm.interpreter.global_context.variables["ticks"]
+        assert ticks > 20
+        leaked = sites[("group", "Tick:8")]
+        assert leaked["alive"] == ticks
+        assert abs(report["elapsed"] - 30.5) < 0.1
+        assert leaked["per_minute"] == pytest.approx(ticks / report["elapsed"] * 60)
+
+        # 初始化时创建的handle存活但不计入增长量
+        assert sites[("group", "main:18")]["alive"] == 1
+        assert sites[("group", "main:18")]["per_minute"] == 0.0
+
+        # 已销毁的group和已移除的location不出现在报告中
+        assert ("group", "Tick:10") not in sites
+        assert ("location", "Tick:9") not in sites
+        assert report["by_type"]["group"] == ticks + 1
+        assert report["tracked"] == ticks * 3 + 1
+
+    def test_disabled_by_default(self):
+        """测试未开启泄漏检测时没有报告。"""
+        vm = JassVM(enable_timers=False)
+        vm.load_script(SCRIPT)
+        vm.execute()
+
+        assert vm.leak_report() is None
@@ -0,0 +1,51 @@
+"""内存报告测试。"""
+
+from jass_runner.vm.jass_vm import JassVM
+
+
+SCRIPT = '''
+globals
+    integer ticks = 0
+    integer array data
+endglobals
+
+function Tick takes nothing returns nothing
+    local group g = CreateGroup()
+    set ticks = ticks + 1
+endfunction
+
+function main takes nothing returns nothing
+    local trigger t = CreateTrigger()
+    call TriggerRegisterTimerEvent(t, 1.0, true)
+    call TriggerAddAction(t, function Tick)
+endfunction
+'''
+
+
+class TestMemoryReport:
+    """测试按子系统拆分的内存报告。"""
+
+    def test_memory_report_with_samples(self):
+        """测试内存报告包含子系统、handle类型统计和按模拟时间采样的结果。"""
+        vm = JassVM()
+        vm.enable_memory_tracking(sample_interval=10.0)
+        try:
+            vm.load_script(SCRIPT)
+            vm.execute()
+            vm.run_simulation(30.5)
+            report = vm.memory_report()
+        finally:
+            vm.memory_tracker.stop()
+
+        assert report["current"] > 0
+        assert report["subsystems"]["parser"] > 0
+        assert report["interpreter_arrays"] > 8192 * 8
+        assert report["handles"]["group"]["count"] == vm.interpreter.global_context.variables["ticks"]
+        assert report["hashtables"] == {"count": 0, "entries": 0}
+        assert [round(at) for at, _ in report["samples"]] == [0, 10, 20, 30]
+
+    def test_disabled_by_default(self):
+        """测试未开启内存追踪时没有报告。"""
+        vm = JassVM(enable_timers=False)
+
+        assert vm.memory_report() is None
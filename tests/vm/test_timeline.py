@@ -0,0 +1,87 @@
+"""测试脚本化输入时间线。"""
+
+import pytest
+
+from jass_runner.vm.timeline import InputTimeline
+
+
+class TestInputTimeline:
+    """测试 InputTimeline 类。"""
+
+    def test_from_jsonl_orders_by_time(self):
+        """测试从JSONL加载的事件按时间排序，同时间保持添加顺序。"""
+        timeline = InputTimeline.from_jsonl(
+            '{"time": 2.0, "type": "player_leave", "player_id": 1}\n'
+            '\n'
+            '{"time": 1.0, "type": "chat", "player_id": 0, "message": "a"}\n'
+            '{"time": 1.0, "type": "chat", "player_id": 0, "message": "b"}\n'
+        )
+
+        assert len(timeline) == 3
+        assert timeline.next_time() == 1.0
+
+    def test_invalid_line_reports_line_number(self):
+        """测试无效的行会报告行号。"""
+        with pytest.raises(ValueError, match="第 2 行"):
+            InputTimeline.from_jsonl(
+                '{"time": 1.0, "type": "chat", "player_id": 0, "message": "a"}\n'
+                '{"time": 1.0, "type": "teleport"}\n'
+            )
+
+    def test_damage_kills_unit_when_life_exhausted(self):
+        """测试伤害事件扣除生命值，生命耗尽时杀死单位。"""
+        from jass_runner.natives.state import StateContext
+
+        state_context = StateContext()
+        unit = state_context.handle_manager.create_unit("hfoo", 0, 0.0, 0.0, 0.0)
+        timeline = InputTimeline()
+        timeline.damage(1.0, unit.id, 60)
+        timeline.damage(2.0, unit.id, 60)
+
+        assert timeline.play(state_context, 1.0) == 1
+        assert unit.life == 40.0
+        assert timeline.play(state_context, 2.0) == 1
+        assert not unit.is_alive()
+
+
+class TestVMTimeline:
+    """测试 JassVM 在模拟期间回放时间线。"""
+
+    SCRIPT = """
+globals
+    integer chat_count = 0
+endglobals
+
+function OnChat takes nothing returns nothing
+    set chat_count = chat_count + 1
+endfunction
+
+function main takes nothing returns nothing
+    local trigger t = CreateTrigger()
+    call TriggerRegisterPlayerChatEvent(t, Player(0), "-go", true)
+    call TriggerAddAction(t, function OnChat)
+endfunction
+"""
+
+    def test_timeline_events_fire_during_simulation(self):
+        """测试时间线中的聊天事件在对应帧触发。"""
+        from jass_runner.vm.jass_vm import JassVM
+
+        vm = JassVM()
+        vm.load_script(self.SCRIPT)
+        vm.execute()
+
+        timeline = InputTimeline()
+        fired_frames = []
+        for second in (1.0, 2.0, 5.0):
+            timeline.chat(second, 0, "-go")
+        vm.load_timeline(timeline)
+        vm.simulation_loop.add_frame_hook(
+            lambda frame: fired_frames.append(frame) if timeline.fired_count > len(fired_frames) else None
+        )
+
+        vm.run_simulation(3.0)
+
+        assert vm.interpreter.global_context.variables.get("chat_count") == 2
+        assert fired_frames == [30, 60]
+        assert len(timeline) == 1